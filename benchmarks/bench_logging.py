@@ -0,0 +1,120 @@
+"""
+Benchmark: sobrecarga de logging por petición (activado frente a desactivado)
+
+Ejecuta las mismas peticiones contra el LLM y el servidor MCP stub con el
+logging desactivado, con el pipeline en cola (QueueHandler + QueueListener,
+JSON) y con un StreamHandler síncrono en el event loop como referencia. La
+salida va a /dev/null para medir solo el coste del cliente. Se informa del
+tiempo de CPU del proceso por petición, que no depende de las esperas de red
+(el hilo del QueueListener también cuenta, pero fuera del event loop).
+
+Uso:
+    python benchmarks/bench_logging.py --requests 300 --tools-per-turn 3
+    python benchmarks/bench_logging.py --json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deepseek_mcp_client import DeepSeekClient, ProviderEndpoint, ProviderPool
+from deepseek_mcp_client.utils.logging_config import (
+    JsonFormatter,
+    configure_logging,
+    disable_external_logging,
+    shutdown_logging
+)
+
+from stub_llm import StubLLMServer
+from stub_mcp import build_stub_server
+
+
+MODES = ("off", "queue_json", "sync_text")
+
+
+def configure_mode(mode: str, sink):
+    """Preparar logging para un modo; devuelve el handler síncrono a retirar"""
+    shutdown_logging()
+    package = logging.getLogger("deepseek_mcp_client")
+    if mode == "queue_json":
+        configure_logging("INFO", handlers=[logging.StreamHandler(sink)])
+    elif mode == "sync_text":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        package.addHandler(handler)
+        package.setLevel(logging.INFO)
+        package.propagate = False
+        return handler
+    return None
+
+
+async def run_mode(mode: str, base_url: str, args):
+    client = DeepSeekClient(
+        model="deepseek-chat",
+        mcp_servers=[build_stub_server(args.tools, 0.0, args.result_size)],
+        provider_pool=ProviderPool([ProviderEndpoint(base_url=base_url, api_key="benchmark")]),
+        enable_logging=mode != "off"
+    )
+    disable_external_logging()
+    await client.execute("warm up")
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for i in range(args.requests):
+        result = await client.execute(f"request {i}")
+        if not result.success:
+            raise RuntimeError(f"Execution failed: {result.error}")
+    cpu = time.process_time() - cpu_start
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return elapsed, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sobrecarga de logging por petición")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tools", type=int, default=10)
+    parser.add_argument("--tools-per-turn", type=int, default=3)
+    parser.add_argument("--result-size", type=int, default=256)
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args()
+
+    tool_calls = [{"name": f"tool_{i}", "arguments": {"query": "benchmark"}} for i in range(min(args.tools_per_turn, args.tools))]
+    rows = []
+    with open(os.devnull, "w") as sink, StubLLMServer(tool_calls=tool_calls) as llm:
+        for mode in MODES:
+            handler = configure_mode(mode, sink)
+            try:
+                elapsed, cpu = asyncio.run(run_mode(mode, llm.base_url, args))
+            finally:
+                if handler is not None:
+                    logging.getLogger("deepseek_mcp_client").removeHandler(handler)
+                shutdown_logging()
+            rows.append({
+                "mode": mode,
+                "seconds": elapsed,
+                "cpu_us_per_request": cpu / args.requests * 1e6
+            })
+
+    baseline = rows[0]["cpu_us_per_request"]
+    for row in rows:
+        row["overhead_us"] = row["cpu_us_per_request"] - baseline
+
+    if args.json:
+        print(json.dumps({"requests": args.requests, "results": rows}, indent=2))
+        return
+
+    print(f"{'mode':>12} {'seconds':>9} {'cpu us/req':>11} {'overhead':>10}")
+    for row in rows:
+        print(f"{row['mode']:>12} {row['seconds']:>9.3f} {row['cpu_us_per_request']:>11.1f} {row['overhead_us']:>+10.1f}")
+
+
+if __name__ == "__main__":
+    main()
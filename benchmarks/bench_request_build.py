@@ -0,0 +1,109 @@
+"""
+Micro-benchmark: tiempo de construcción del cuerpo de petición vs número de herramientas
+
+Compara la serialización completa en cada llamada (lo que hace el SDK con
+chat.completions.create) contra el ensamblado por concatenación de
+ChatRequestBuilder.
+
+Uso:
+    python benchmarks/bench_request_build.py [--json] [--iterations N]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deepseek_mcp_client.client.request_builder import ChatRequestBuilder
+
+TOOL_COUNTS = [0, 1, 10, 50, 100, 250, 500]
+
+
+def make_tools(count: int):
+    """Generar herramientas con esquemas de tamaño realista"""
+    return [{
+        "type": "function",
+        "function": {
+            "name": f"tool_{i}",
+            "description": f"Search records in table {i} using structured filters and pagination",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Free text query"},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+                    "filters": {
+                        "type": "object",
+                        "properties": {
+                            "from": {"type": "string", "format": "date"},
+                            "to": {"type": "string", "format": "date"},
+                            "tags": {"type": "array", "items": {"type": "string"}}
+                        }
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+    } for i in range(count)]
+
+
+def make_params(tools):
+    """Parámetros equivalentes a la llamada inicial de DeepSeekClient"""
+    params = {
+        "model": "deepseek-chat",
+        "messages": [
+            {"role": "system", "content": "You are a helpful and friendly assistant. " * 20},
+            {"role": "user", "content": "Find the latest orders for customer 42"}
+        ],
+        "max_tokens": 4000,
+        "temperature": 0.7
+    }
+    if tools:
+        params["tools"] = tools
+    return params
+
+
+def run(iterations: int):
+    results = []
+    for count in TOOL_COUNTS:
+        tools = make_tools(count)
+        params = make_params(tools)
+        builder = ChatRequestBuilder()
+        builder.build(params, tools_version=1)
+
+        full = timeit.timeit(lambda: json.dumps(params).encode("utf-8"), number=iterations)
+        spliced = timeit.timeit(lambda: builder.build(params, tools_version=1), number=iterations)
+
+        results.append({
+            "tools": count,
+            "body_bytes": len(builder.build(params, tools_version=1)),
+            "full_serialize_us": full / iterations * 1e6,
+            "spliced_us": spliced / iterations * 1e6,
+            "speedup": full / spliced if spliced else None
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Salida JSON legible por máquina")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+
+    if args.json:
+        print(json.dumps({"benchmark": "request_build", "results": results}, indent=2))
+        return
+
+    print(f"{'tools':>6} {'bytes':>9} {'full (us)':>11} {'spliced (us)':>13} {'speedup':>8}")
+    for row in results:
+        print(
+            f"{row['tools']:>6} {row['body_bytes']:>9} {row['full_serialize_us']:>11.1f} "
+            f"{row['spliced_us']:>13.1f} {row['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
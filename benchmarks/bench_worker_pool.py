@@ -0,0 +1,117 @@
+"""
+Benchmark de escalado de WorkerPool: throughput frente al número de procesos
+
+Cada trabajador crea su DeepSeekClient con un servidor MCP stub en memoria y
+llama a un LLM stub local compartido. Con resultados grandes y muchas
+herramientas el coste de CPU (JSON, validación, logging) domina y se aprecia
+el reparto entre núcleos; la línea base es un único proceso sin pool.
+
+Uso:
+    python benchmarks/bench_worker_pool.py --requests 400 --tools 50 --result-size 65536
+    python benchmarks/bench_worker_pool.py --processes 1 2 4 --json
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deepseek_mcp_client import DeepSeekClient, ProviderEndpoint, ProviderPool, WorkerPool
+from deepseek_mcp_client.utils.logging_config import disable_external_logging
+
+from stub_llm import StubLLMServer
+from stub_mcp import build_stub_server
+
+
+def make_client(base_url: str, tool_count: int, result_size: int) -> DeepSeekClient:
+    """Cliente apuntando a los stubs (se ejecuta dentro de cada trabajador)"""
+    disable_external_logging()
+    return DeepSeekClient(
+        model="deepseek-chat",
+        mcp_servers=[build_stub_server(tool_count, 0.0, result_size)],
+        provider_pool=ProviderPool([ProviderEndpoint(base_url=base_url, api_key="benchmark")])
+    )
+
+
+async def run_single(factory, requests: int, concurrency: int) -> float:
+    client = factory()
+    await client.execute("warm up")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await client.execute(f"request {i}")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    _check(results)
+    return elapsed
+
+
+async def run_pool(factory, processes: int, requests: int, concurrency: int) -> float:
+    async with WorkerPool(factory, processes=processes, max_concurrency_per_worker=concurrency) as pool:
+        await pool.execute_many(["warm up"] * processes)
+        start = time.perf_counter()
+        results = await pool.execute_many([f"request {i}" for i in range(requests)])
+        elapsed = time.perf_counter() - start
+    _check(results)
+    return elapsed
+
+
+def _check(results):
+    failed = [r for r in results if not r.success]
+    if failed:
+        raise RuntimeError(f"Execution failed: {failed[0].error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalado de WorkerPool por número de procesos")
+    parser.add_argument("--processes", type=int, nargs="+", help="Procesos a probar (por defecto 1..núcleos)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20, help="Ejecuciones simultáneas por proceso")
+    parser.add_argument("--tools", type=int, default=50)
+    parser.add_argument("--tools-per-turn", type=int, default=3)
+    parser.add_argument("--result-size", type=int, default=32 * 1024)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = args.processes or sorted({1, *range(2, cores + 1, max(1, cores // 4)), cores})
+    tool_calls = [{"name": f"tool_{i}", "arguments": {"query": "benchmark"}} for i in range(min(args.tools_per_turn, args.tools))]
+
+    rows = []
+    with StubLLMServer(latency=args.llm_latency, tool_calls=tool_calls) as llm:
+        factory = functools.partial(make_client, llm.base_url, args.tools, args.result_size)
+        baseline = asyncio.run(run_single(factory, args.requests, args.concurrency))
+        rows.append({"mode": "single", "processes": 1, "seconds": baseline, "rps": args.requests / baseline})
+        for processes in counts:
+            elapsed = asyncio.run(run_pool(factory, processes, args.requests, args.concurrency))
+            rows.append({
+                "mode": "pool",
+                "processes": processes,
+                "seconds": elapsed,
+                "rps": args.requests / elapsed,
+                "speedup": baseline / elapsed
+            })
+
+    if args.json:
+        print(json.dumps({"cores": cores, "requests": args.requests, "results": rows}, indent=2))
+        return
+
+    print(f"{'mode':>8} {'procs':>6} {'seconds':>9} {'req/s':>9} {'speedup':>8}")
+    for row in rows:
+        speedup = f"{row['speedup']:.2f}x" if "speedup" in row else "-"
+        print(f"{row['mode']:>8} {row['processes']:>6} {row['seconds']:>9.3f} {row['rps']:>9.1f} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
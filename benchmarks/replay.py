@@ -0,0 +1,67 @@
+"""
+Prueba de carga offline reproduciendo una traza grabada con TraceRecorder
+
+Con --latency zero mide solo la sobrecarga propia del cliente; con
+--latency original reproduce los tiempos de modelo y herramientas grabados.
+
+Uso:
+    python benchmarks/replay.py trace.jsonl --latency zero --concurrency 20 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from deepseek_mcp_client import TraceReplayer
+from deepseek_mcp_client.utils.logging_config import disable_external_logging
+
+
+async def replay(path: str, latency: str, concurrency: int, rounds: int):
+    replayer = TraceReplayer.load(path, latency=latency)
+    client = replayer.create_client()
+    durations = []
+    executions = 0
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            results = await replayer.replay_executions(client, concurrency=concurrency)
+            durations.append(time.perf_counter() - start)
+            executions += len(results)
+    finally:
+        await client.close()
+
+    total = sum(durations)
+    return {
+        "benchmark": "replay",
+        "trace": path,
+        "latency": latency,
+        "concurrency": concurrency,
+        "rounds": rounds,
+        "executions": executions,
+        "round_mean_s": statistics.fmean(durations) if durations else None,
+        "per_execution_ms": total / executions * 1000 if executions else None,
+        "throughput_rps": executions / total if total else None,
+        "replayer": replayer.stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducir una traza como prueba de carga")
+    parser.add_argument("trace")
+    parser.add_argument("--latency", choices=["zero", "original"], default="zero")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    disable_external_logging()
+    report = asyncio.run(replay(args.trace, args.latency, args.concurrency, args.rounds))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Suite de benchmarks offline de DeepSeekClient
+
+Levanta un LLM stub compatible con OpenAI y servidores MCP stub locales, ejecuta
+los escenarios y escribe resultados en JSON para seguir regresiones.
+
+Uso:
+    python benchmarks/run.py --transport memory --repeat 10 --output bench.json
+    python benchmarks/run.py --scenarios single_execute concurrent_executes --llm-latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import deepseek_mcp_client
+from deepseek_mcp_client.utils.logging_config import disable_external_logging
+
+from scenarios import SCENARIOS, BenchmarkEnvironment, BenchmarkSettings
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_scenarios(names, settings: BenchmarkSettings):
+    results = []
+    with BenchmarkEnvironment(settings) as env:
+        for name in names:
+            scenario = await SCENARIOS[name](env)
+            results.append(scenario.summary())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline de DeepSeekClient")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--transport", choices=["memory", "stdio", "http"], default="memory")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tools", type=int, default=10, help="Herramientas por servidor")
+    parser.add_argument("--tool-latency", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--tools-per-turn", type=int, default=3)
+    parser.add_argument("--large-result-size", type=int, default=256 * 1024)
+    parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+    args = parser.parse_args()
+
+    disable_external_logging()
+    settings = BenchmarkSettings(
+        transport=args.transport,
+        tool_count=args.tools,
+        tool_latency=args.tool_latency,
+        llm_latency=args.llm_latency,
+        tokens_per_second=args.tokens_per_second,
+        concurrency=args.concurrency,
+        tools_per_turn=args.tools_per_turn,
+        large_result_size=args.large_result_size,
+        repeat=args.repeat
+    )
+
+    results = asyncio.run(run_scenarios(args.scenarios, settings))
+    report = {
+        "suite": "deepseek_mcp_client",
+        "version": deepseek_mcp_client.__version__,
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": vars(settings),
+        "results": results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
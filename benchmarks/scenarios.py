@@ -0,0 +1,208 @@
+"""
+Escenarios de benchmark de extremo a extremo contra servidores stub locales
+"""
+import asyncio
+import os
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from openai import AsyncOpenAI
+
+from deepseek_mcp_client import DeepSeekClient
+
+from stub_llm import StubLLMServer
+from stub_mcp import HttpStubServer, build_stub_server, stdio_server_config
+
+
+@dataclass
+class BenchmarkSettings:
+    """Parámetros comunes de los escenarios"""
+    transport: str = "memory"
+    tool_count: int = 10
+    tool_latency: float = 0.0
+    llm_latency: float = 0.0
+    tokens_per_second: float = 0.0
+    result_size: int = 64
+    concurrency: int = 10
+    tools_per_turn: int = 3
+    large_result_size: int = 256 * 1024
+    repeat: int = 5
+
+
+@dataclass
+class ScenarioResult:
+    """Tiempos de un escenario en segundos"""
+    name: str
+    samples: List[float] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+        return {
+            "name": self.name,
+            "runs": len(ordered),
+            "mean_s": statistics.fmean(ordered) if ordered else None,
+            "p50_s": statistics.median(ordered) if ordered else None,
+            "p95_s": ordered[p95_index] if ordered else None,
+            "min_s": ordered[0] if ordered else None,
+            "max_s": ordered[-1] if ordered else None,
+            **self.extra
+        }
+
+
+class BenchmarkEnvironment:
+    """Levanta los stubs de LLM y MCP y construye clientes apuntando a ellos"""
+
+    def __init__(self, settings: BenchmarkSettings):
+        self.settings = settings
+        self._stack = ExitStack()
+        self._http_servers: Dict[int, HttpStubServer] = {}
+
+    def __enter__(self) -> "BenchmarkEnvironment":
+        os.environ.setdefault("DEEPSEEK_API_KEY", "benchmark")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stack.close()
+
+    def llm(self, tool_calls: List[Dict[str, Any]]) -> StubLLMServer:
+        """Iniciar un stub de LLM con el guion de tool_calls dado"""
+        return self._stack.enter_context(StubLLMServer(
+            latency=self.settings.llm_latency,
+            tokens_per_second=self.settings.tokens_per_second or None,
+            tool_calls=tool_calls
+        ))
+
+    def server_config(self, result_size: int) -> Any:
+        """Configuración del servidor MCP según el transporte elegido"""
+        s = self.settings
+        if s.transport == "memory":
+            return build_stub_server(s.tool_count, s.tool_latency, result_size)
+        if s.transport == "stdio":
+            return stdio_server_config(s.tool_count, s.tool_latency, result_size)
+        if s.transport == "http":
+            server = self._http_servers.get(result_size)
+            if server is None:
+                server = self._stack.enter_context(HttpStubServer(s.tool_count, s.tool_latency, result_size))
+                self._http_servers[result_size] = server
+            return {"url": server.url, "timeout": None}
+        raise ValueError(f"Unsupported transport: {s.transport}")
+
+    def client(self, llm: StubLLMServer, result_size: int = None) -> DeepSeekClient:
+        """Crear un DeepSeekClient conectado a los stubs"""
+        client = DeepSeekClient(
+            model="deepseek-chat",
+            mcp_servers=[self.server_config(result_size or self.settings.result_size)]
+        )
+        client.deepseek_client = AsyncOpenAI(api_key="benchmark", base_url=llm.base_url)
+        client._raw_body_supported = client._supports_raw_body(client.deepseek_client)
+        return client
+
+
+def _tool_calls(count: int) -> List[Dict[str, Any]]:
+    return [{"name": f"tool_{i}", "arguments": {"query": "benchmark"}} for i in range(count)]
+
+
+async def _timed(coro_factory: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    result = await coro_factory()
+    elapsed = time.perf_counter() - start
+    if getattr(result, "success", True) is False:
+        raise RuntimeError(f"Execution failed: {result.error}")
+    if getattr(result, "tools_used", None) == []:
+        raise RuntimeError("No tools were executed; check the MCP stub connection")
+    return elapsed
+
+
+async def scenario_cold_start(env: BenchmarkEnvironment) -> ScenarioResult:
+    """Crear cliente, conectar y ejecutar la primera instrucción"""
+    llm = env.llm(_tool_calls(1))
+    result = ScenarioResult("cold_start")
+    for _ in range(env.settings.repeat):
+        async def run():
+            client = env.client(llm)
+            try:
+                return await client.execute("cold start")
+            finally:
+                await client.close()
+        result.samples.append(await _timed(run))
+    return result
+
+
+async def scenario_single_execute(env: BenchmarkEnvironment) -> ScenarioResult:
+    """Ejecuciones secuenciales con un cliente ya conectado"""
+    llm = env.llm(_tool_calls(1))
+    client = env.client(llm)
+    await client.execute("warm up")
+    result = ScenarioResult("single_execute")
+    try:
+        for _ in range(env.settings.repeat):
+            result.samples.append(await _timed(lambda: client.execute("single")))
+    finally:
+        await client.close()
+    return result
+
+
+async def scenario_concurrent_executes(env: BenchmarkEnvironment) -> ScenarioResult:
+    """N ejecuciones concurrentes sobre el mismo cliente"""
+    llm = env.llm(_tool_calls(1))
+    client = env.client(llm)
+    await client.execute("warm up")
+    n = env.settings.concurrency
+    result = ScenarioResult("concurrent_executes", extra={"concurrency": n})
+    try:
+        for _ in range(env.settings.repeat):
+            async def run_batch():
+                results = await asyncio.gather(*(client.execute(f"concurrent {i}") for i in range(n)))
+                failed = [r for r in results if not r.success]
+                if failed:
+                    raise RuntimeError(f"Execution failed: {failed[0].error}")
+            result.samples.append(await _timed(run_batch))
+        mean = statistics.fmean(result.samples)
+        result.extra["throughput_rps"] = n / mean if mean else None
+    finally:
+        await client.close()
+    return result
+
+
+async def scenario_multi_tool_turn(env: BenchmarkEnvironment) -> ScenarioResult:
+    """Un turno que solicita varias herramientas"""
+    k = min(env.settings.tools_per_turn, env.settings.tool_count)
+    llm = env.llm(_tool_calls(k))
+    client = env.client(llm)
+    await client.execute("warm up")
+    result = ScenarioResult("multi_tool_turn", extra={"tools_per_turn": k})
+    try:
+        for _ in range(env.settings.repeat):
+            result.samples.append(await _timed(lambda: client.execute("multi tool")))
+    finally:
+        await client.close()
+    return result
+
+
+async def scenario_large_tool_result(env: BenchmarkEnvironment) -> ScenarioResult:
+    """Herramienta que devuelve un resultado grande"""
+    size = env.settings.large_result_size
+    llm = env.llm(_tool_calls(1))
+    client = env.client(llm, result_size=size)
+    await client.execute("warm up")
+    result = ScenarioResult("large_tool_result", extra={"result_bytes": size})
+    try:
+        for _ in range(env.settings.repeat):
+            result.samples.append(await _timed(lambda: client.execute("large result")))
+    finally:
+        await client.close()
+    return result
+
+
+SCENARIOS = {
+    "cold_start": scenario_cold_start,
+    "single_execute": scenario_single_execute,
+    "concurrent_executes": scenario_concurrent_executes,
+    "multi_tool_turn": scenario_multi_tool_turn,
+    "large_tool_result": scenario_large_tool_result,
+}
@@ -0,0 +1,141 @@
+"""
+Servidor local compatible con la API de chat de OpenAI/DeepSeek para benchmarks
+
+Simula latencia hasta el primer byte, velocidad de generación en tokens por
+segundo y guiones de tool_calls, sin acceso a red.
+
+Uso:
+    with StubLLMServer(latency=0.05, tool_calls=[{"name": "tool_0", "arguments": {}}]) as llm:
+        client.deepseek_client = AsyncOpenAI(api_key="stub", base_url=llm.base_url)
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class StubLLMServer:
+    """Servidor HTTP en un hilo que responde a POST /chat/completions"""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+        completion_tokens: int = 50,
+        tool_calls: Optional[List[Dict[str, Any]]] = None,
+        answer: str = "Stub answer",
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Inicializar servidor stub
+
+        Args:
+            latency: Segundos de espera antes de responder
+            tokens_per_second: Velocidad de generación simulada (None = instantánea)
+            completion_tokens: Tokens de salida reportados por respuesta
+            tool_calls: Herramientas a solicitar en el turno de planificación
+                        (lista de {"name": ..., "arguments": {...}})
+            answer: Texto de la respuesta final
+            host: Interfaz de escucha
+            port: Puerto (0 = aleatorio)
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.tool_calls = tool_calls or []
+        self.answer = answer
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def build_response(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Construir la respuesta según el estado de la conversación"""
+        messages = request.get("messages") or []
+        planning_turn = bool(request.get("tools")) and not any(m.get("role") == "tool" for m in messages)
+
+        if planning_turn and self.tool_calls:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{i}_{uuid.uuid4().hex[:6]}",
+                    "type": "function",
+                    "function": {
+                        "name": call["name"],
+                        "arguments": json.dumps(call.get("arguments", {}))
+                    }
+                } for i, call in enumerate(self.tool_calls)]
+            }
+            finish_reason = "tool_calls"
+        else:
+            message = {"role": "assistant", "content": self.answer}
+            finish_reason = "stop"
+
+        prompt_tokens = len(json.dumps(request)) // 4
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": finish_reason, "message": message}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": prompt_tokens + self.completion_tokens
+            }
+        }
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests.append(request)
+
+                delay = stub.latency
+                if stub.tokens_per_second:
+                    delay += stub.completion_tokens / stub.tokens_per_second
+                if delay:
+                    time.sleep(delay)
+
+                body = json.dumps(stub.build_response(request)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,131 @@
+"""
+Servidores MCP stub para benchmarks (memoria, STDIO y HTTP)
+
+Cada servidor expone `tool_count` herramientas `tool_<i>` con latencia y tamaño
+de resultado configurables.
+
+Uso como script (STDIO o HTTP):
+    python benchmarks/stub_mcp.py --transport stdio --tools 10 --latency 0.01
+    python benchmarks/stub_mcp.py --transport http --port 8765
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastmcp import FastMCP
+
+SCRIPT_PATH = Path(__file__).resolve()
+
+
+def build_stub_server(tool_count: int = 5, latency: float = 0.0, result_size: int = 64) -> FastMCP:
+    """
+    Crear un servidor FastMCP en memoria
+
+    Args:
+        tool_count: Número de herramientas
+        latency: Segundos que tarda cada herramienta
+        result_size: Caracteres del resultado de cada herramienta
+    """
+    server = FastMCP("BenchmarkStub")
+    payload = "x" * result_size
+
+    def make_tool(index: int):
+        async def tool(query: str = "", limit: int = 10) -> str:
+            if latency:
+                await asyncio.sleep(latency)
+            return payload
+
+        tool.__name__ = f"tool_{index}"
+        tool.__doc__ = f"Benchmark tool number {index}"
+        return tool
+
+    for i in range(tool_count):
+        server.tool(make_tool(i))
+    return server
+
+
+def _server_args(tool_count: int, latency: float, result_size: int) -> List[str]:
+    return ["--tools", str(tool_count), "--latency", str(latency), "--result-size", str(result_size)]
+
+
+def stdio_server_config(tool_count: int = 5, latency: float = 0.0, result_size: int = 64) -> Dict[str, Any]:
+    """Configuración de DeepSeekClient para lanzar el stub por STDIO"""
+    return {
+        "command": sys.executable,
+        "args": [str(SCRIPT_PATH), "--transport", "stdio", *_server_args(tool_count, latency, result_size)],
+        "timeout": None
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class HttpStubServer:
+    """Lanza el stub MCP HTTP en un subproceso y espera a que acepte conexiones"""
+
+    def __init__(self, tool_count: int = 5, latency: float = 0.0, result_size: int = 64, port: Optional[int] = None):
+        self.port = port or _free_port()
+        self.args = _server_args(tool_count, latency, result_size)
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/mcp"
+
+    def start(self, wait: float = 15.0) -> "HttpStubServer":
+        self._process = subprocess.Popen(
+            [sys.executable, str(SCRIPT_PATH), "--transport", "http", "--port", str(self.port), *self.args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError(f"HTTP stub server did not start on port {self.port}")
+
+    def stop(self):
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+    def __enter__(self) -> "HttpStubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor MCP stub para benchmarks")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tools", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--result-size", type=int, default=64)
+    args = parser.parse_args()
+
+    server = build_stub_server(args.tools, args.latency, args.result_size)
+    if args.transport == "http":
+        server.run(transport="http", host="127.0.0.1", port=args.port, show_banner=False)
+    else:
+        server.run(transport="stdio", show_banner=False)
+
+
+if __name__ == "__main__":
+    main()
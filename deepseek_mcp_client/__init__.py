@@ -8,16 +8,36 @@ y funcionalidades avanzadas de monitoreo.
 
 # Importaciones principales con imports absolutos
 from deepseek_mcp_client.client.deepseek_client import DeepSeekClient
-from deepseek_mcp_client.models.client_result import ClientResult
+from deepseek_mcp_client.client.sync_client import SyncDeepSeekClient
+from deepseek_mcp_client.client.worker_pool import WorkerPool
+from deepseek_mcp_client.client.model_router import ModelRouter
+from deepseek_mcp_client.client.deadline import HedgePolicy, DeadlineExceededError, ExecutionCancelledError
+from deepseek_mcp_client.client.rate_limiter import RateLimitScheduler
+from deepseek_mcp_client.client.provider_pool import ProviderPool, ProviderEndpoint
+from deepseek_mcp_client.client.concurrency_limiter import AdaptiveConcurrencyLimiter, ServerOverloadedError
+from deepseek_mcp_client.client.checkpoint import Checkpoint, MemoryCheckpointStore, FileCheckpointStore
+from deepseek_mcp_client.models.client_result import ClientResult, ResultMetadata
 from deepseek_mcp_client.models.server_config import MCPServerConfig
+from deepseek_mcp_client.models.generation_config import GenerationConfig
 from deepseek_mcp_client.handlers.message_handler import DeepSeekMessageHandler
+from deepseek_mcp_client.handlers.progress_bus import ProgressBus, ProgressEvent
 from deepseek_mcp_client.utils.logging_config import (
     setup_logging,
     get_logger,
     setup_colored_logging,
     disable_external_logging,
-    enable_external_logging
+    enable_external_logging,
+    configure_logging,
+    shutdown_logging,
+    set_subsystem_levels,
+    JsonFormatter
 )
+from deepseek_mcp_client.utils.schema_optimizer import SchemaOptimizer
+from deepseek_mcp_client.utils.trace import TraceRecorder, TraceReplayer
+from deepseek_mcp_client.utils.result_sink import JsonlResultSink, ColumnarResultSink, read_columns
+from deepseek_mcp_client.cache.completion_cache import CompletionCache, MemoryCacheBackend, DiskCacheBackend
+from deepseek_mcp_client.cache.semantic_cache import SemanticCache
+from deepseek_mcp_client.cache.resource_cache import ResourceCache
 
 # Información del paquete
 __version__ = "2.0.0"
@@ -29,13 +49,33 @@ __description__ = "Cliente para conectar modelos DeepSeek con servidores MCP"
 __all__ = [
     # Cliente principal
     "DeepSeekClient",
+    "SyncDeepSeekClient",
+    "WorkerPool",
+    "ModelRouter",
+    "HedgePolicy",
+    "DeadlineExceededError",
+    "ExecutionCancelledError",
+    "RateLimitScheduler",
+    "ProviderPool",
+    "ProviderEndpoint",
+    "AdaptiveConcurrencyLimiter",
+    "ServerOverloadedError",
+    
+    # Puntos de control y reanudación
+    "Checkpoint",
+    "MemoryCheckpointStore",
+    "FileCheckpointStore",
     
     # Modelos de datos
     "ClientResult",
+    "ResultMetadata",
     "MCPServerConfig",
+    "GenerationConfig",
     
     # Handlers
     "DeepSeekMessageHandler",
+    "ProgressBus",
+    "ProgressEvent",
     
     # Utilidades de logging
     "setup_logging",
@@ -43,6 +83,29 @@ __all__ = [
     "setup_colored_logging",
     "disable_external_logging",
     "enable_external_logging",
+    "configure_logging",
+    "shutdown_logging",
+    "set_subsystem_levels",
+    "JsonFormatter",
+    
+    # Optimización de esquemas
+    "SchemaOptimizer",
+    
+    # Grabación y reproducción
+    "TraceRecorder",
+    "TraceReplayer",
+    
+    # Exportación de resultados por lotes
+    "JsonlResultSink",
+    "ColumnarResultSink",
+    "read_columns",
+    
+    # Cache de ejecuciones
+    "CompletionCache",
+    "MemoryCacheBackend",
+    "DiskCacheBackend",
+    "SemanticCache",
+    "ResourceCache",
     
     # Metadatos
     "__version__",
@@ -0,0 +1,18 @@
+from .completion_cache import (
+    CompletionCache,
+    MemoryCacheBackend,
+    DiskCacheBackend,
+    make_cache_key
+)
+from .semantic_cache import SemanticCache, HashedNgramEmbedder
+from .resource_cache import ResourceCache
+
+__all__ = [
+    "CompletionCache",
+    "MemoryCacheBackend",
+    "DiskCacheBackend",
+    "make_cache_key",
+    "SemanticCache",
+    "HashedNgramEmbedder",
+    "ResourceCache"
+]
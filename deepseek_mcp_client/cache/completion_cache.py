@@ -0,0 +1,390 @@
+"""
+Cache de ejecuciones completas indexado por modelo, mensajes, herramientas y muestreo
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from deepseek_mcp_client.models.client_result import ClientResult
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalizar espacios en blanco de un mensaje"""
+    return " ".join((text or "").split())
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    tools_digest: Optional[str],
+    sampling: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Construir la clave de cache de una ejecución
+
+    Args:
+        model: Modelo DeepSeek
+        messages: Mensajes iniciales (se normalizan los espacios del contenido)
+        tools_digest: Hash del registro de herramientas
+        sampling: Parámetros de muestreo
+
+    Returns:
+        Clave hexadecimal
+    """
+    normalized = [
+        {"role": m.get("role"), "content": normalize_text(m.get("content"))} for m in messages
+    ]
+    payload = json.dumps(
+        {"model": model, "messages": normalized, "tools": tools_digest, "sampling": sampling or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def serialize_result(result: ClientResult) -> Dict[str, Any]:
+    """Convertir un ClientResult exitoso al formato almacenado en cache"""
+    return {
+        "output": result.output,
+        "execution_id": result.execution_id,
+        "tools_used": list(result.tools_used),
+        "metadata": dict(result.metadata)
+    }
+
+
+def materialize_result(
+    stored: Dict[str, Any],
+    execution_id: str,
+    start_time: datetime,
+    **cache_metadata: Any
+) -> ClientResult:
+    """
+    Reconstruir un ClientResult desde cache para la ejecución actual
+
+    Args:
+        stored: Resultado serializado
+        execution_id: Identificador de la ejecución actual
+        start_time: Inicio de la ejecución actual
+        cache_metadata: Metadatos adicionales del acierto
+    """
+    metadata = dict(stored["metadata"])
+    metadata.update({
+        "cached": True,
+        "cached_execution_id": stored["execution_id"],
+        **cache_metadata,
+        "duration": (datetime.now() - start_time).total_seconds()
+    })
+    return ClientResult(
+        output=stored["output"],
+        success=True,
+        execution_id=execution_id,
+        timestamp=start_time,
+        tools_used=list(stored["tools_used"]),
+        metadata=metadata
+    )
+
+
+@dataclass
+class CacheEntry:
+    """Entrada almacenada en un backend"""
+    value: Dict[str, Any]
+    expires_at: Optional[float]
+    size: int
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+
+class MemoryCacheBackend:
+    """Backend en memoria con expulsión LRU por número de entradas y bytes"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.is_expired():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        self.delete(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    async def load(self, key: str) -> Optional[CacheEntry]:
+        return self.get(key)
+
+    async def save(self, key: str, entry: CacheEntry):
+        self.set(key, entry)
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    Backend en disco: un archivo JSON por entrada, expulsión por antigüedad de acceso
+
+    El orden de acceso y el tamaño de cada entrada se llevan en memoria (el
+    directorio se recorre una sola vez al crear el backend), de modo que guardar
+    no vuelve a listar el directorio. load() y save() leen y escriben en un hilo.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_entries: int = 10000, max_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        # Clave -> bytes en disco, de la menos a la más recientemente usada
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._scan()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _scan(self):
+        """Cargar el índice desde el directorio (orden por fecha de modificación)"""
+        found = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Borrado por otro proceso mientras se listaba
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._index[key] = size
+            self._bytes += size
+
+    def _read(self, key: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+            data = json.loads(raw)
+            # Tiempo de acceso en disco: conserva el orden LRU entre reinicios
+            os.utime(path, None)
+        except (OSError, ValueError):
+            return None
+        return data, len(raw)
+
+    def _write(self, key: str, entry: CacheEntry) -> int:
+        path = self._path(key)
+        raw = json.dumps({"value": entry.value, "expires_at": entry.expires_at}, ensure_ascii=False).encode("utf-8")
+        tmp = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+        return len(raw)
+
+    def _unlink(self, keys: List[str]):
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def _forget(self, key: str):
+        self._bytes -= self._index.pop(key, 0)
+
+    def _track(self, key: str, size: int) -> List[str]:
+        """Registrar una entrada en el índice y devolver las claves expulsadas"""
+        self._forget(key)
+        self._index[key] = size
+        self._bytes += size
+        evicted = []
+        while self._index and (
+            len(self._index) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest, oldest_size = self._index.popitem(last=False)
+            self._bytes -= oldest_size
+            evicted.append(oldest)
+            self.evictions += 1
+        return evicted
+
+    def _after_read(self, key: str, read) -> Tuple[Optional[CacheEntry], List[str]]:
+        """Actualizar el índice tras una lectura: (entrada, claves a borrar del disco)"""
+        if read is None:
+            self._forget(key)
+            return None, []
+        data, size = read
+        entry = CacheEntry(value=data["value"], expires_at=data.get("expires_at"), size=size)
+        if entry.is_expired():
+            self._forget(key)
+            return None, [key]
+        if key in self._index:
+            self._index.move_to_end(key)
+            return entry, []
+        # Escrita por otro proceso que comparte el directorio
+        return entry, self._track(key, size)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry, stale = self._after_read(key, self._read(key))
+        self._unlink(stale)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        self._unlink(self._track(key, self._write(key, entry)))
+
+    async def load(self, key: str) -> Optional[CacheEntry]:
+        """Leer sin bloquear el event loop"""
+        entry, stale = self._after_read(key, await asyncio.to_thread(self._read, key))
+        if stale:
+            await asyncio.to_thread(self._unlink, stale)
+        return entry
+
+    async def save(self, key: str, entry: CacheEntry):
+        """Guardar sin bloquear el event loop; el índice se actualiza en el loop"""
+        evicted = self._track(key, await asyncio.to_thread(self._write, key, entry))
+        if evicted:
+            await asyncio.to_thread(self._unlink, evicted)
+
+    def delete(self, key: str):
+        self._forget(key)
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        self._index.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class CompletionCache:
+    """
+    Cache opt-in de resultados de execute().
+
+    Solo se almacenan ejecuciones exitosas. Las peticiones concurrentes con la
+    misma clave esperan a la primera en lugar de repetir las llamadas
+    (protección contra estampidas).
+    """
+
+    def __init__(self, backend=None, ttl: Optional[float] = 300.0):
+        """
+        Inicializar cache
+
+        Args:
+            backend: MemoryCacheBackend (por defecto) o DiskCacheBackend (get/set y load/save async)
+            ttl: Segundos de validez de cada entrada (None = sin expiración)
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Estadísticas
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "coalesced": 0
+        }
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[ClientResult]],
+        execution_id: str,
+        start_time: datetime
+    ) -> ClientResult:
+        """
+        Devolver el resultado cacheado o calcularlo una sola vez
+
+        Args:
+            key: Clave de cache
+            compute: Corrutina que ejecuta la instrucción
+            execution_id: Identificador de la ejecución actual
+            start_time: Inicio de la ejecución actual
+        """
+        entry = await self.backend.load(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            return materialize_result(entry.value, execution_id, start_time, cache_layer="exact", cache_key=key[:16])
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            stored = await asyncio.shield(pending)
+            if stored is not None:
+                return materialize_result(stored, execution_id, start_time, cache_layer="exact", cache_key=key[:16])
+            return await compute()
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        stored = None
+        try:
+            result = await compute()
+            if result.success:
+                stored = serialize_result(result)
+                await self.save(key, stored)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(stored)
+
+    def _entry(self, value: Dict[str, Any]) -> CacheEntry:
+        size = len(json.dumps(value, ensure_ascii=False, default=str))
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        return CacheEntry(value=value, expires_at=expires_at, size=size)
+
+    def store(self, key: str, value: Dict[str, Any]):
+        """Guardar un resultado serializado"""
+        self.backend.set(key, self._entry(value))
+        self.stats["stores"] += 1
+
+    async def save(self, key: str, value: Dict[str, Any]):
+        """Guardar un resultado serializado desde el event loop"""
+        await self.backend.save(key, self._entry(value))
+        self.stats["stores"] += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Invalidar una clave o todo el cache"""
+        if key is None:
+            self.backend.clear()
+        else:
+            self.backend.delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del cache"""
+        stats = self.stats.copy()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self.backend)
+        stats["evictions"] = getattr(self.backend, "evictions", 0)
+        return stats
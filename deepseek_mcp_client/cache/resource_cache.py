@@ -0,0 +1,110 @@
+"""
+Cache de contenido de recursos y prompts MCP invalidado por versión
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+# Familias de entradas: cada aviso *_list_changed invalida solo la suya
+RESOURCES = "resources"
+PROMPTS = "prompts"
+
+
+class ResourceCache:
+    """
+    Contenido leído de servidores MCP indexado por URI (o prompt y argumentos).
+
+    Cada servidor tiene un número de versión por familia (recursos y prompts)
+    que se incrementa al recibir notifications/resources/list_changed o
+    notifications/prompts/list_changed. Las entradas guardan la versión con la
+    que se leyeron y dejan de ser válidas en cuanto cambia, sin recorrer el
+    cache. `ttl` acota además la vida de cada entrada para servidores que no
+    envían avisos.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = 300.0):
+        """
+        Inicializar cache
+
+        Args:
+            max_entries: Entradas máximas (LRU)
+            ttl: Segundos de validez de cada entrada (None = hasta el siguiente aviso)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, Any]]" = OrderedDict()
+        self._versions: Dict[Tuple[Hashable, str], int] = {}
+
+        # Estadísticas
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+
+    def version(self, server: Hashable, family: str) -> int:
+        """Versión actual del contenido de un servidor"""
+        return self._versions.get((server, family), 0)
+
+    def bump(self, server: Hashable, family: str):
+        """Invalidar todo el contenido de una familia de un servidor"""
+        self._versions[(server, family)] = self.version(server, family) + 1
+        self.stats["invalidations"] += 1
+
+    def get(self, server: Hashable, family: str, key: Hashable) -> Optional[Any]:
+        """Obtener una entrada si sigue vigente"""
+        entry_key = (server, family, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            version, stored_at, value = entry
+            fresh = self.ttl is None or time.monotonic() - stored_at < self.ttl
+            if version == self.version(server, family) and fresh:
+                self._entries.move_to_end(entry_key)
+                self.stats["hits"] += 1
+                return value
+            del self._entries[entry_key]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, server: Hashable, family: str, key: Hashable, value: Any, version: Optional[int] = None):
+        """
+        Guardar una entrada
+
+        Args:
+            server: Servidor de origen
+            family: RESOURCES o PROMPTS
+            key: URI o clave del prompt
+            value: Contenido
+            version: Versión leída antes de la petición; si llegó un aviso mientras
+                tanto la entrada nace caducada (por defecto, la actual)
+        """
+        entry_key = (server, family, key)
+        if version is None:
+            version = self.version(server, family)
+        self._entries[entry_key] = (version, time.monotonic(), value)
+        self._entries.move_to_end(entry_key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, server: Hashable, family: str, key: Hashable):
+        """Eliminar una entrada concreta"""
+        if self._entries.pop((server, family, key), None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Vaciar el cache"""
+        self._entries.clear()
+        self._versions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del cache"""
+        stats = self.stats.copy()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._entries)
+        return stats
@@ -0,0 +1,278 @@
+"""
+Cache semántico de instrucciones casi duplicadas
+
+Las instrucciones se convierten en vectores con una función de embedding local
+(por defecto un vectorizador de n-gramas con hashing, sin red) y se comparan por
+similitud coseno contra las instrucciones ya respondidas del mismo registro de
+herramientas. Los números y nombres propios de la instrucción deben coincidir
+exactamente para aceptar un acierto: "pedidos del cliente 42" nunca reutiliza la
+respuesta de "pedidos del cliente 43" aunque los vectores sean casi iguales.
+NumPy (extra `semantic`) se usa para la similitud por lotes si está instalado.
+"""
+import math
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+EmbeddingFunction = Callable[[str], Sequence[float]]
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"[.!?¿¡:;\n]+")
+
+# Fórmulas de cortesía e inmediatez que no cambian la respuesta
+DEFAULT_FILLERS = (
+    "please", "right now", "now", "thanks", "thank you",
+    "por favor", "ahora mismo", "ahora", "gracias"
+)
+
+
+def key_tokens(text: str) -> frozenset:
+    """
+    Tokens que deben coincidir exactamente entre instrucciones equivalentes
+
+    Palabras con dígitos (ids, cantidades, fechas) y palabras en mayúscula que
+    no abren una frase (nombres propios).
+    """
+    keys = set()
+    for sentence in _SENTENCE_RE.split(text):
+        for position, word in enumerate(_WORD_RE.findall(sentence)):
+            if any(c.isdigit() for c in word) or (position > 0 and word[0].isupper()):
+                keys.add(word.lower())
+    return frozenset(keys)
+
+
+class HashedNgramEmbedder:
+    """Vectorizador de n-gramas de caracteres y palabras con hashing"""
+
+    def __init__(
+        self,
+        dimensions: int = 512,
+        char_ngrams: Tuple[int, ...] = (3, 4),
+        word_weight: float = 2.0,
+        fillers: Sequence[str] = DEFAULT_FILLERS
+    ):
+        """
+        Inicializar vectorizador
+
+        Args:
+            dimensions: Tamaño del vector
+            char_ngrams: Longitudes de n-gramas de caracteres
+            word_weight: Peso de las palabras completas frente a los n-gramas
+            fillers: Expresiones que se ignoran al vectorizar
+        """
+        self.dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        self.word_weight = word_weight
+        # Las expresiones más largas primero ("ahora mismo" antes que "ahora")
+        phrases = sorted((f.lower() for f in fillers), key=len, reverse=True)
+        self._fillers = re.compile(r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b") if phrases else None
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        # crc32 es estable entre procesos, a diferencia de hash()
+        h = zlib.crc32(feature.encode("utf-8"))
+        return h % self.dimensions, (1.0 if (h >> 31) & 1 else -1.0)
+
+    def __call__(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        text = text.lower()
+        if self._fillers is not None:
+            text = self._fillers.sub(" ", text)
+        words = _WORD_RE.findall(text)
+        for word in words:
+            index, sign = self._bucket(f"w:{word}")
+            vector[index] += sign * self.word_weight
+        joined = f" {' '.join(words)} "
+        for n in self.char_ngrams:
+            for i in range(len(joined) - n + 1):
+                index, sign = self._bucket(joined[i:i + n])
+                vector[index] += sign
+        return vector
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else list(vector)
+
+
+class _Partition:
+    """Índice vectorial de un registro de herramientas"""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.slots: Dict[int, Dict[str, Any]] = {}
+        self.free: List[int] = []
+        self.size = 0
+        if np is not None:
+            self.matrix = np.zeros((16, dimensions), dtype=np.float32)
+            self.valid = np.zeros(16, dtype=bool)
+        else:
+            self.rows: Dict[int, List[float]] = {}
+
+    def add(self, vector: List[float], entry: Dict[str, Any]) -> int:
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = self.size
+            self.size += 1
+            if np is not None and slot >= len(self.matrix):
+                self.matrix = np.vstack([self.matrix, np.zeros_like(self.matrix)])
+                self.valid = np.concatenate([self.valid, np.zeros_like(self.valid)])
+        if np is not None:
+            self.matrix[slot] = vector
+            self.valid[slot] = True
+        else:
+            self.rows[slot] = vector
+        self.slots[slot] = entry
+        return slot
+
+    def remove(self, slot: int):
+        if self.slots.pop(slot, None) is None:
+            return
+        if np is not None:
+            self.valid[slot] = False
+        else:
+            self.rows.pop(slot, None)
+        self.free.append(slot)
+
+    def matches(self, vector: List[float], threshold: float) -> List[Tuple[int, float]]:
+        """Huecos con similitud >= threshold, de mayor a menor"""
+        if not self.slots:
+            return []
+        if np is not None:
+            scores = self.matrix[:self.size] @ np.asarray(vector, dtype=np.float32)
+            scores[~self.valid[:self.size]] = -np.inf
+            slots = np.nonzero(scores >= threshold)[0]
+            found = [(int(slot), float(scores[slot])) for slot in slots]
+        else:
+            found = [
+                (slot, score) for slot, score in
+                ((s, sum(a * b for a, b in zip(row, vector))) for s, row in self.rows.items())
+                if score >= threshold
+            ]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+class SemanticCache:
+    """
+    Cache de respuestas para instrucciones parafraseadas.
+
+    Cada partición corresponde a un estado del cliente (modelo, prompt,
+    herramientas y muestreo), de modo que nunca se reutiliza una respuesta
+    generada con otro registro de herramientas.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[EmbeddingFunction] = None,
+        threshold: float = 0.9,
+        capacity: int = 1024,
+        ttl: Optional[float] = None,
+        match_keys: bool = True
+    ):
+        """
+        Inicializar cache semántico
+
+        Args:
+            embedder: Función texto -> vector (por defecto HashedNgramEmbedder)
+            threshold: Similitud coseno mínima para considerar un acierto
+            capacity: Número máximo de entradas entre todas las particiones
+            ttl: Segundos de validez de cada entrada (None = sin expiración)
+            match_keys: Exigir los mismos números y nombres propios (ver key_tokens)
+        """
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+        self.match_keys = match_keys
+        self._partitions: Dict[str, _Partition] = {}
+        self._lru: "OrderedDict[Tuple[str, int], None]" = OrderedDict()
+
+        # Estadísticas
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "key_mismatches": 0
+        }
+
+    def _embed(self, text: str) -> List[float]:
+        return _normalize(self.embedder(text))
+
+    def lookup(self, partition: str, text: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Buscar la instrucción más parecida de la partición
+
+        Returns:
+            (valor almacenado, similitud) o None si no supera el umbral
+        """
+        index = self._partitions.get(partition)
+        if index is not None:
+            keys = key_tokens(text) if self.match_keys else None
+            for slot, score in index.matches(self._embed(text), self.threshold):
+                entry = index.slots[slot]
+                if entry["expires_at"] is not None and time.time() >= entry["expires_at"]:
+                    self._evict(partition, slot)
+                    continue
+                if keys is not None and entry["keys"] != keys:
+                    # Misma forma, otro cliente/fecha/cantidad: no es la misma pregunta
+                    self.stats["key_mismatches"] += 1
+                    continue
+                self._lru.move_to_end((partition, slot))
+                self.stats["hits"] += 1
+                return entry["value"], score
+        self.stats["misses"] += 1
+        return None
+
+    def store(self, partition: str, text: str, value: Dict[str, Any]):
+        """Guardar la respuesta de una instrucción"""
+        # Expulsar antes de insertar para reutilizar el hueco liberado
+        while self._lru and len(self._lru) >= self.capacity:
+            oldest_partition, oldest_slot = next(iter(self._lru))
+            self._evict(oldest_partition, oldest_slot)
+            self.stats["evictions"] += 1
+
+        vector = self._embed(text)
+        index = self._partitions.get(partition)
+        if index is None:
+            index = self._partitions[partition] = _Partition(len(vector))
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        entry = {"text": text, "value": value, "expires_at": expires_at, "keys": key_tokens(text)}
+        slot = index.add(vector, entry)
+        self._lru[(partition, slot)] = None
+        self.stats["stores"] += 1
+
+    def _evict(self, partition: str, slot: int):
+        self._lru.pop((partition, slot), None)
+        index = self._partitions.get(partition)
+        if index is None:
+            return
+        index.remove(slot)
+        if not index.slots:
+            del self._partitions[partition]
+
+    def clear(self):
+        """Vaciar el cache"""
+        self._partitions.clear()
+        self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del cache"""
+        stats = self.stats.copy()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._lru)
+        stats["partitions"] = len(self._partitions)
+        stats["vectorized"] = np is not None
+        return stats
@@ -1,5 +1,14 @@
 from .deepseek_client import DeepSeekClient
+from .model_router import ModelRouter
+from .provider_pool import ProviderPool, ProviderEndpoint
+from .sync_client import SyncDeepSeekClient
+from .worker_pool import WorkerPool
 
 __all__ = [
-    "DeepSeekClient"
+    "DeepSeekClient",
+    "SyncDeepSeekClient",
+    "WorkerPool",
+    "ModelRouter",
+    "ProviderPool",
+    "ProviderEndpoint"
 ]
\ No newline at end of file
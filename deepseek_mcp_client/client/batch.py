@@ -0,0 +1,92 @@
+"""
+Ejecución de lotes de instrucciones con escritura incremental y reanudación
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from deepseek_mcp_client.models.client_result import ClientResult
+from deepseek_mcp_client.utils.result_sink import ResultSink
+
+
+def batch_execution_ids(instructions: Sequence[str]) -> List[str]:
+    """
+    Identificadores deterministas por posición e instrucción
+
+    Repetir el mismo lote produce los mismos ids, lo que permite reanudarlo
+    saltando los que ya están en el destino.
+    """
+    return [
+        hashlib.sha1(f"{index}\0{instruction}".encode("utf-8")).hexdigest()[:16]
+        for index, instruction in enumerate(instructions)
+    ]
+
+
+async def run_batch(
+    execute: Callable[..., Awaitable[ClientResult]],
+    instructions: Sequence[str],
+    max_concurrency: Optional[int] = None,
+    sink: Optional[ResultSink] = None,
+    execution_ids: Optional[Sequence[str]] = None,
+    on_result: Optional[Callable[[ClientResult], Any]] = None,
+    collect: bool = True,
+    keep_raw_response: bool = True
+) -> List[Optional[ClientResult]]:
+    """
+    Ejecutar un lote de instrucciones
+
+    Args:
+        execute: Corrutina execute(instruction, **kwargs)
+        instructions: Instrucciones a ejecutar
+        max_concurrency: Máximo de ejecuciones simultáneas (None = todas a la vez)
+        sink: Destino donde se escribe cada resultado al terminar
+        execution_ids: Ids de cada instrucción (con sink, por defecto batch_execution_ids)
+        on_result: Callback con cada resultado en orden de finalización
+        collect: Devolver los resultados (False = solo el destino, memoria acotada)
+        keep_raw_response: Conservar la respuesta cruda del SDK en los resultados devueltos
+
+    Returns:
+        Resultados en el orden de las instrucciones, con None para las saltadas
+        por estar ya completadas en el destino; lista vacía si collect=False
+    """
+    instructions = list(instructions)
+    if execution_ids is None and sink is not None:
+        execution_ids = batch_execution_ids(instructions)
+    if execution_ids is not None and len(execution_ids) != len(instructions):
+        raise ValueError("execution_ids must have one id per instruction")
+
+    completed = sink.completed_ids() if sink is not None else set()
+    pending = [
+        index for index in range(len(instructions))
+        if execution_ids is None or execution_ids[index] not in completed
+    ]
+    results: List[Optional[ClientResult]] = [None] * len(instructions) if collect else []
+
+    async def run(index: int):
+        kwargs = {"execution_id": execution_ids[index]} if execution_ids is not None else {}
+        result = await execute(instructions[index], **kwargs)
+        if not keep_raw_response:
+            result.raw_response = None
+        if sink is not None:
+            sink.write(result)
+        if on_result is not None:
+            on_result(result)
+        if collect:
+            results[index] = result
+
+    try:
+        if not max_concurrency or max_concurrency >= len(pending):
+            await asyncio.gather(*(run(index) for index in pending))
+        else:
+            # Un número fijo de tareas consume la cola: memoria acotada con lotes enormes
+            queue = iter(pending)
+
+            async def consume():
+                for index in queue:
+                    await run(index)
+
+            await asyncio.gather(*(consume() for _ in range(max_concurrency)))
+    finally:
+        if sink is not None:
+            sink.flush()
+    return results
@@ -0,0 +1,337 @@
+"""
+Puntos de control de ejecuciones para reanudarlas sin repetir trabajo
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote, unquote
+
+from openai.types.chat import ChatCompletion
+
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class Checkpoint:
+    """
+    Estado de una ejecución tras su último paso completado
+
+    Se guarda la respuesta de planificación (con las tool_calls), el resultado
+    de cada herramienta ya ejecutada y el uso de tokens por fase. Al completar
+    la ejecución se conserva solo el resultado final.
+    """
+
+    execution_id: str
+    instruction: str
+    status: str = RUNNING
+    generation: Optional[Dict[str, Any]] = None
+    resources: Optional[List[str]] = None
+    # Mensaje del asistente en la planificación: content y tool_calls
+    planning: Optional[Dict[str, Any]] = None
+    escalation: Optional[str] = None
+    tool_results: Dict[str, str] = field(default_factory=dict)
+    phases: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def steps_completed(self) -> int:
+        """Pasos ya hechos: planificación y herramientas"""
+        return (self.planning is not None) + len(self.tool_results)
+
+    def record_planning(self, response, escalation: Optional[str] = None):
+        """Guardar la respuesta de planificación"""
+        message = response.choices[0].message
+        self.planning = {
+            "content": message.content,
+            "tool_calls": [
+                {"id": tc.id, "name": tc.function.name, "arguments": tc.function.arguments}
+                for tc in (message.tool_calls or [])
+            ]
+        }
+        self.escalation = escalation
+
+    def planning_response(self) -> ChatCompletion:
+        """Reconstruir la respuesta de planificación guardada"""
+        message = {"role": "assistant", "content": self.planning.get("content")}
+        if self.planning.get("tool_calls"):
+            message["tool_calls"] = [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {"name": tc["name"], "arguments": tc["arguments"]}
+                } for tc in self.planning["tool_calls"]
+            ]
+        return ChatCompletion.model_validate({
+            "id": f"checkpoint-{self.execution_id}",
+            "object": "chat.completion",
+            "created": int(self.created_at),
+            "model": "checkpoint",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+                "message": message
+            }]
+        })
+
+    def complete(self, result: Dict[str, Any]):
+        """Marcar como completada conservando solo el resultado"""
+        self.status = COMPLETED
+        self.result = result
+        self.planning = None
+        self.tool_results = {}
+        self.error = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Checkpoint":
+        return cls(**data)
+
+
+class CheckpointStore(ABC):
+    """
+    Base de los almacenes de puntos de control
+
+    Las subclases implementan get, _write, delete, execution_ids, clear y
+    __len__. El cliente guarda con save(), que no bloquea el event loop en los
+    almacenes con E/S. Con `completed_ttl` las ejecuciones completadas se
+    borran pasado ese tiempo (0 = al completarse); las fallidas se conservan
+    para poder reanudarlas.
+    """
+
+    def __init__(self, completed_ttl: Optional[float] = None):
+        """
+        Inicializar almacén
+
+        Args:
+            completed_ttl: Segundos que se conserva una ejecución completada (None = siempre)
+        """
+        self.completed_ttl = completed_ttl
+        self._last_prune = time.time()
+
+        # Estadísticas
+        self.stats = {
+            "saves": 0,
+            "resumed": 0,
+            "steps_skipped": 0,
+            "pruned": 0
+        }
+
+    @abstractmethod
+    def get(self, execution_id: str) -> Optional[Checkpoint]:
+        """Punto de control de una ejecución o None"""
+
+    @abstractmethod
+    def _write(self, execution_id: str, data: Dict[str, Any]):
+        """Guardar el estado serializable de una ejecución"""
+
+    @abstractmethod
+    def delete(self, execution_id: str):
+        """Borrar el punto de control de una ejecución"""
+
+    @abstractmethod
+    def execution_ids(self, status: Optional[str] = None) -> List[str]:
+        """Ids guardados, opcionalmente filtrados por estado"""
+
+    @abstractmethod
+    def clear(self):
+        """Borrar todos los puntos de control"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de puntos de control guardados"""
+
+    def _snapshot(self, checkpoint: Checkpoint) -> Optional[Dict[str, Any]]:
+        """Estado a escribir, o None si la ejecución completada no se conserva"""
+        checkpoint.updated_at = time.time()
+        self.stats["saves"] += 1
+        if checkpoint.status == COMPLETED and self.completed_ttl == 0:
+            return None
+        return checkpoint.to_dict()
+
+    def set(self, checkpoint: Checkpoint):
+        """Guardar el estado actual de la ejecución"""
+        data = self._snapshot(checkpoint)
+        if data is None:
+            self.delete(checkpoint.execution_id)
+        else:
+            self._write(checkpoint.execution_id, data)
+        if checkpoint.status == COMPLETED and self._prune_due():
+            self.prune()
+
+    async def load(self, execution_id: str) -> Optional[Checkpoint]:
+        """Leer desde el event loop (por defecto igual que get)"""
+        return self.get(execution_id)
+
+    async def save(self, checkpoint: Checkpoint):
+        """Guardar el estado actual desde el event loop (por defecto igual que set)"""
+        self.set(checkpoint)
+
+    def _prune_due(self) -> bool:
+        if not self.completed_ttl:
+            return False
+        # Como mucho una pasada por cada décima parte del TTL (y al menos cada minuto)
+        return time.time() - self._last_prune >= min(self.completed_ttl / 10, 60.0)
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        Borrar ejecuciones completadas antiguas
+
+        Args:
+            older_than: Antigüedad mínima en segundos (por defecto completed_ttl)
+
+        Returns:
+            Número de puntos de control borrados
+        """
+        max_age = older_than if older_than is not None else self.completed_ttl
+        self._last_prune = time.time()
+        if max_age is None:
+            return 0
+        removed = 0
+        for execution_id in self.execution_ids(COMPLETED):
+            checkpoint = self.get(execution_id)
+            if checkpoint is not None and self._last_prune - checkpoint.updated_at >= max_age:
+                self.delete(execution_id)
+                removed += 1
+        self.stats["pruned"] += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del almacén"""
+        stats = self.stats.copy()
+        stats["stored"] = len(self)
+        return stats
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Almacén en memoria (pruebas o reintentos dentro del mismo proceso)"""
+
+    def __init__(self, completed_ttl: Optional[float] = None):
+        super().__init__(completed_ttl)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, execution_id: str) -> Optional[Checkpoint]:
+        data = self._entries.get(execution_id)
+        return Checkpoint.from_dict(json.loads(json.dumps(data))) if data is not None else None
+
+    def _write(self, execution_id: str, data: Dict[str, Any]):
+        # Copia serializada: el estado guardado no cambia con la ejecución en curso
+        self._entries[execution_id] = json.loads(json.dumps(data, default=str))
+
+    def delete(self, execution_id: str):
+        self._entries.pop(execution_id, None)
+
+    def execution_ids(self, status: Optional[str] = None) -> List[str]:
+        return [
+            execution_id for execution_id, data in self._entries.items()
+            if status is None or data["status"] == status
+        ]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Almacén en disco: un archivo JSON por ejecución, reemplazado de forma atómica
+
+    El id se codifica en el nombre del archivo (sin separadores ni puntos), así
+    que ningún id escribe fuera del directorio. load() y save() leen y escriben
+    en un hilo; las escrituras de una misma ejecución se aplican en orden.
+    """
+
+    def __init__(self, directory: Union[str, Path], fsync: bool = False, completed_ttl: Optional[float] = None):
+        """
+        Inicializar almacén
+
+        Args:
+            directory: Directorio de los puntos de control
+            fsync: Forzar la escritura a disco en cada paso (sobrevive a cortes de luz)
+            completed_ttl: Segundos que se conserva una ejecución completada (None = siempre)
+        """
+        super().__init__(completed_ttl)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def _encode_id(execution_id: str) -> str:
+        if not execution_id:
+            raise ValueError("execution_id must not be empty")
+        return quote(execution_id, safe="-_").replace(".", "%2E")
+
+    def _path(self, execution_id: str) -> Path:
+        return self.directory / f"{self._encode_id(execution_id)}.json"
+
+    def get(self, execution_id: str) -> Optional[Checkpoint]:
+        try:
+            data = json.loads(self._path(execution_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return Checkpoint.from_dict(data)
+
+    def _write(self, execution_id: str, data: Dict[str, Any]):
+        path = self._path(execution_id)
+        tmp = path.with_name(f"{path.stem}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, default=str))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    async def load(self, execution_id: str) -> Optional[Checkpoint]:
+        return await asyncio.to_thread(self.get, execution_id)
+
+    async def save(self, checkpoint: Checkpoint):
+        """Guardar sin bloquear el event loop: copia en el loop, JSON y disco en un hilo"""
+        execution_id = checkpoint.execution_id
+        data = self._snapshot(checkpoint)
+        # El lock es FIFO: las copias se escriben en el orden en que se tomaron
+        lock = self._locks.setdefault(execution_id, asyncio.Lock())
+        async with lock:
+            if data is None:
+                await asyncio.to_thread(self.delete, execution_id)
+            else:
+                await asyncio.to_thread(self._write, execution_id, data)
+        if checkpoint.status != RUNNING and not lock.locked():
+            self._locks.pop(execution_id, None)
+        if checkpoint.status == COMPLETED and self._prune_due():
+            await asyncio.to_thread(self.prune)
+
+    def delete(self, execution_id: str):
+        self._path(execution_id).unlink(missing_ok=True)
+
+    def execution_ids(self, status: Optional[str] = None) -> List[str]:
+        ids = []
+        for path in self.directory.glob("*.json"):
+            execution_id = unquote(path.stem)
+            if status is not None:
+                checkpoint = self.get(execution_id)
+                if checkpoint is None or checkpoint.status != status:
+                    continue
+            ids.append(execution_id)
+        return ids
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
@@ -0,0 +1,210 @@
+"""
+Límite adaptativo de llamadas simultáneas por servidor MCP
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Any, Dict, Optional, Union
+
+from deepseek_mcp_client.client.rate_limiter import _priority_value, current_priority
+
+
+class ServerOverloadedError(RuntimeError):
+    """La cola del servidor MCP está llena: la llamada se rechaza sin esperar"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Límite de llamadas en vuelo a un servidor que se ajusta según su latencia.
+
+    Con 'gradient' (como Gradient2 de concurrency-limits) compara la latencia
+    reciente con la de referencia: si sube, el límite baja en proporción; si se
+    mantiene, crece con un margen de sqrt(límite). Con 'aimd' suma uno por
+    llamada correcta y multiplica por `backoff` ante un error o timeout. En
+    ambos casos los timeouts y errores de transporte reducen el límite, y el
+    límite solo crece cuando la carga lo aprovecha (en vuelo >= límite / 2).
+
+    Las llamadas que superan el límite esperan en una cola con prioridad (las
+    mismas clases que RateLimitScheduler). Con `max_queue` la cola está acotada:
+    al llenarse se descarta la llamada de menor prioridad con
+    ServerOverloadedError, de modo que un servidor degradado rechaza carga en
+    lugar de acumular timeouts en todas las ejecuciones.
+    """
+
+    ALGORITHMS = ("gradient", "aimd")
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        algorithm: str = "gradient",
+        smoothing: float = 0.2,
+        tolerance: float = 1.5,
+        backoff: float = 0.9,
+        long_window: int = 100,
+        max_queue: Optional[int] = None,
+        name: Optional[str] = None
+    ):
+        """
+        Inicializar limitador
+
+        Args:
+            initial_limit: Llamadas simultáneas al empezar
+            min_limit: Límite mínimo
+            max_limit: Límite máximo
+            algorithm: 'gradient' o 'aimd'
+            smoothing: Peso de cada nuevo cálculo del límite (gradient)
+            tolerance: Aumento de latencia tolerado antes de reducir (gradient)
+            backoff: Factor del límite ante un error o timeout
+            long_window: Muestras de la media de latencia de referencia
+            max_queue: Llamadas en espera como máximo (None = sin límite)
+            name: Nombre del servidor para las estadísticas
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown concurrency algorithm: {algorithm}")
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.algorithm = algorithm
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.max_queue = max_queue
+        self.name = name
+
+        self._long_alpha = 2.0 / (max(1, long_window) + 1)
+        self._rtt_short: Optional[float] = None
+        self._rtt_long: Optional[float] = None
+        self._inflight = 0
+        self._waiting: list = []
+        self._sequence = itertools.count()
+
+        # Estadísticas
+        self.stats = {
+            "calls": 0,
+            "queued": 0,
+            "rejected": 0,
+            "drops": 0,
+            "total_wait": 0.0
+        }
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    async def acquire(self, priority: Union[str, int, None] = None, timeout: Optional[float] = None):
+        """
+        Esperar un hueco para una llamada
+
+        Args:
+            priority: Clase de prioridad o valor numérico (por defecto la de la ejecución)
+            timeout: Espera máxima en cola (asyncio.TimeoutError al agotarse)
+
+        Raises:
+            ServerOverloadedError: Si la cola está llena de llamadas con igual o más prioridad
+        """
+        value = _priority_value(priority if priority is not None else current_priority())
+        self.stats["calls"] += 1
+        if not self._waiting and self._inflight < self.current_limit:
+            self._inflight += 1
+            return
+
+        if self.max_queue is not None and len(self._waiting) >= self.max_queue:
+            self._shed(value)
+        future = asyncio.get_running_loop().create_future()
+        entry = (value, next(self._sequence), future)
+        heapq.heappush(self._waiting, entry)
+        self.stats["queued"] += 1
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # El hueco llegó a la vez que la cancelación: se devuelve
+                self.release()
+            elif entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+            raise
+        finally:
+            self.stats["total_wait"] += time.monotonic() - start
+
+    def _shed(self, priority: int):
+        """Hacer sitio en la cola llena descartando la llamada de menor prioridad"""
+        self.stats["rejected"] += 1
+        worst = max(self._waiting, key=lambda entry: entry[:2])
+        if worst[0] <= priority:
+            raise ServerOverloadedError(f"{self._label()} overloaded: {len(self._waiting)} calls queued")
+        self._waiting.remove(worst)
+        heapq.heapify(self._waiting)
+        worst[2].set_exception(ServerOverloadedError(f"{self._label()} overloaded: dropped for a higher priority call"))
+
+    def _label(self) -> str:
+        return f"MCP server {self.name}" if self.name else "MCP server"
+
+    def release(self, latency: Optional[float] = None, dropped: bool = False):
+        """
+        Liberar el hueco de una llamada terminada
+
+        Args:
+            latency: Duración de la llamada si respondió (None = sin muestra)
+            dropped: La llamada agotó su timeout o falló el transporte
+        """
+        inflight = self._inflight
+        self._inflight = max(0, self._inflight - 1)
+        if dropped:
+            self.stats["drops"] += 1
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        elif latency is not None:
+            self._on_sample(latency, inflight)
+        self._dispatch()
+
+    def _on_sample(self, rtt: float, inflight: int):
+        if self._rtt_long is None:
+            self._rtt_short = self._rtt_long = rtt
+        else:
+            self._rtt_short += 0.5 * (rtt - self._rtt_short)
+            self._rtt_long += self._long_alpha * (rtt - self._rtt_long)
+            # Si la latencia baja de forma sostenida la referencia la sigue más rápido
+            if self._rtt_long > 2 * self._rtt_short:
+                self._rtt_long *= 0.95
+
+        if self.algorithm == "aimd":
+            if inflight * 2 >= self.limit:
+                self.limit = min(float(self.max_limit), self.limit + 1)
+            return
+
+        # Sin carga suficiente la latencia no dice nada del límite
+        if inflight * 2 < self.limit:
+            return
+        gradient = max(0.5, min(1.0, self.tolerance * self._rtt_long / max(self._rtt_short, 1e-9)))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        new_limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), new_limit))
+
+    def _dispatch(self):
+        """Dar hueco a las llamadas en espera por orden de prioridad"""
+        while self._waiting and self._inflight < self.current_limit:
+            _, _, future = heapq.heappop(self._waiting)
+            if future.done():
+                continue
+            future.set_result(None)
+            self._inflight += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del limitador"""
+        stats = self.stats.copy()
+        stats["limit"] = self.current_limit
+        stats["inflight"] = self._inflight
+        stats["waiting"] = len(self._waiting)
+        stats["algorithm"] = self.algorithm
+        stats["rtt_short"] = round(self._rtt_short, 4) if self._rtt_short is not None else None
+        stats["rtt_long"] = round(self._rtt_long, 4) if self._rtt_long is not None else None
+        return stats
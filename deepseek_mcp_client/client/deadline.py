@@ -0,0 +1,196 @@
+"""
+Plazos por ejecución y peticiones cubiertas (hedged) a DeepSeek
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+
+class DeadlineExceededError(TimeoutError):
+    """El presupuesto de tiempo de la ejecución no alcanza para el siguiente paso"""
+
+
+class ExecutionCancelledError(Exception):
+    """La ejecución se canceló con DeepSeekClient.cancel()"""
+
+
+class Deadline:
+    """Presupuesto de tiempo de una ejecución"""
+
+    def __init__(self, seconds: float):
+        """
+        Inicializar plazo
+
+        Args:
+            seconds: Segundos disponibles desde ahora
+        """
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativos)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def ensure(self, needed: float = 0.0, step: str = "next step"):
+        """
+        Fallar de inmediato si el tiempo restante no cubre el paso
+
+        Args:
+            needed: Duración estimada del paso
+            step: Descripción del paso para el mensaje de error
+        """
+        remaining = self.remaining()
+        if remaining <= 0 or remaining < needed:
+            raise DeadlineExceededError(
+                f"Deadline exceeded before {step}: {remaining:.3f}s left, ~{needed:.3f}s needed"
+            )
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("deepseek_mcp_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Plazo de la ejecución en curso (se propaga a las tareas hijas)"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Establecer el plazo de la ejecución en curso"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class LatencyTracker:
+    """Ventana deslizante de latencias para estimar percentiles"""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentil q (0-1) de las latencias recientes"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+        return ordered[index]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95)
+        }
+
+
+class HedgePolicy:
+    """
+    Petición duplicada cuando la primera tarda más que el percentil configurado.
+
+    La primera respuesta correcta gana y la otra se cancela.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        delay: Optional[float] = None,
+        min_samples: int = 10,
+        min_delay: float = 0.05
+    ):
+        """
+        Inicializar política
+
+        Args:
+            percentile: Percentil de latencia tras el que se lanza el duplicado
+            delay: Retardo fijo en segundos (ignora el percentil)
+            min_samples: Muestras necesarias antes de cubrir con el percentil
+            min_delay: Retardo mínimo
+        """
+        self.percentile = percentile
+        self.fixed_delay = delay
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+
+        # Estadísticas
+        self.stats = {
+            "requests": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "primary_wins": 0
+        }
+
+    def delay(self, tracker: LatencyTracker) -> Optional[float]:
+        """Retardo antes del duplicado, o None si aún no hay datos"""
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        if len(tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, tracker.percentile(self.percentile))
+
+    async def run(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        tracker: LatencyTracker,
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """
+        Ejecutar la petición con cobertura
+
+        Args:
+            factory: Crea una nueva petición en cada llamada
+            tracker: Latencias recientes para calcular el retardo
+            deadline: Plazo de la ejecución; no se cubre si no queda tiempo
+        """
+        self.stats["requests"] += 1
+        delay = self.delay(tracker)
+        primary = asyncio.ensure_future(factory())
+        if delay is None or (deadline is not None and deadline.remaining() <= delay):
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            hedge = asyncio.ensure_future(factory())
+            tasks.add(hedge)
+            self.stats["hedged"] += 1
+
+            error = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.stats["hedge_wins" if task is hedge else "primary_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas de cobertura"""
+        stats = self.stats.copy()
+        stats["hedge_rate"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        stats["hedge_win_rate"] = stats["hedge_wins"] / stats["hedged"] if stats["hedged"] else 0.0
+        return stats
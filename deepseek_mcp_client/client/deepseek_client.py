@@ -1,24 +1,73 @@
 """
 Cliente principal DeepSeek con soporte MCP
 """
+import hashlib
+import asyncio
+import inspect
 import json
 import os
+import time
 import uuid
-from typing import Dict, List, Any, Optional, Union
+import warnings
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
 from fastmcp import Client, FastMCP
 from fastmcp.client.transports import StdioTransport, StreamableHttpTransport
 from fastmcp.client.logging import LogMessage
+from fastmcp.exceptions import ToolError
+import mcp.types
 
 # Imports absolutos - ESTO ES LA CLAVE
 from deepseek_mcp_client.models.client_result import ClientResult
 from deepseek_mcp_client.models.server_config import MCPServerConfig
+from deepseek_mcp_client.models.generation_config import GenerationConfig, TOOL_PARAMS
 from deepseek_mcp_client.handlers.message_handler import DeepSeekMessageHandler
-from deepseek_mcp_client.utils.logging_config import disable_external_logging
+from deepseek_mcp_client.handlers.progress_bus import ProgressBus, ProgressEvent
+from deepseek_mcp_client.client.request_builder import ChatRequestBuilder
+from deepseek_mcp_client.client.model_router import ModelRouter, PLANNING, FINAL
+from deepseek_mcp_client.client.rate_limiter import RateLimitScheduler, priority_scope
+from deepseek_mcp_client.client.provider_pool import ProviderPool
+from deepseek_mcp_client.client.concurrency_limiter import AdaptiveConcurrencyLimiter
+from deepseek_mcp_client.client.execution_context import (
+    ExecutionContext,
+    ToolSnapshot,
+    current_execution,
+    execution_scope
+)
+from deepseek_mcp_client.client.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    ExecutionCancelledError,
+    HedgePolicy,
+    LatencyTracker,
+    current_deadline,
+    deadline_scope
+)
+from deepseek_mcp_client.utils.logging_config import (
+    disable_external_logging,
+    ensure_logging,
+    get_logger,
+    MCP_LOG_LEVELS
+)
+from deepseek_mcp_client.utils.schema_optimizer import SchemaOptimizer, estimate_tokens, tool_input_schema
+from deepseek_mcp_client.utils.argument_validation import ToolArgumentValidator, format_validation_error
+from deepseek_mcp_client.cache.completion_cache import (
+    CompletionCache,
+    make_cache_key,
+    materialize_result,
+    serialize_result
+)
+from deepseek_mcp_client.cache.semantic_cache import SemanticCache
+from deepseek_mcp_client.cache.resource_cache import ResourceCache, RESOURCES, PROMPTS
+from deepseek_mcp_client.client.subscriptions import ResourceSubscription, SessionHolder
+from deepseek_mcp_client.client.batch import run_batch
+from deepseek_mcp_client.client.checkpoint import Checkpoint, CheckpointStore, COMPLETED, FAILED, RUNNING
+from deepseek_mcp_client.utils.result_sink import ResultSink
 
 load_dotenv()
 
@@ -35,19 +84,67 @@ class DeepSeekClient:
         mcp_servers: Optional[List[Union[str, Dict[str, Any], FastMCP, MCPServerConfig]]] = None,
         enable_logging: bool = False,
         enable_progress: bool = False,
-        log_level: str = "INFO"
+        log_level: str = "INFO",
+        optimize_tool_schemas: bool = False,
+        schema_description_budget: Optional[int] = 200,
+        validate_tool_arguments: bool = True,
+        completion_cache: Optional[CompletionCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        generation_config: Optional[GenerationConfig] = None,
+        model_router: Optional[ModelRouter] = None,
+        direct_return_tools: Optional[Dict[str, Union[bool, str]]] = None,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        adaptive_concurrency: Union[bool, Dict[str, Any]] = False,
+        default_deadline: Optional[float] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        provider_pool: Optional[ProviderPool] = None,
+        resource_cache: Optional[ResourceCache] = None,
+        progress_bus: Optional[ProgressBus] = None,
+        keep_raw_response: Optional[bool] = None,
+        checkpoint_store: Optional[CheckpointStore] = None
     ):
         """
         Inicializar DeepSeekClient
         """
         self.model = model
         self.system_prompt = system_prompt or "You are a helpful and friendly assistant."
+        self._server_transport_types: Optional[Tuple[str, ...]] = None
         self.mcp_servers = mcp_servers or []
         self.enable_logging = enable_logging
         self.enable_progress = enable_progress
+        self.schema_optimizer = SchemaOptimizer(schema_description_budget) if optimize_tool_schemas else None
+        self.argument_validator = ToolArgumentValidator() if validate_tool_arguments else None
+        self.provider_pool = provider_pool
+        self.completion_cache = completion_cache
+        self.semantic_cache = semantic_cache
+        # Contenido de recursos y prompts MCP, invalidado por los avisos list_changed
+        self.resource_cache = resource_cache if resource_cache is not None else ResourceCache()
+        self.generation_config = generation_config or GenerationConfig()
+        self.model_router = model_router or ModelRouter()
+        # Herramientas cuyo resultado es la respuesta: True (tal cual) o plantilla
+        self.direct_return_tools: Dict[str, Union[bool, str]] = dict(direct_return_tools or {})
+        # Segundos máximos por herramienta; tienen prioridad sobre los de MCPServerConfig
+        self.tool_timeouts: Dict[str, float] = dict(tool_timeouts or {})
+        # Límite adaptativo de llamadas por servidor: True o parámetros de AdaptiveConcurrencyLimiter
+        self.adaptive_concurrency = adaptive_concurrency
+        self.default_deadline = default_deadline
+        self.hedge_policy = hedge_policy
+        self.llm_latency = LatencyTracker()
+        # Progreso de herramientas por ejecución, agrupado y con límite de frecuencia
+        self.progress_bus = progress_bus or ProgressBus()
+        # La respuesta cruda del SDK pesa varios KB: None la conserva en execute() y la
+        # descarta en los resultados de execute_many(); True o False para todos
+        self.keep_raw_response = keep_raw_response
+        # Estado de cada ejecución tras cada paso, para reanudarla con resume()
+        self.checkpoint_store = checkpoint_store
+        # Puede compartirse entre varios clientes que usan la misma clave
+        self.rate_limiter = rate_limiter
         
         # Configurar logging
         self._setup_logging(log_level)
+        if self.enable_progress:
+            self.progress_bus.subscribe(self._log_progress)
         
         # Configurar logs externos según la preferencia del usuario
         if not self.enable_logging:
@@ -60,8 +157,35 @@ class DeepSeekClient:
         self.clients: List[Client] = []
         self.all_tools: List[Dict[str, Any]] = []
         self.tool_to_client: Dict[str, Client] = {}
+        self.tool_schemas: Dict[str, Dict[str, Any]] = {}
+        self.tool_answer_modes: Dict[str, Union[bool, str]] = {}
         self.message_handlers: List[DeepSeekMessageHandler] = []
+        self.client_handlers: Dict[Client, DeepSeekMessageHandler] = {}
+        self.resource_to_client: Dict[str, Client] = {}
+        self.prompt_to_client: Dict[str, Client] = {}
+        # Recursos suscritos con su copia local y sesiones que los mantienen vivos
+        self.subscriptions: Dict[str, ResourceSubscription] = {}
+        self._session_holders: Dict[Client, SessionHolder] = {}
+        # Un solo resources/subscribe por URI aunque se suscriban varias tareas a la vez
+        self._subscription_locks: Dict[str, asyncio.Lock] = {}
+        self._server_tool_timeouts: Dict[Client, Dict[str, float]] = {}
+        self.server_limiters: Dict[Client, AdaptiveConcurrencyLimiter] = {}
+        # Ejecuciones en curso por execution_id, para cancel()
+        self._running_executions: Dict[str, asyncio.Task] = {}
+        self._cancel_reasons: Dict[str, str] = {}
+        self.cancellation_stats = {
+            "tool_timeouts": 0,
+            "tools_cancelled": 0,
+            "executions_cancelled": 0
+        }
         self._connected = False
+        # Conexión y refresco de una sola vez aunque lleguen varias ejecuciones a la vez
+        self._registry_lock: Optional[asyncio.Lock] = None
+        
+        # Cuerpos de petición pre-serializados por versión del registro
+        self.request_builder = ChatRequestBuilder()
+        self._tools_version = 0
+        self._tools_digest_cache = (None, None)
         
         # Log de configuración inicial
         self._log_initialization()
@@ -69,28 +193,47 @@ class DeepSeekClient:
     def _setup_logging(self, log_level: str):
         """Configurar sistema de logging"""
         if self.enable_logging:
-            logging.basicConfig(
-                level=getattr(logging, log_level.upper()),
-                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
+            # Solo la primera vez y si la aplicación no configuró logging
+            ensure_logging(log_level)
         self.logger = logging.getLogger(__name__)
+        self.server_logger = get_logger("mcp_server")
+        self.progress_logger = get_logger("progress")
     
     def _setup_deepseek_client(self):
         """Configurar cliente DeepSeek"""
+        if self.provider_pool is not None:
+            # Las claves y URLs vienen de los endpoints del pool
+            self.api_key = None
+            self.deepseek_client = self.provider_pool.endpoints[0].client
+            self._raw_body_supported = self._supports_raw_body(self.deepseek_client)
+            return
+        
         self.api_key = os.getenv("DEEPSEEK_API_KEY")
         if not self.api_key:
             raise ValueError("Configure DEEPSEEK_API_KEY in environment variables")
         
-        self.deepseek_client = OpenAI(
+        # Con planificador los 429 los reintenta él (Retry-After, prioridad); el SDK no reintenta
+        retries = {"max_retries": 0} if self.rate_limiter is not None else {}
+        self.deepseek_client = AsyncOpenAI(
             api_key=self.api_key,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            **retries
         )
+        self._raw_body_supported = self._supports_raw_body(self.deepseek_client)
+    
+    @staticmethod
+    def _supports_raw_body(openai_client) -> bool:
+        """Verificar si el SDK acepta cuerpos en bytes (post con `content`)"""
+        try:
+            return "content" in inspect.signature(openai_client.post).parameters
+        except (TypeError, ValueError, AttributeError):
+            return False
     
     def _log_initialization(self):
         """Log de inicialización"""
         if self.enable_logging:
             if self.mcp_servers:
-                self.logger.info(f"Initialized with {len(self.mcp_servers)} MCP servers")
+                self.logger.info("Initialized with %s MCP servers", len(self.mcp_servers))
             else:
                 self.logger.info("Initialized in direct mode (no MCP servers)")
     
@@ -143,12 +286,17 @@ class DeepSeekClient:
     
     def _create_client(self, config: MCPServerConfig) -> Client:
         """Crear cliente FastMCP según la configuración"""
-        message_handler = DeepSeekMessageHandler(self.logger)
+        message_handler = DeepSeekMessageHandler(
+            logger=self.logger,
+            on_resources_changed=lambda: self.resource_cache.bump(message_handler, RESOURCES),
+            on_prompts_changed=lambda: self.resource_cache.bump(message_handler, PROMPTS),
+            on_resource_updated=lambda uri: self._on_resource_updated(message_handler, uri)
+        )
         self.message_handlers.append(message_handler)
         
         # Configurar handlers
         log_handler = self._create_log_handler() if self.enable_logging else None
-        progress_handler = self._create_progress_handler() if self.enable_progress else None
+        progress_handler = self._create_progress_handler()
         
         # Crear transporte según tipo
         if config.transport_type == 'http':
@@ -169,131 +317,298 @@ class DeepSeekClient:
         else:
             raise ValueError(f"Unsupported transport type: {config.transport_type}")
         
-        return Client(
+        client = Client(
             transport,
             log_handler=log_handler,
             progress_handler=progress_handler,
             message_handler=message_handler,
             timeout=config.timeout
         )
+        self.client_handlers[client] = message_handler
+        if config.tool_timeouts:
+            self._server_tool_timeouts[client] = dict(config.tool_timeouts)
+        if self.adaptive_concurrency or config.concurrency:
+            options = dict(self.adaptive_concurrency) if isinstance(self.adaptive_concurrency, dict) else {}
+            options.update(config.concurrency or {})
+            self.server_limiters[client] = AdaptiveConcurrencyLimiter(name=config.name, **options)
+        return client
     
     def _create_log_handler(self):
         """Crear handler de logs"""
         async def log_handler(message: LogMessage):
             if self.enable_logging:
-                level_map = logging.getLevelNamesMapping()
-                level = level_map.get(message.level.upper(), logging.INFO)
-                msg = message.data.get('msg', '')
-                extra = message.data.get('extra', {})
-                self.logger.log(level, f"MCP Server: {msg}", extra=extra)
+                level = MCP_LOG_LEVELS.get(message.level, logging.INFO)
+                if not self.server_logger.isEnabledFor(level):
+                    return
+                data = message.data if isinstance(message.data, dict) else {"msg": message.data}
+                self.server_logger.log(level, "MCP Server: %s", data.get('msg', ''), extra=data.get('extra') or {})
         
         return log_handler
     
     def _create_progress_handler(self):
-        """Crear handler de progreso"""
+        """Crear handler de progreso para avisos sin llamada asociada"""
+        session_progress = self.progress_bus.start_call()
+        
         async def progress_handler(progress: float, total: float | None, message: str | None):
-            if self.enable_progress:
-                if total is not None:
-                    percentage = (progress / total) * 100
-                    self.logger.info(f"Progress: {percentage:.1f}% - {message or ''}")
-                else:
-                    self.logger.info(f"Progress: {progress} - {message or ''}")
+            session_progress.publish(progress, total, message)
         
         return progress_handler
     
+    def _log_progress(self, event: ProgressEvent):
+        """Suscriptor del bus que registra el progreso (enable_progress)"""
+        name = event.tool_name or "Progress"
+        if event.percentage is not None:
+            self.progress_logger.info("%s: %.1f%% - %s", name, event.percentage, event.message or "")
+        else:
+            self.progress_logger.info("%s: %s - %s", name, event.progress, event.message or "")
+    
     async def _connect_mcp_servers(self) -> None:
         """Conectar a todos los servidores MCP"""
         if self._connected or not self.mcp_servers:
             return
         
         if self.enable_logging:
-            self.logger.info(f"Connecting to {len(self.mcp_servers)} MCP servers...")
+            self.logger.info("Connecting to %s MCP servers...", len(self.mcp_servers))
         
+        # La lista pudo cambiar en sitio desde la última conexión
+        self._server_transport_types = None
+        self._transport_types()
+        
+        # Registro nuevo: las instantáneas anteriores no se modifican
+        self._install_tools(ToolSnapshot(validator=self._new_argument_validator(), version=self._tools_version + 1))
+        if self.schema_optimizer:
+            self.schema_optimizer.reset_stats()
         for i, server_config in enumerate(self.mcp_servers):
             await self._connect_single_server(i, server_config)
         
         self._connected = True
         if self.enable_logging:
-            self.logger.info(f"Connection completed. {len(self.all_tools)} tools available")
+            self.logger.info("Connection completed. %s tools available", len(self.all_tools))
     
     async def _connect_single_server(self, index: int, server_config):
         """Conectar a un servidor individual"""
         try:
             config = self._parse_server_config(server_config)
             if self.enable_logging:
-                self.logger.info(f"Connecting to server {index+1} ({config.transport_type})")
+                self.logger.info("Connecting to server %s (%s)", index + 1, config.transport_type)
             
             client = self._create_client(config)
             
-            # Probar conexión
-            async with client:
-                await client.ping()
-                tools = await client.list_tools()
-                if self.enable_logging:
-                    self.logger.info(f"Found {len(tools)} tools")
-            
+            # Probar conexión y cargar herramientas en la misma sesión
+            tools_before = len(self.all_tools)
+            try:
+                async with client:
+                    await self._ping_server(client)
+                    await self._load_tools_from_client(client)
+            except Exception:
+                self._forget_client(client)
+                raise
             self.clients.append(client)
-            await self._load_tools_from_client(client)
+            if self.enable_logging:
+                self.logger.info("Found %s tools", len(self.all_tools) - tools_before)
             
         except Exception as e:
             if self.enable_logging:
-                self.logger.error(f"Error connecting to server {index+1}: {e}")
+                self.logger.error("Error connecting to server %s: %s", index + 1, e)
+    
+    async def _ping_server(self, client: Client):
+        """Comprobar el servidor con ping (los servidores sin ping se aceptan)"""
+        try:
+            await client.ping()
+        except Exception as e:
+            code = getattr(e, "code", None)
+            if code is None:
+                code = getattr(getattr(e, "error", None), "code", None)
+            if code != mcp.types.METHOD_NOT_FOUND:
+                raise
+            if self.enable_logging:
+                self.logger.debug("Server does not implement ping, skipping probe")
     
-    async def _load_tools_from_client(self, client: Client) -> None:
-        """Cargar herramientas de un cliente"""
+    def _forget_client(self, client: Client):
+        """Eliminar el estado asociado a un cliente MCP (handler, timeouts, limitador)"""
+        self.client_handlers.pop(client, None)
+        self._server_tool_timeouts.pop(client, None)
+        self.server_limiters.pop(client, None)
+    
+    async def _load_tools_from_client(self, client: Client, registry: Optional[ToolSnapshot] = None) -> None:
+        """
+        Cargar herramientas de un cliente
+        
+        Args:
+            client: Cliente FastMCP
+            registry: Registro en construcción (por defecto el vigente)
+        """
+        live = registry is None
+        registry = registry or self._live_tools()
         async with client:
             tools = await client.list_tools()
             
             for tool in tools:
+                input_schema = tool_input_schema(tool) or {"type": "object", "properties": {}}
+                
+                # El esquema original se conserva para validar argumentos
+                registry.schemas[tool.name] = input_schema
+                answer_mode = self._answer_mode_from_meta(getattr(tool, "meta", None))
+                if answer_mode:
+                    registry.answer_modes[tool.name] = answer_mode
+                if registry.validator:
+                    registry.validator.register(tool.name, input_schema)
+                if self.schema_optimizer:
+                    input_schema = self.schema_optimizer.optimize(input_schema)
+                
                 deepseek_tool = {
                     "type": "function",
                     "function": {
                         "name": tool.name,
                         "description": tool.description or f"Tool: {tool.name}",
-                        "parameters": tool.inputSchema or {"type": "object", "properties": {}}
+                        "parameters": input_schema
                     }
                 }
                 
-                self.all_tools.append(deepseek_tool)
-                self.tool_to_client[tool.name] = client
+                registry.tools.append(deepseek_tool)
+                registry.tool_to_client[tool.name] = client
+            
+            if live:
+                self._tools_version += 1
+    
+    def _live_tools(self) -> ToolSnapshot:
+        """Registro vigente (referencias, sin copiar)"""
+        return ToolSnapshot(
+            tools=self.all_tools,
+            tool_to_client=self.tool_to_client,
+            schemas=self.tool_schemas,
+            answer_modes=self.tool_answer_modes,
+            validator=self.argument_validator,
+            version=self._tools_version
+        )
+    
+    def _tool_snapshot(self) -> ToolSnapshot:
+        """Registro de la ejecución en curso, o el vigente fuera de execute()"""
+        context = current_execution()
+        return context.tools if context is not None else self._live_tools()
+    
+    def _install_tools(self, registry: ToolSnapshot):
+        """Publicar un registro nuevo sin await intermedio (sustitución atómica)"""
+        self.all_tools = registry.tools
+        self.tool_to_client = registry.tool_to_client
+        self.tool_schemas = registry.schemas
+        self.tool_answer_modes = registry.answer_modes
+        self.argument_validator = registry.validator
+        self._tools_version = registry.version
+    
+    def _new_argument_validator(self) -> Optional[ToolArgumentValidator]:
+        """Validador vacío que comparte estadísticas con el vigente"""
+        if self.argument_validator is None:
+            return None
+        validator = ToolArgumentValidator(self.argument_validator.repair)
+        validator.stats = self.argument_validator.stats
+        return validator
     
     async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """Ejecutar herramienta MCP con manejo de progreso"""
-        client = self.tool_to_client.get(tool_name)
+        client = self._tool_snapshot().tool_to_client.get(tool_name)
         if not client:
             return f"Error: Tool {tool_name} not found"
         
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.ensure(0.0, f"tool {tool_name}")
+        
+        timeout = self._tool_timeout(tool_name, client)
+        # Si manda el plazo de quien llama, agotarlo no dice nada de la salud del servidor
+        deadline_bound = False
+        if deadline is not None and (timeout is None or deadline.remaining() < timeout):
+            timeout, deadline_bound = deadline.remaining(), True
+        
+        limiter = self.server_limiters.get(client)
+        tool_progress = self._create_tool_progress_handler(tool_name)
+        started = time.monotonic()
+        acquired = False
+        latency = None
+        dropped = False
         try:
             if self.enable_logging:
-                self.logger.info(f"Executing {tool_name}")
+                self.logger.info("Executing %s", tool_name)
             
+            # La espera en la cola del servidor cuenta dentro del timeout
+            if limiter is not None:
+                await limiter.acquire(timeout=timeout)
+                acquired = True
+            
+            # Al vencer el timeout o cancelarse la ejecución la petición se abandona
+            # y la sesión MCP envía notifications/cancelled para que el servidor pare
             async with client:
-                tool_progress_handler = self._create_tool_progress_handler(tool_name)
+                call_kwargs = {}
+                if timeout is not None:
+                    call_kwargs["timeout"] = max(0.0, timeout - (time.monotonic() - started))
                 
-                result = await client.call_tool(
-                    tool_name, 
-                    arguments,
-                    progress_handler=tool_progress_handler if self.enable_progress else None
-                )
+                call_started = time.monotonic()
+                try:
+                    result = await client.call_tool(
+                        tool_name, 
+                        arguments,
+                        progress_handler=tool_progress,
+                        **call_kwargs
+                    )
+                except ToolError:
+                    # El servidor respondió: error de la herramienta, no de capacidad
+                    latency = time.monotonic() - call_started
+                    raise
+                latency = time.monotonic() - call_started
                 
                 return self._format_tool_result(result, tool_name)
         
+        except asyncio.CancelledError:
+            self.cancellation_stats["tools_cancelled"] += 1
+            if self.enable_logging:
+                self.logger.warning("Tool %s cancelled", tool_name)
+            raise
         except Exception as e:
+            timed_out = timeout is not None and time.monotonic() - started >= timeout
+            dropped = acquired and latency is None and not (timed_out and deadline_bound)
+            if timed_out:
+                self.cancellation_stats["tool_timeouts"] += 1
+                if self.enable_logging:
+                    self.logger.warning("Tool %s timed out after %.1fs", tool_name, timeout)
+                return f"Error executing {tool_name}: timed out after {timeout:.1f}s"
             if self.enable_logging:
-                self.logger.error(f"Error executing {tool_name}: {e}")
+                self.logger.error("Error executing %s: %s", tool_name, e)
             return f"Error executing {tool_name}: {e}"
+        finally:
+            if acquired:
+                limiter.release(latency, dropped)
+            if tool_progress is not None:
+                tool_progress.close()
     
-    def _create_tool_progress_handler(self, tool_name: str):
-        """Crear handler de progreso para herramienta específica"""
-        async def tool_progress_handler(progress: float, total: float | None, message: str | None):
-            if self.enable_progress:
-                if total is not None:
-                    percentage = (progress / total) * 100
-                    self.logger.info(f"{tool_name}: {percentage:.1f}% - {message or ''}")
-                else:
-                    self.logger.info(f"{tool_name}: {progress} - {message or ''}")
+    def _tool_timeout(self, tool_name: str, client: Client) -> Optional[float]:
+        """Timeout propio de la herramienta (None = el del servidor)"""
+        timeout = self.tool_timeouts.get(tool_name)
+        if timeout is None:
+            timeout = self._server_tool_timeouts.get(client, {}).get(tool_name)
+        return timeout
+    
+    def _prepare_tool_arguments(self, tool_name: str, raw_arguments: Optional[str]):
+        """Parsear, reparar y validar argumentos. Devuelve (argumentos, error)"""
+        validator = self._tool_snapshot().validator
+        if not validator:
+            try:
+                return json.loads(raw_arguments or "{}"), None
+            except ValueError:
+                return {}, None
         
-        return tool_progress_handler
+        arguments, issues = validator.validate(tool_name, raw_arguments)
+        if issues:
+            if self.enable_logging:
+                self.logger.warning("Invalid arguments for %s: %s issues", tool_name, len(issues))
+            return arguments, format_validation_error(tool_name, issues)
+        return arguments, None
+    
+    def _create_tool_progress_handler(self, tool_name: str):
+        """Crear publicador de progreso de la llamada (None si nadie escucha)"""
+        if not self.progress_bus.active:
+            return None
+        context = current_execution()
+        return self.progress_bus.start_call(tool_name, context.execution_id if context else None)
     
     def _format_tool_result(self, result, tool_name: str) -> str:
         """Formatear resultado de herramienta"""
@@ -304,106 +619,469 @@ class DeepSeekClient:
                 return str(result['content'])
             else:
                 return json.dumps(result, indent=2, ensure_ascii=False)
+        elif isinstance(getattr(result, "content", None), list):
+            # CallToolResult: concatenar los bloques de texto
+            text = "\n".join(
+                block.text if getattr(block, "type", None) == "text" else str(block)
+                for block in result.content
+            )
+            if getattr(result, "is_error", False):
+                return f"Error in {tool_name}: {text}"
+            return text
         else:
             return str(result)
     
+    def _get_registry_lock(self) -> asyncio.Lock:
+        # Se crea perezosamente para quedar ligado al event loop que lo usa
+        if self._registry_lock is None:
+            self._registry_lock = asyncio.Lock()
+        return self._registry_lock
+    
+    def _tools_dirty(self) -> bool:
+        return any(handler.tool_cache_dirty for handler in self.message_handlers)
+    
+    async def _ensure_tools_ready(self) -> None:
+        """Conectar y refrescar una sola vez aunque haya ejecuciones concurrentes"""
+        if self.mcp_servers and not self._connected:
+            async with self._get_registry_lock():
+                if not self._connected:
+                    await self._connect_mcp_servers()
+        if self.clients and self._tools_dirty():
+            await self.refresh_tools()
+    
     async def refresh_tools(self) -> None:
         """Refrescar herramientas si hay cambios"""
-        for handler in self.message_handlers:
-            if handler.tool_cache_dirty:
+        async with self._get_registry_lock():
+            # Otra ejecución pudo refrescar mientras se esperaba el lock
+            if self._tools_dirty():
                 await self._refresh_tool_cache()
-                break
     
     async def _refresh_tool_cache(self):
-        """Refrescar cache de herramientas"""
+        """Refrescar cache de herramientas construyendo un registro nuevo"""
         if self.enable_logging:
             self.logger.info("Refreshing tool cache...")
-        self.all_tools.clear()
-        self.tool_to_client.clear()
-        
-        for client in self.clients:
-            await self._load_tools_from_client(client)
         
-        # Limpiar flags de todos los handlers
+        # Los flags se limpian antes de cargar: un aviso recibido durante la carga vuelve a marcarlos
         for handler in self.message_handlers:
             handler.tool_cache_dirty = False
         
+        registry = ToolSnapshot(validator=self._new_argument_validator(), version=self._tools_version + 1)
+        if self.schema_optimizer:
+            self.schema_optimizer.reset_stats()
+        
+        for client in self.clients:
+            await self._load_tools_from_client(client, registry)
+        
+        # Las ejecuciones en curso conservan su instantánea anterior
+        self._install_tools(registry)
+        
         if self.enable_logging:
-            self.logger.info(f"Cache updated. {len(self.all_tools)} tools available")
+            self.logger.info("Cache updated. %s tools available", len(self.all_tools))
     
-    async def execute(self, instruction: str) -> ClientResult:
-        """Ejecutar instrucción con soporte completo MCP"""
-        execution_id = str(uuid.uuid4())[:8]
+    async def execute(
+        self,
+        instruction: str,
+        use_cache: bool = True,
+        generation: Optional[Union[GenerationConfig, Dict[str, Any]]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[Union[str, int]] = None,
+        resources: Optional[List[str]] = None,
+        execution_id: Optional[str] = None
+    ) -> ClientResult:
+        """
+        Ejecutar instrucción con soporte completo MCP
+        
+        Args:
+            instruction: Instrucción a ejecutar
+            use_cache: Consultar el cache de ejecuciones si está configurado
+            generation: Ajustes de generación para esta llamada (GenerationConfig o diccionario de cambios)
+            deadline: Segundos disponibles para toda la ejecución (por defecto default_deadline)
+            priority: Clase de prioridad ante el planificador ('interactive', 'default', 'batch')
+            resources: URIs de recursos MCP a incluir en el contexto (se leen del cache)
+            execution_id: Identificador de la ejecución (por defecto uno aleatorio); permite
+                filtrar su progreso con progress_bus.stream(execution_id) antes de lanzarla.
+                Con checkpoint_store, repetir un id sin terminar continúa donde se quedó.
+                cancel(execution_id) la detiene junto con sus herramientas en curso
+        """
+        execution_id = execution_id or str(uuid.uuid4())[:8]
         start_time = datetime.now()
         tools_used = []
+        checkpoint = None
+        budget = deadline if deadline is not None else self.default_deadline
+        task = asyncio.current_task()
+        self._running_executions[execution_id] = task
         
-        try:
-            # Conectar a MCP si es necesario
-            if self.mcp_servers and not self._connected:
-                await self._connect_mcp_servers()
-            
-            # Refrescar herramientas si es necesario
-            if self.clients:
-                await self.refresh_tools()
+        # El plazo se propaga a las llamadas a DeepSeek y a las herramientas
+        with deadline_scope(Deadline(budget) if budget is not None else None), priority_scope(priority):
+            try:
+                config = self.generation_config.merged(generation)
+                if self.provider_pool is not None:
+                    self.provider_pool.start_health_checks()
+                
+                # Conectar a MCP y refrescar herramientas si es necesario
+                await self._ensure_tools_ready()
+                
+                if self.enable_logging:
+                    self.logger.info("Executing: %s", instruction)
+                
+                # La ejecución usa la misma instantánea del registro hasta el final
+                context = ExecutionContext(execution_id, self._live_tools())
+                if resources:
+                    context.context_messages = await self._resource_messages(resources)
+                if self.checkpoint_store is not None:
+                    checkpoint = context.checkpoint = await self._open_checkpoint(execution_id, instruction, config, resources)
+                with execution_scope(context):
+                    if use_cache and (self.completion_cache is not None or self.semantic_cache is not None):
+                        # Las claves se calculan tras refrescar herramientas para reflejar el registro actual
+                        result = await self._execute_cached(instruction, execution_id, start_time, tools_used, config)
+                    else:
+                        result = await self._run_execution(instruction, execution_id, start_time, tools_used, config)
             
+            except asyncio.CancelledError:
+                reason = self._cancel_reasons.pop(execution_id, None)
+                if reason is None:
+                    # Cancelación de quien llama: se propaga como siempre
+                    raise
+                # Cancelación con cancel(): la tarea sigue viva y recibe un resultado de error
+                if hasattr(task, "uncancel"):
+                    task.uncancel()
+                self.cancellation_stats["executions_cancelled"] += 1
+                if self.enable_logging:
+                    self.logger.warning("Execution %s cancelled: %s", execution_id, reason)
+                result = self._create_error_result(ExecutionCancelledError(reason), execution_id, start_time, tools_used)
+            except Exception as e:
+                if self.enable_logging:
+                    self.logger.error("Error in execution: %s", e)
+                result = self._create_error_result(e, execution_id, start_time, tools_used)
+            finally:
+                if self._running_executions.get(execution_id) is task:
+                    del self._running_executions[execution_id]
+        
+        if checkpoint is not None:
+            await self._close_checkpoint(checkpoint, result)
+        return result
+    
+    def cancel(self, execution_id: str, reason: str = "cancelled by caller") -> bool:
+        """
+        Cancelar una ejecución en curso
+        
+        Las llamadas a herramientas en vuelo se abandonan y sus servidores reciben
+        notifications/cancelled. La llamada a execute() devuelve un resultado con
+        error_type 'ExecutionCancelledError'.
+        
+        Args:
+            execution_id: Identificador de la ejecución
+            reason: Motivo incluido en el error
+        
+        Returns:
+            True si la ejecución estaba en curso
+        """
+        task = self._running_executions.get(execution_id)
+        if task is None or task.done():
+            return False
+        self._cancel_reasons[execution_id] = reason
+        task.cancel()
+        return True
+    
+    async def resume(self, execution_id: str, **kwargs) -> ClientResult:
+        """
+        Reanudar una ejecución guardada en checkpoint_store
+        
+        Reutiliza la planificación y los resultados de herramientas ya guardados y
+        solo ejecuta los pasos pendientes. Si la ejecución ya había terminado
+        devuelve el resultado guardado.
+        
+        Args:
+            execution_id: Identificador de la ejecución a reanudar
+            **kwargs: Parámetros de execute (deadline, priority...)
+        
+        Returns:
+            Resultado de la ejecución
+        """
+        if self.checkpoint_store is None:
+            raise ValueError("resume() requires a checkpoint_store")
+        checkpoint = await self.checkpoint_store.load(execution_id)
+        if checkpoint is None:
+            raise KeyError(f"No checkpoint for execution: {execution_id}")
+        if checkpoint.status == COMPLETED and checkpoint.result is not None:
+            return ClientResult.from_dict(checkpoint.result)
+        
+        kwargs.setdefault("generation", checkpoint.generation)
+        kwargs.setdefault("resources", checkpoint.resources)
+        return await self.execute(checkpoint.instruction, execution_id=execution_id, **kwargs)
+    
+    async def _open_checkpoint(
+        self,
+        execution_id: str,
+        instruction: str,
+        config: GenerationConfig,
+        resources: Optional[List[str]]
+    ) -> Checkpoint:
+        """Cargar el punto de control de una ejecución sin terminar o crear uno nuevo"""
+        checkpoint = await self.checkpoint_store.load(execution_id)
+        if checkpoint is not None and checkpoint.status != COMPLETED and checkpoint.instruction == instruction:
+            checkpoint.status = RUNNING
+            self.checkpoint_store.stats["resumed"] += 1
             if self.enable_logging:
-                self.logger.info(f"Executing: {instruction}")
-            
+                self.logger.info("Resuming %s from checkpoint (%s steps done)", execution_id, checkpoint.steps_completed)
+        else:
+            checkpoint = Checkpoint(execution_id, instruction, generation=config.to_dict(), resources=resources)
+        await self.checkpoint_store.save(checkpoint)
+        return checkpoint
+    
+    async def _save_checkpoint(self, checkpoint: Optional[Checkpoint]):
+        """Guardar el punto de control tras completar un paso"""
+        if checkpoint is not None:
+            await self.checkpoint_store.save(checkpoint)
+    
+    async def _close_checkpoint(self, checkpoint: Checkpoint, result: ClientResult):
+        """Guardar el resultado final; una ejecución fallida conserva sus pasos"""
+        if result.success:
+            checkpoint.complete(result.to_dict())
+        else:
+            checkpoint.status = FAILED
+            checkpoint.error = result.error
+        await self.checkpoint_store.save(checkpoint)
+    
+    async def execute_many(
+        self,
+        instructions: List[str],
+        max_concurrency: Optional[int] = None,
+        sink: Optional[ResultSink] = None,
+        execution_ids: Optional[List[str]] = None,
+        collect: bool = True,
+        **kwargs
+    ) -> List[Optional[ClientResult]]:
+        """
+        Ejecutar un lote de instrucciones de forma concurrente
+        
+        Args:
+            instructions: Instrucciones a ejecutar
+            max_concurrency: Máximo de ejecuciones simultáneas (None = sin límite)
+            sink: Destino de resultados (JsonlResultSink, ColumnarResultSink); reanuda
+                saltando las execution_id ya completadas
+            execution_ids: Id de cada instrucción (por defecto deterministas si hay sink)
+            collect: Devolver los resultados además de escribirlos en el destino
+            **kwargs: Parámetros de execute (deadline, generation, priority...)
+        
+        Returns:
+            Resultados en el mismo orden que las instrucciones (None si se saltó; lista vacía si collect=False)
+        """
+        def execute(instruction, **batch_kwargs):
+            return self.execute(instruction, **kwargs, **batch_kwargs)
+        
+        return await run_batch(
+            execute, instructions, max_concurrency, sink, execution_ids,
+            collect=collect, keep_raw_response=self.keep_raw_response is True
+        )
+    
+    async def _run_execution(
+        self,
+        instruction: str,
+        execution_id: str,
+        start_time: datetime,
+        tools_used: List[str],
+        config: Optional[GenerationConfig] = None
+    ) -> ClientResult:
+        """Ejecutar las llamadas a DeepSeek y a las herramientas"""
+        checkpoint = self._current_checkpoint()
+        # Con punto de control las fases (uso de tokens) se guardan con cada paso
+        phases: List[Dict[str, Any]] = checkpoint.phases if checkpoint is not None else []
+        
+        if checkpoint is not None and checkpoint.planning is not None:
+            # Planificación ya hecha en un intento anterior
+            response = checkpoint.planning_response()
+            message = response.choices[0].message
+            escalation = checkpoint.escalation
+            self.checkpoint_store.stats["steps_skipped"] += 1
+        else:
             # Preparar y ejecutar primera llamada
-            response = await self._execute_initial_call(instruction)
+            response = await self._execute_initial_call(instruction, config, phases)
             message = response.choices[0].message
+            escalation = self.model_router.escalation_reason(response)
             
-            # Si no hay herramientas a ejecutar
-            if not message.tool_calls:
-                return self._create_direct_result(response, execution_id, start_time)
+            # Una respuesta sin tool_calls es la respuesta final: con poca confianza se
+            # repite con el modelo de escalado, y si la planificación usa otro modelo u
+            # otros parámetros se repite con los de la fase final
+            if not message.tool_calls and (escalation or self._planning_answer_differs(config)):
+                if escalation:
+                    model = self.model_router.escalation_model
+                    if self.enable_logging:
+                        self.logger.info("Escalating to %s (%s)", model, escalation)
+                else:
+                    model = None
+                    if self.enable_logging:
+                        self.logger.info("No tools called: repeating the answer with final phase settings")
+                response = await self._execute_initial_call(
+                    instruction, config, phases, model=model, escalation=escalation, phase=FINAL
+                )
+                message = response.choices[0].message
             
+            if checkpoint is not None:
+                checkpoint.record_planning(response, escalation)
+                await self._save_checkpoint(checkpoint)
+        
+        # Si no hay herramientas a ejecutar
+        if not message.tool_calls:
+            result = self._create_direct_result(response, execution_id, start_time)
+        else:
             # Ejecutar herramientas y obtener respuesta final
             final_response = await self._execute_tools_and_get_final_response(
-                message, instruction, tools_used
+                message, instruction, tools_used, config, phases, escalation
             )
-            
-            return self._create_success_result(
+            result = self._create_success_result(
                 final_response, execution_id, start_time, tools_used
             )
         
-        except Exception as e:
-            if self.enable_logging:
-                self.logger.error(f"Error in execution: {e}")
-            return self._create_error_result(e, execution_id, start_time, tools_used)
-    
-    async def _execute_initial_call(self, instruction: str):
-        """Ejecutar llamada inicial a DeepSeek"""
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": instruction}
-        ]
+        result.metadata["phases"] = list(phases)
+        result.metadata["escalated"] = any("escalation" in p for p in phases)
+        result.metadata["final_call_skipped"] = any(p.get("skipped") for p in phases)
+        return result
+    
+    async def _execute_cached(
+        self,
+        instruction: str,
+        execution_id: str,
+        start_time: datetime,
+        tools_used: List[str],
+        config: GenerationConfig
+    ) -> ClientResult:
+        """Ejecutar consultando primero el cache semántico y después el exacto"""
+        partition = None
+        if self.semantic_cache is not None:
+            partition = self._cache_partition(config)
+            match = self.semantic_cache.lookup(partition, instruction)
+            if match is not None:
+                stored, similarity = match
+                if self.enable_logging:
+                    self.logger.info("Semantic cache hit (similarity %.3f)", similarity)
+                return materialize_result(
+                    stored, execution_id, start_time,
+                    cache_layer="semantic",
+                    semantic_similarity=round(similarity, 4)
+                )
+        
+        def run():
+            return self._run_execution(instruction, execution_id, start_time, tools_used, config)
+        
+        if self.completion_cache is not None:
+            result = await self.completion_cache.get_or_compute(
+                self._completion_cache_key(instruction, config), run, execution_id, start_time
+            )
+        else:
+            result = await run()
+        
+        if partition is not None and result.success and not result.metadata.get("cached"):
+            self.semantic_cache.store(partition, instruction, serialize_result(result))
+        return result
+    
+    def _tools_digest(self) -> str:
+        """Hash del registro de herramientas, recalculado solo cuando cambia su versión"""
+        registry = self._tool_snapshot()
+        key = (registry.version, id(registry.tools), len(registry.tools))
+        cached_key, digest = self._tools_digest_cache
+        if cached_key != key:
+            tools_bytes = self.request_builder.tools_bytes(registry.tools, registry.version)
+            digest = hashlib.sha256(tools_bytes).hexdigest()
+            self._tools_digest_cache = (key, digest)
+        return digest
+    
+    def _routing_signature(self) -> str:
+        """Modelos que pueden intervenir en una ejecución, para las claves de cache"""
+        router = self.model_router
+        models = [self.model, router.planning_model, router.final_model, router.escalation_model]
+        return "|".join(m or "" for m in models)
+    
+    def _cache_partition(self, config: Optional[GenerationConfig] = None) -> str:
+        """Partición del cache semántico: modelo, prompt, herramientas y generación"""
+        config = config or self.generation_config
+        messages = self._base_messages()
+        return make_cache_key(self._routing_signature(), messages, self._tools_digest(), config.to_dict())
+    
+    def _completion_cache_key(self, instruction: str, config: Optional[GenerationConfig] = None) -> str:
+        """Clave de cache de una instrucción con el estado actual del cliente"""
+        config = config or self.generation_config
+        messages = self._base_messages(instruction)
+        return make_cache_key(self._routing_signature(), messages, self._tools_digest(), config.to_dict())
+    
+    @staticmethod
+    def _current_checkpoint() -> Optional[Checkpoint]:
+        """Punto de control de la ejecución en curso"""
+        context = current_execution()
+        return context.checkpoint if context is not None else None
+    
+    def _base_messages(self, instruction: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Prompt de sistema, contexto de la ejecución (recursos) e instrucción"""
+        context = current_execution()
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if context is not None:
+            messages.extend(context.context_messages)
+        if instruction is not None:
+            messages.append({"role": "user", "content": instruction})
+        return messages
+    
+    async def _execute_initial_call(
+        self,
+        instruction: str,
+        config: Optional[GenerationConfig] = None,
+        phases: Optional[List[Dict[str, Any]]] = None,
+        model: Optional[str] = None,
+        escalation: Optional[str] = None,
+        phase: Optional[str] = None
+    ):
+        """Ejecutar llamada inicial a DeepSeek (planificación, o respuesta final sin herramientas)"""
+        config = config or self.generation_config
+        tools = self._tool_snapshot().tools
+        messages = self._base_messages(instruction)
+        # Sin herramientas esta respuesta es la final
+        phase = phase or (PLANNING if tools else FINAL)
         
         chat_params = {
-            "model": self.model,
+            "model": model or self.model_router.model_for(phase, self.model),
             "messages": messages,
-            "max_tokens": 4000,
-            "temperature": 0.7
+            **config.for_phase(phase, has_tools=bool(tools))
         }
+        if self.model_router.needs_logprobs:
+            chat_params["logprobs"] = True
         
-        if self.all_tools:
-            chat_params["tools"] = self.all_tools
+        if tools:
+            chat_params["tools"] = tools
             if self.enable_logging:
-                self.logger.info(f"Sending {len(self.all_tools)} tools to DeepSeek")
+                self.logger.info("Sending %s tools to DeepSeek", len(tools))
         else:
             if self.enable_logging:
                 self.logger.info("Executing in direct mode (no tools)")
         
-        return self.deepseek_client.chat.completions.create(**chat_params)
+        return await self._create_phase_completion(phase, chat_params, phases, escalation)
+    
+    def _planning_answer_differs(self, config: Optional[GenerationConfig] = None) -> bool:
+        """Si una respuesta de planificación sin tool_calls no sirve como respuesta final"""
+        if not self._tool_snapshot().tools:
+            # Sin herramientas la llamada inicial ya usó la fase final
+            return False
+        if self.model_router.model_for(PLANNING, self.model) != self.model_router.model_for(FINAL, self.model):
+            return True
+        config = config or self.generation_config
+        planning = {k: v for k, v in config.for_phase(PLANNING).items() if k not in TOOL_PARAMS}
+        return planning != config.for_phase(FINAL)
     
-    async def _execute_tools_and_get_final_response(self, message, instruction: str, tools_used: List[str]):
+    async def _execute_tools_and_get_final_response(
+        self,
+        message,
+        instruction: str,
+        tools_used: List[str],
+        config: Optional[GenerationConfig] = None,
+        phases: Optional[List[Dict[str, Any]]] = None,
+        escalation: Optional[str] = None
+    ):
         """Ejecutar herramientas y obtener respuesta final"""
+        config = config or self.generation_config
+        tool_failures = 0
+        checkpoint = self._current_checkpoint()
         if self.enable_logging:
-            self.logger.info(f"Executing {len(message.tool_calls)} tools")
+            self.logger.info("Executing %s tools", len(message.tool_calls))
         
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": instruction}
-        ]
+        messages = self._base_messages(instruction)
         
         # Agregar respuesta de DeepSeek al historial
         messages.append({
@@ -423,13 +1101,28 @@ class DeepSeekClient:
         
         # Ejecutar cada herramienta
         for tool_call in message.tool_calls:
-            try:
-                arguments = json.loads(tool_call.function.arguments)
-            except:
-                arguments = {}
+            tool_name = tool_call.function.name
+            tools_used.append(tool_name)
             
-            tools_used.append(tool_call.function.name)
-            result = await self._execute_tool(tool_call.function.name, arguments)
+            saved = checkpoint.tool_results.get(tool_call.id) if checkpoint is not None else None
+            if saved is not None:
+                # Resultado de un intento anterior: la herramienta no se repite
+                result = saved
+                self.checkpoint_store.stats["steps_skipped"] += 1
+            else:
+                arguments, validation_error = self._prepare_tool_arguments(tool_name, tool_call.function.arguments)
+                if validation_error is not None:
+                    # Los argumentos inválidos vuelven al modelo sin llegar al servidor
+                    result = validation_error
+                    tool_failures += 1
+                else:
+                    result = await self._execute_tool(tool_name, arguments)
+                    if self._is_tool_error(result):
+                        tool_failures += 1
+                    elif checkpoint is not None:
+                        # Solo los resultados correctos: un error se reintenta al reanudar
+                        checkpoint.tool_results[tool_call.id] = result
+                        await self._save_checkpoint(checkpoint)
             
             messages.append({
                 "role": "tool",
@@ -437,18 +1130,238 @@ class DeepSeekClient:
                 "content": result
             })
         
+        # Herramientas de paso directo: el resultado formateado es la respuesta
+        direct_answer = None
+        if not tool_failures:
+            direct_answer = self._direct_answer(message.tool_calls, messages)
+        if direct_answer is not None:
+            if self.enable_logging:
+                self.logger.info("Direct-return tools: skipping final DeepSeek call")
+            return self._direct_return_response(direct_answer, phases)
+        
         # Segunda llamada a DeepSeek con resultados
         if self.enable_logging:
             self.logger.info("DeepSeek processing results...")
         
-        return self.deepseek_client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.all_tools if self.all_tools else None,
-            max_tokens=4000,
-            temperature=0.7
+        escalation = escalation or self.model_router.escalation_reason(tool_failures=tool_failures)
+        if escalation:
+            model = self.model_router.escalation_model
+            if self.enable_logging:
+                self.logger.info("Escalating final answer to %s (%s)", model, escalation)
+        else:
+            model = self.model_router.model_for(FINAL, self.model)
+        
+        tools = self._tool_snapshot().tools
+        return await self._create_phase_completion(FINAL, {
+            "model": model,
+            "messages": messages,
+            "tools": tools if tools else None,
+            **config.for_phase(FINAL, has_tools=bool(tools))
+        }, phases, escalation)
+    
+    @staticmethod
+    def _answer_mode_from_meta(meta: Optional[Dict[str, Any]]) -> Optional[Union[bool, str]]:
+        """Leer el modo de respuesta directa declarado en el _meta de la herramienta"""
+        if not isinstance(meta, dict):
+            return None
+        template = meta.get("answer_template")
+        if isinstance(template, str):
+            return template
+        return True if meta.get("direct_return") is True else None
+    
+    def _answer_mode(self, tool_name: str) -> Optional[Union[bool, str]]:
+        """Modo de respuesta directa de una herramienta (la configuración tiene prioridad)"""
+        if tool_name in self.direct_return_tools:
+            return self.direct_return_tools[tool_name] or None
+        return self._tool_snapshot().answer_modes.get(tool_name)
+    
+    def _direct_answer(self, tool_calls, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Construir la respuesta sin segunda llamada si todas las herramientas son de paso directo
+        
+        Returns:
+            Respuesta formateada o None si alguna herramienta necesita al modelo
+        """
+        results = {m["tool_call_id"]: m["content"] for m in messages if m["role"] == "tool"}
+        answers = []
+        for tool_call in tool_calls:
+            tool_name = tool_call.function.name
+            mode = self._answer_mode(tool_name)
+            if not mode:
+                return None
+            result = results.get(tool_call.id, "")
+            if mode is True:
+                answers.append(result)
+                continue
+            try:
+                arguments = json.loads(tool_call.function.arguments or "{}")
+                answers.append(mode.format_map({
+                    **(arguments if isinstance(arguments, dict) else {}),
+                    "result": result,
+                    "tool": tool_name
+                }))
+            except (ValueError, KeyError, IndexError, AttributeError) as e:
+                if self.enable_logging:
+                    self.logger.warning("Answer template for %s failed: %s", tool_name, e)
+                return None
+        return "\n\n".join(answers)
+    
+    def _direct_return_response(self, answer: str, phases: Optional[List[Dict[str, Any]]] = None) -> ChatCompletion:
+        """Respuesta sintética con el resultado de las herramientas, registrando el ahorro"""
+        final_stats = self.model_router.stats.get(FINAL)
+        if phases is not None:
+            phases.append({
+                "phase": FINAL,
+                "model": None,
+                "duration": 0.0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cost": 0.0,
+                "skipped": "direct_return",
+                # Latencia media de las respuestas finales reales, si hay historial
+                "estimated_seconds_saved": (
+                    final_stats["total_duration"] / final_stats["calls"] if final_stats else None
+                )
+            })
+        return ChatCompletion.model_validate({
+            "id": "direct-return",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "direct-return",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": answer}
+            }]
+        })
+    
+    @staticmethod
+    def _is_tool_error(result: str) -> bool:
+        """Detectar los mensajes de error generados al ejecutar herramientas"""
+        return isinstance(result, str) and result.startswith(("Error: ", "Error executing ", "Error in "))
+    
+    async def _create_phase_completion(
+        self,
+        phase: str,
+        chat_params: Dict[str, Any],
+        phases: Optional[List[Dict[str, Any]]] = None,
+        escalation: Optional[str] = None
+    ):
+        """Enviar petición chat registrando latencia, tokens y coste de la fase"""
+        start = time.perf_counter()
+        response = await self._create_chat_completion(chat_params)
+        report = self.model_router.record(
+            phase, chat_params["model"], time.perf_counter() - start, response, escalation
+        )
+        if phases is not None:
+            phases.append(report)
+        return response
+    
+    async def _create_chat_completion(self, chat_params: Dict[str, Any]):
+        """Enviar petición chat respetando el plazo y, si está configurada, con cobertura"""
+        deadline = current_deadline()
+        if deadline is not None:
+            # Fallar rápido si no queda ni la latencia mediana de una llamada
+            estimate = self.llm_latency.percentile(0.5) if len(self.llm_latency) >= 5 else 0.0
+            deadline.ensure(estimate, "DeepSeek call")
+        
+        if self.hedge_policy is None:
+            return await self._send_chat_completion(chat_params, deadline)
+        return await self.hedge_policy.run(
+            lambda: self._send_chat_completion(chat_params, deadline),
+            self.llm_latency,
+            deadline
+        )
+    
+    async def _send_chat_completion(self, chat_params: Dict[str, Any], deadline: Optional[Deadline] = None):
+        """Enviar una petición chat, pasando por el planificador de límites si está configurado"""
+        if self.provider_pool is None:
+            return await self._rate_limited(
+                lambda: self._dispatch_chat_completion(chat_params, deadline),
+                chat_params
+            )
+        # Con pool cada endpoint tiene sus propios límites en el planificador
+        return await self.provider_pool.call(
+            lambda endpoint: self._rate_limited(
+                lambda: self._dispatch_chat_completion(
+                    endpoint.map_params(chat_params), deadline, endpoint.client, endpoint.name
+                ),
+                chat_params,
+                endpoint.name,
+                retry=False
+            )
+        )
+    
+    async def _rate_limited(self, dispatch, chat_params: Dict[str, Any], key: Optional[str] = None, retry: bool = True):
+        """
+        Pasar la petición por el planificador de límites de su clave, si está configurado
+        
+        Con pool (retry=False) un 429 pausa el endpoint y se relanza al momento para que
+        el pool pruebe otro en lugar de reintentar en el mismo.
+        """
+        if self.rate_limiter is None:
+            return await dispatch()
+        return await self.rate_limiter.submit(
+            dispatch,
+            estimated_tokens=self._estimate_request_tokens(chat_params),
+            key=key,
+            retry=retry
         )
     
+    def _estimate_request_tokens(self, chat_params: Dict[str, Any]) -> int:
+        """Tokens estimados de una petición (entrada + max_tokens) para el cubo TPM"""
+        version = self._tool_snapshot().version
+        tools_bytes = self.request_builder.tools_bytes(chat_params["tools"], version) if chat_params.get("tools") else b""
+        return estimate_tokens(chat_params.get("messages")) + len(tools_bytes) // 4 + (chat_params.get("max_tokens") or 0)
+    
+    async def _dispatch_chat_completion(
+        self,
+        chat_params: Dict[str, Any],
+        deadline: Optional[Deadline] = None,
+        openai_client: Optional[AsyncOpenAI] = None,
+        rate_limit_key: Optional[str] = None
+    ):
+        """Enviar una petición chat, ensamblando el cuerpo desde fragmentos pre-serializados"""
+        openai_client = openai_client or self.deepseek_client
+        timeout = deadline.remaining() if deadline is not None else None
+        # Con planificador se necesita la respuesta cruda para leer las cabeceras x-ratelimit-*
+        want_headers = self.rate_limiter is not None
+        
+        if not self._raw_body_supported:
+            params = {k: v for k, v in chat_params.items() if v is not None}
+            if timeout is not None:
+                params["timeout"] = timeout
+            completions = openai_client.chat.completions
+            create = completions.with_raw_response.create if want_headers else completions.create
+            call = lambda: create(**params)
+        else:
+            body = self.request_builder.build(chat_params, self._tool_snapshot().version)
+            options = {"headers": {"Content-Type": "application/json"}}
+            if want_headers:
+                options["headers"]["X-Stainless-Raw-Response"] = "true"
+            if timeout is not None:
+                options["timeout"] = timeout
+            call = lambda: openai_client.post(
+                "/chat/completions",
+                cast_to=ChatCompletion,
+                content=body,
+                options=options
+            )
+        
+        # Cliente asíncrono: cancelar la tarea (cobertura perdedora, plazo) cierra la
+        # conexión HTTP en lugar de dejar la petición corriendo en un hilo
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(call(), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(f"DeepSeek call exceeded the deadline ({timeout:.3f}s)")
+        self.llm_latency.record(time.perf_counter() - start)
+        
+        if want_headers and hasattr(response, "parse") and hasattr(response, "headers"):
+            self.rate_limiter.observe_headers(response.headers, rate_limit_key)
+            response = response.parse()
+        return response
+    
     def _create_direct_result(self, response, execution_id: str, start_time: datetime) -> ClientResult:
         """Crear resultado para respuesta directa"""
         return ClientResult(
@@ -461,11 +1374,12 @@ class DeepSeekClient:
                 "model": self.model,
                 "direct_response": True,
                 "mcp_enabled": bool(self.mcp_servers),
-                "tools_available": len(self.all_tools),
+                "tools_available": len(self._tool_snapshot().tools),
+                "schema_tokens_saved": self._schema_tokens_saved(),
                 "duration": (datetime.now() - start_time).total_seconds(),
                 "servers_connected": len(self.clients)
             },
-            raw_response=response
+            raw_response=response if self.keep_raw_response is not False else None
         )
     
     def _create_success_result(self, response, execution_id: str, start_time: datetime, tools_used: List[str]) -> ClientResult:
@@ -480,14 +1394,34 @@ class DeepSeekClient:
                 "model": self.model,
                 "mcp_enabled": bool(self.mcp_servers),
                 "tools_executed": len(tools_used),
-                "tools_available": len(self.all_tools),
+                "tools_available": len(self._tool_snapshot().tools),
+                "schema_tokens_saved": self._schema_tokens_saved(),
                 "duration": (datetime.now() - start_time).total_seconds(),
                 "servers_connected": len(self.clients),
-                "transport_types": [self._parse_server_config(s).transport_type for s in self.mcp_servers] if self.mcp_servers else []
+                "transport_types": self._transport_types()
             },
-            raw_response=response
+            raw_response=response if self.keep_raw_response is not False else None
         )
     
+    @property
+    def mcp_servers(self) -> List[Union[str, Dict[str, Any], FastMCP, MCPServerConfig]]:
+        return self._mcp_servers
+    
+    @mcp_servers.setter
+    def mcp_servers(self, servers: List[Union[str, Dict[str, Any], FastMCP, MCPServerConfig]]):
+        self._mcp_servers = servers
+        self._server_transport_types = None
+    
+    def _transport_types(self) -> Tuple[str, ...]:
+        """Tipos de transporte de los servidores configurados (se calculan al conectar)"""
+        if self._server_transport_types is None:
+            self._server_transport_types = tuple(self._parse_server_config(s).transport_type for s in self.mcp_servers)
+        return self._server_transport_types
+    
+    def _schema_tokens_saved(self) -> int:
+        """Tokens ahorrados por petición gracias a la minificación de esquemas"""
+        return self.schema_optimizer.tokens_saved if self.schema_optimizer else 0
+    
     def _create_error_result(self, error: Exception, execution_id: str, start_time: datetime, tools_used: List[str]) -> ClientResult:
         """Crear resultado de error"""
         return ClientResult(
@@ -505,8 +1439,273 @@ class DeepSeekClient:
             error=str(error)
         )
     
+    # Recursos y prompts MCP
+    def _server_key(self, client: Client):
+        """Clave del servidor en el cache de recursos (su handler de mensajes)"""
+        return self.client_handlers.get(client, client)
+    
+    async def _cached_read(self, client: Client, family: str, key, use_cache: bool, fetch):
+        """Leer del cache de recursos o del servidor, guardando con la versión previa a la lectura"""
+        server = self._server_key(client)
+        if use_cache:
+            cached = self.resource_cache.get(server, family, key)
+            if cached is not None:
+                return cached
+        version = self.resource_cache.version(server, family)
+        async with client:
+            value = await fetch(client)
+        self.resource_cache.put(server, family, key, value, version)
+        return value
+    
+    async def list_resources(self, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Listar los recursos de todos los servidores MCP
+        
+        Returns:
+            Lista de diccionarios con uri, name, description y mime_type
+        """
+        await self._ensure_tools_ready()
+        async def fetch(client):
+            return [
+                {
+                    "uri": str(r.uri),
+                    "name": r.name,
+                    "description": r.description,
+                    "mime_type": getattr(r, "mime_type", None) or getattr(r, "mimeType", None)
+                } for r in await client.list_resources()
+            ]
+        
+        resources = []
+        for client in list(self.clients):
+            try:
+                items = await self._cached_read(client, RESOURCES, "resources/list", use_cache, fetch)
+            except Exception as e:
+                if self.enable_logging:
+                    self.logger.warning("Error listing resources: %s", e)
+                continue
+            for item in items:
+                self.resource_to_client[item["uri"]] = client
+            resources.extend(items)
+        return resources
+    
+    async def read_resource(self, uri: str, use_cache: bool = True) -> str:
+        """
+        Leer un recurso MCP por URI (desde el cache si no ha cambiado)
+        
+        Args:
+            uri: URI del recurso (también URIs de plantillas)
+            use_cache: Consultar el cache de recursos
+        
+        Returns:
+            Contenido de texto del recurso
+        """
+        await self._ensure_tools_ready()
+        async def fetch(client):
+            return await self._read_resource_text(client, uri)
+        
+        subscription = self.subscriptions.get(uri)
+        if subscription is not None:
+            # Copia materializada, al día tras las relecturas pendientes
+            _, content = await subscription.latest()
+            return content
+        
+        client = self.resource_to_client.get(uri)
+        candidates = [client] if client is not None else list(self.clients)
+        last_error = None
+        for candidate in candidates:
+            try:
+                content = await self._cached_read(candidate, RESOURCES, uri, use_cache, fetch)
+            except Exception as e:
+                last_error = e
+                continue
+            self.resource_to_client[uri] = candidate
+            return content
+        raise LookupError(f"Resource not found: {uri}") from last_error
+    
+    @staticmethod
+    def _format_resource_contents(contents) -> str:
+        """Concatenar los bloques de texto de un recurso (los binarios se describen)"""
+        parts = []
+        for block in contents:
+            text = getattr(block, "text", None)
+            if text is not None:
+                parts.append(text)
+            else:
+                mime_type = getattr(block, "mime_type", None) or getattr(block, "mimeType", None)
+                parts.append(f"[binary resource {block.uri} ({mime_type or 'unknown type'})]")
+        return "\n".join(parts)
+    
+    async def _resource_messages(self, uris: List[str]) -> List[Dict[str, Any]]:
+        """Mensajes de contexto con el contenido de los recursos indicados"""
+        contents = await asyncio.gather(*(self.read_resource(uri) for uri in uris))
+        return [
+            {"role": "system", "content": f"Resource {uri}:\n{content}"}
+            for uri, content in zip(uris, contents)
+        ]
+    
+    def _on_resource_updated(self, handler: DeepSeekMessageHandler, uri: str):
+        """Aviso notifications/resources/updated: invalidar y releer la copia local"""
+        self.resource_cache.invalidate(handler, RESOURCES, uri)
+        subscription = self.subscriptions.get(uri)
+        if subscription is not None:
+            subscription.mark_stale()
+    
+    async def subscribe_resource(self, uri: str, history: int = 16) -> ResourceSubscription:
+        """
+        Suscribirse a un recurso MCP y mantener una copia local actualizada
+        
+        La sesión con el servidor queda abierta mientras haya suscripciones. Cada
+        aviso de cambio relee el recurso (agrupando avisos seguidos) y la
+        suscripción conserva versiones recientes para obtener solo las diferencias.
+        
+        Args:
+            uri: URI del recurso
+            history: Versiones anteriores conservadas para `diff()`
+        
+        Returns:
+            ResourceSubscription con snapshot(), diff(), latest() y wait_for_update()
+        """
+        # La suscripción se registra antes de completarse: se consulta con el lock
+        # para no devolver una a medias ni enviar dos resources/subscribe
+        async with self._subscription_locks.setdefault(uri, asyncio.Lock()):
+            subscription = self.subscriptions.get(uri)
+            if subscription is not None:
+                return subscription
+            
+            # Resolver el servidor que sirve la URI
+            await self.read_resource(uri)
+            client = self.resource_to_client[uri]
+            
+            async def reader():
+                return await self._cached_read(
+                    client, RESOURCES, uri, False,
+                    lambda c: self._read_resource_text(c, uri)
+                )
+            
+            subscription = ResourceSubscription(uri, reader, history=history)
+            # Registrada antes de suscribirse para no perder avisos tempranos
+            self.subscriptions[uri] = subscription
+            holder = self._session_holders.setdefault(client, SessionHolder(client))
+            try:
+                await holder.acquire()
+                try:
+                    with warnings.catch_warnings():
+                        # resources/subscribe solo existe en servidores de la especificación 2025
+                        warnings.filterwarnings("ignore", message="resources/subscribe")
+                        await client.session.subscribe_resource(uri)
+                    await subscription.refresh()
+                except BaseException:
+                    await holder.release()
+                    raise
+            except BaseException:
+                self.subscriptions.pop(uri, None)
+                raise
+            
+            if self.enable_logging:
+                self.logger.info("Subscribed to resource %s", uri)
+            return subscription
+    
+    async def unsubscribe_resource(self, uri: str):
+        """Cancelar la suscripción a un recurso"""
+        subscription = self.subscriptions.pop(uri, None)
+        self._subscription_locks.pop(uri, None)
+        if subscription is None:
+            return
+        await subscription.close()
+        client = self.resource_to_client.get(uri)
+        holder = self._session_holders.get(client)
+        if holder is None:
+            return
+        try:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="resources/unsubscribe")
+                await client.session.unsubscribe_resource(uri)
+        except Exception as e:
+            if self.enable_logging:
+                self.logger.warning("Error unsubscribing from %s: %s", uri, e)
+        finally:
+            await holder.release()
+            if holder.refs == 0:
+                self._session_holders.pop(client, None)
+    
+    async def _read_resource_text(self, client: Client, uri: str) -> str:
+        return self._format_resource_contents(await client.read_resource(uri))
+    
+    async def list_prompts(self, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Listar los prompts de todos los servidores MCP
+        
+        Returns:
+            Lista de diccionarios con name, description y arguments
+        """
+        await self._ensure_tools_ready()
+        async def fetch(client):
+            return [
+                {
+                    "name": p.name,
+                    "description": p.description,
+                    "arguments": [
+                        {"name": a.name, "description": a.description, "required": bool(a.required)}
+                        for a in (p.arguments or [])
+                    ]
+                } for p in await client.list_prompts()
+            ]
+        
+        prompts = []
+        for client in list(self.clients):
+            try:
+                items = await self._cached_read(client, PROMPTS, "prompts/list", use_cache, fetch)
+            except Exception as e:
+                if self.enable_logging:
+                    self.logger.warning("Error listing prompts: %s", e)
+                continue
+            for item in items:
+                self.prompt_to_client[item["name"]] = client
+            prompts.extend(items)
+        return prompts
+    
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Obtener un prompt MCP como mensajes de chat
+        
+        Args:
+            name: Nombre del prompt
+            arguments: Argumentos del prompt
+            use_cache: Consultar el cache de prompts
+        
+        Returns:
+            Mensajes {"role", "content"} listos para DeepSeek
+        """
+        await self._ensure_tools_ready()
+        key = (name, json.dumps(arguments or {}, sort_keys=True, default=str))
+        async def fetch(client):
+            result = await client.get_prompt(name, arguments or {})
+            return [
+                {
+                    "role": message.role,
+                    "content": getattr(message.content, "text", None) or str(message.content)
+                } for message in result.messages
+            ]
+        
+        client = self.prompt_to_client.get(name)
+        candidates = [client] if client is not None else list(self.clients)
+        last_error = None
+        for candidate in candidates:
+            try:
+                messages = await self._cached_read(candidate, PROMPTS, key, use_cache, fetch)
+            except Exception as e:
+                last_error = e
+                continue
+            self.prompt_to_client[name] = candidate
+            return [dict(m) for m in messages]
+        raise LookupError(f"Prompt not found: {name}") from last_error
+    
     async def close(self):
         """Cerrar todas las conexiones"""
+        if self.provider_pool is not None:
+            await self.provider_pool.stop_health_checks()
+        for uri in list(self.subscriptions):
+            await self.unsubscribe_resource(uri)
         if self.clients:
             if self.enable_logging:
                 self.logger.info("Closing connections...")
@@ -515,10 +1714,15 @@ class DeepSeekClient:
                     pass  # FastMCP maneja el cierre automáticamente
                 except Exception as e:
                     if self.enable_logging:
-                        self.logger.warning(f"Error closing client: {e}")
+                        self.logger.warning("Error closing client: %s", e)
             
             self.clients.clear()
             self._connected = False
+            self.client_handlers.clear()
+            self._server_tool_timeouts.clear()
+            self.server_limiters.clear()
+            if self.schema_optimizer:
+                self.schema_optimizer.reset_stats()
             if self.enable_logging:
                 self.logger.info("Connections closed")
         else:
@@ -538,11 +1742,37 @@ class DeepSeekClient:
         """Verificar si está conectado a servidores MCP"""
         return self._connected
     
+    def _server_concurrency_stats(self) -> Dict[str, Any]:
+        """Estadísticas de los limitadores por servidor (los servidores sin nombre se numeran)"""
+        stats = {}
+        for index, limiter in enumerate(self.server_limiters.values(), 1):
+            name = limiter.name or f"server-{index}"
+            if name in stats:
+                name = f"{name}-{index}"
+            stats[name] = limiter.get_stats()
+        return stats
+    
     def get_stats(self) -> Dict[str, Any]:
         """Obtener estadísticas del cliente"""
         return {
             "servers_configured": len(self.mcp_servers),
             "servers_connected": len(self.clients),
             "tools_available": len(self.all_tools),
-            "is_connected": self._connected
+            "is_connected": self._connected,
+            "request_builder": self.request_builder.get_stats(),
+            "schema_optimization": self.schema_optimizer.get_stats() if self.schema_optimizer else None,
+            "argument_validation": self.argument_validator.get_stats() if self.argument_validator else None,
+            "completion_cache": self.completion_cache.get_stats() if self.completion_cache else None,
+            "semantic_cache": self.semantic_cache.get_stats() if self.semantic_cache else None,
+            "model_routing": self.model_router.get_stats(),
+            "llm_latency": self.llm_latency.get_stats(),
+            "hedging": self.hedge_policy.get_stats() if self.hedge_policy else None,
+            "rate_limiter": self.rate_limiter.get_stats() if self.rate_limiter else None,
+            "provider_pool": self.provider_pool.get_stats() if self.provider_pool else None,
+            "resource_cache": self.resource_cache.get_stats(),
+            "subscriptions": {uri: sub.get_stats() for uri, sub in self.subscriptions.items()},
+            "progress": self.progress_bus.get_stats(),
+            "checkpoints": self.checkpoint_store.get_stats() if self.checkpoint_store else None,
+            "cancellation": {**self.cancellation_stats, "running": len(self._running_executions)},
+            "server_concurrency": self._server_concurrency_stats()
         }
\ No newline at end of file
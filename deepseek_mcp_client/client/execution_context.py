@@ -0,0 +1,57 @@
+"""
+Estado aislado por ejecución para servir peticiones concurrentes
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from deepseek_mcp_client.utils.argument_validation import ToolArgumentValidator
+
+
+@dataclass
+class ToolSnapshot:
+    """
+    Vista del registro de herramientas en un momento dado.
+
+    El cliente nunca modifica las colecciones de una instantánea publicada: al
+    refrescar construye otras nuevas y las sustituye (copy-on-write), de modo
+    que cada ejecución ve el mismo registro de principio a fin.
+    """
+
+    tools: List[Dict[str, Any]] = field(default_factory=list)
+    tool_to_client: Dict[str, Any] = field(default_factory=dict)
+    schemas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    answer_modes: Dict[str, Union[bool, str]] = field(default_factory=dict)
+    validator: Optional[ToolArgumentValidator] = None
+    version: int = 0
+
+
+@dataclass
+class ExecutionContext:
+    """Estado de una llamada a execute()"""
+
+    execution_id: str
+    tools: ToolSnapshot
+    # Mensajes de contexto añadidos tras el prompt de sistema (p. ej. recursos MCP)
+    context_messages: List[Dict[str, Any]] = field(default_factory=list)
+    # Punto de control de la ejecución si el cliente tiene checkpoint_store
+    checkpoint: Optional[Any] = None
+
+
+_current_execution: ContextVar[Optional[ExecutionContext]] = ContextVar("deepseek_mcp_execution", default=None)
+
+
+def current_execution() -> Optional[ExecutionContext]:
+    """Contexto de la ejecución en curso"""
+    return _current_execution.get()
+
+
+@contextmanager
+def execution_scope(context: ExecutionContext) -> Iterator[ExecutionContext]:
+    """Establecer el contexto de la ejecución en curso"""
+    token = _current_execution.set(context)
+    try:
+        yield context
+    finally:
+        _current_execution.reset(token)
@@ -0,0 +1,171 @@
+"""
+Selección de modelo por fase del pipeline de execute()
+"""
+import math
+from typing import Any, Callable, Dict, Optional
+
+
+PLANNING = "planning"
+FINAL = "final"
+
+
+def logprob_confidence(response) -> Optional[float]:
+    """Confianza media de la respuesta a partir de los logprobs de sus tokens"""
+    try:
+        tokens = response.choices[0].logprobs.content
+    except (AttributeError, IndexError, TypeError):
+        return None
+    if not isinstance(tokens, list) or not tokens:
+        return None
+    values = [token.logprob for token in tokens if isinstance(getattr(token, "logprob", None), (int, float))]
+    if not values:
+        return None
+    return math.exp(sum(values) / len(values))
+
+
+def _int_or_zero(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+class ModelRouter:
+    """
+    Política de enrutado de modelos.
+
+    La fase 'planning' (selección de herramientas) puede usar un modelo rápido y
+    la fase 'final' (síntesis) uno más potente. Opcionalmente se escala a
+    `escalation_model` si alguna herramienta falla o la confianza de la
+    planificación queda por debajo de `min_confidence`.
+    """
+
+    def __init__(
+        self,
+        planning_model: Optional[str] = None,
+        final_model: Optional[str] = None,
+        escalation_model: Optional[str] = None,
+        escalate_on_tool_error: bool = True,
+        min_confidence: Optional[float] = None,
+        confidence_fn: Optional[Callable[[Any], Optional[float]]] = None,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        """
+        Inicializar router
+
+        Args:
+            planning_model: Modelo de la llamada que decide las herramientas (None = modelo del cliente)
+            final_model: Modelo de la respuesta final (None = modelo del cliente)
+            escalation_model: Modelo al que escalar; sin él no hay escalado
+            escalate_on_tool_error: Escalar la respuesta final si falla una herramienta
+            min_confidence: Confianza mínima de la planificación (activa logprobs)
+            confidence_fn: Función respuesta -> confianza (por defecto, media de logprobs)
+            pricing: USD por millón de tokens por modelo:
+                {"deepseek-chat": {"input": ..., "output": ..., "cached_input": ...}}
+        """
+        self.planning_model = planning_model
+        self.final_model = final_model
+        self.escalation_model = escalation_model
+        self.escalate_on_tool_error = escalate_on_tool_error
+        self.min_confidence = min_confidence
+        self.confidence_fn = confidence_fn or logprob_confidence
+        self.pricing = pricing or {}
+
+        # Estadísticas por fase
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.escalations = 0
+
+    @property
+    def needs_logprobs(self) -> bool:
+        """Si la planificación debe pedir logprobs para estimar la confianza"""
+        return self.min_confidence is not None and self.confidence_fn is logprob_confidence
+
+    def model_for(self, phase: str, default_model: str) -> str:
+        """Modelo a usar en una fase"""
+        if phase == PLANNING:
+            return self.planning_model or default_model
+        if phase == FINAL:
+            return self.final_model or default_model
+        return default_model
+
+    def escalation_reason(self, planning_response=None, tool_failures: int = 0) -> Optional[str]:
+        """
+        Decidir si escalar al modelo más potente
+
+        Returns:
+            Motivo del escalado o None
+        """
+        if not self.escalation_model:
+            return None
+        if tool_failures and self.escalate_on_tool_error:
+            return "tool_error"
+        if self.min_confidence is not None and planning_response is not None:
+            confidence = self.confidence_fn(planning_response)
+            if confidence is not None and confidence < self.min_confidence:
+                return "low_confidence"
+        return None
+
+    def cost(self, model: str, usage) -> Optional[float]:
+        """Coste en USD de una llamada según la tabla de precios"""
+        prices = self.pricing.get(model)
+        if not prices or usage is None:
+            return None
+        prompt = _int_or_zero(getattr(usage, "prompt_tokens", 0))
+        cached = _int_or_zero(getattr(usage, "prompt_cache_hit_tokens", 0))
+        completion = _int_or_zero(getattr(usage, "completion_tokens", 0))
+        cached_price = prices.get("cached_input", prices.get("input", 0.0))
+        total = (
+            (prompt - cached) * prices.get("input", 0.0)
+            + cached * cached_price
+            + completion * prices.get("output", 0.0)
+        )
+        return total / 1_000_000
+
+    def record(self, phase: str, model: str, duration: float, response, escalation: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Registrar latencia, tokens y coste de una fase
+
+        Returns:
+            Informe de la fase para los metadatos del resultado
+        """
+        usage = getattr(response, "usage", None)
+        report = {
+            "phase": phase,
+            "model": model,
+            "duration": duration,
+            "prompt_tokens": _int_or_zero(getattr(usage, "prompt_tokens", 0)),
+            "completion_tokens": _int_or_zero(getattr(usage, "completion_tokens", 0)),
+            "cost": self.cost(model, usage)
+        }
+        if escalation:
+            report["escalation"] = escalation
+            self.escalations += 1
+
+        phase_stats = self.stats.setdefault(phase, {
+            "calls": 0,
+            "total_duration": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cost": 0.0,
+            "models": {}
+        })
+        phase_stats["calls"] += 1
+        phase_stats["total_duration"] += duration
+        phase_stats["prompt_tokens"] += report["prompt_tokens"]
+        phase_stats["completion_tokens"] += report["completion_tokens"]
+        phase_stats["cost"] += report["cost"] or 0.0
+        phase_stats["models"][model] = phase_stats["models"].get(model, 0) + 1
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas por fase"""
+        phases = {}
+        for phase, data in self.stats.items():
+            phases[phase] = {
+                **data,
+                "models": dict(data["models"]),
+                "avg_duration": data["total_duration"] / data["calls"] if data["calls"] else 0.0
+            }
+        return {"phases": phases, "escalations": self.escalations}
+
+    def reset_stats(self):
+        """Reiniciar estadísticas"""
+        self.stats = {}
+        self.escalations = 0
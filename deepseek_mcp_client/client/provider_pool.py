@@ -0,0 +1,262 @@
+"""
+Pool de endpoints compatibles con la API de DeepSeek (varias URLs y claves)
+"""
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from openai import APIConnectionError, AsyncOpenAI
+
+from deepseek_mcp_client.client.deadline import DeadlineExceededError
+
+
+DEFAULT_BASE_URL = "https://api.deepseek.com"
+
+
+@dataclass
+class ProviderEndpoint:
+    """Endpoint OpenAI-compatible: API de DeepSeek o despliegue propio"""
+
+    base_url: str = DEFAULT_BASE_URL
+    api_key: Optional[str] = None  # None = DEEPSEEK_API_KEY
+    weight: float = 1.0
+    name: Optional[str] = None
+    # Nombre del modelo en este endpoint, p. ej. {"deepseek-chat": "deepseek-v3"}
+    model_map: Dict[str, str] = field(default_factory=dict)
+    max_retries: int = 0  # Los reintentos los gestiona el pool con failover
+
+    def __post_init__(self):
+        """Validaciones después de la inicialización"""
+        if self.weight <= 0:
+            raise ValueError("El peso del endpoint debe ser positivo")
+        if not self.name:
+            self.name = self.base_url
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Cliente OpenAI del endpoint (se crea al primer uso)"""
+        if self._client is None:
+            api_key = self.api_key or os.getenv("DEEPSEEK_API_KEY")
+            if not api_key:
+                raise ValueError(f"No API key for endpoint {self.name}; set api_key or DEEPSEEK_API_KEY")
+            self._client = AsyncOpenAI(api_key=api_key, base_url=self.base_url, max_retries=self.max_retries)
+        return self._client
+
+    @client.setter
+    def client(self, value: AsyncOpenAI):
+        self._client = value
+
+    def map_params(self, chat_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Traducir el nombre del modelo para este endpoint"""
+        model = chat_params.get("model")
+        if model in self.model_map:
+            return {**chat_params, "model": self.model_map[model]}
+        return chat_params
+
+
+class _EndpointState:
+    """Salud y latencia observadas de un endpoint"""
+
+    def __init__(self, endpoint: ProviderEndpoint):
+        self.endpoint = endpoint
+        self.latency: Optional[float] = None  # Media móvil exponencial
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def score(self, default_latency: float) -> float:
+        latency = self.latency if self.latency is not None else default_latency
+        return self.endpoint.weight / (max(latency, 0.001) * (1 + self.in_flight))
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """Errores que justifican probar otro endpoint: red, 429 y 5xx"""
+    if isinstance(error, DeadlineExceededError):
+        return False
+    if isinstance(error, APIConnectionError):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class ProviderPool:
+    """
+    Balanceo ponderado y sensible a la latencia entre varios endpoints.
+
+    Cada petición elige un endpoint sano con probabilidad proporcional a
+    peso / (latencia * (1 + peticiones en curso)). Ante errores de red, 429 o
+    5xx se prueba el siguiente endpoint; tras `failure_threshold` fallos
+    seguidos el endpoint queda fuera durante `cooldown` segundos o hasta que
+    un chequeo de salud lo recupere.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[ProviderEndpoint],
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        latency_alpha: float = 0.2,
+        health_check_interval: Optional[float] = None
+    ):
+        """
+        Inicializar pool
+
+        Args:
+            endpoints: Endpoints disponibles
+            failure_threshold: Fallos consecutivos antes de marcar un endpoint como caído
+            cooldown: Segundos fuera de servicio tras superar el umbral
+            latency_alpha: Peso de la última muestra en la media de latencia
+            health_check_interval: Segundos entre chequeos en segundo plano (None = desactivado)
+        """
+        if not endpoints:
+            raise ValueError("El pool necesita al menos un endpoint")
+        self.endpoints = list(endpoints)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+        self.health_check_interval = health_check_interval
+        self._states = {id(e): _EndpointState(e) for e in self.endpoints}
+        self._health_task: Optional[asyncio.Task] = None
+        self._random = random.Random()
+
+        # Estadísticas
+        self.stats = {
+            "requests": 0,
+            "failovers": 0,
+            "exhausted": 0
+        }
+
+    @classmethod
+    def from_config(cls, config: List[Dict[str, Any]], **kwargs) -> "ProviderPool":
+        """Crear pool desde una lista de diccionarios de endpoints"""
+        return cls([ProviderEndpoint(**item) for item in config], **kwargs)
+
+    def _state(self, endpoint: ProviderEndpoint) -> _EndpointState:
+        return self._states[id(endpoint)]
+
+    def choose(self, exclude: Optional[set] = None) -> ProviderEndpoint:
+        """Elegir endpoint; si ninguno está sano se usa el que antes se recupera"""
+        exclude = exclude or set()
+        candidates = [s for s in self._states.values() if id(s.endpoint) not in exclude]
+        if not candidates:
+            raise LookupError("No endpoints left to try")
+        healthy = [s for s in candidates if s.healthy]
+        if not healthy:
+            return min(candidates, key=lambda s: s.unhealthy_until).endpoint
+        known = [s.latency for s in healthy if s.latency is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        weights = [s.score(default_latency) for s in healthy]
+        return self._random.choices(healthy, weights=weights)[0].endpoint
+
+    def record_success(self, endpoint: ProviderEndpoint, latency: float):
+        state = self._state(endpoint)
+        state.consecutive_failures = 0
+        state.unhealthy_until = 0.0
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency += self.latency_alpha * (latency - state.latency)
+
+    def record_failure(self, endpoint: ProviderEndpoint):
+        state = self._state(endpoint)
+        state.failures += 1
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.failure_threshold:
+            state.unhealthy_until = time.monotonic() + self.cooldown
+
+    async def call(self, request: Callable[[ProviderEndpoint], Awaitable[Any]]) -> Any:
+        """
+        Ejecutar una petición con balanceo y failover
+
+        Args:
+            request: Recibe el endpoint elegido y realiza la petición
+        """
+        self.stats["requests"] += 1
+        tried: set = set()
+        last_error: Optional[BaseException] = None
+        for _ in range(len(self.endpoints)):
+            endpoint = self.choose(tried)
+            tried.add(id(endpoint))
+            state = self._state(endpoint)
+            state.requests += 1
+            state.in_flight += 1
+            start = time.perf_counter()
+            try:
+                result = await request(endpoint)
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                self.record_failure(endpoint)
+                last_error = e
+                self.stats["failovers"] += 1
+                continue
+            finally:
+                state.in_flight -= 1
+            self.record_success(endpoint, time.perf_counter() - start)
+            return result
+        self.stats["exhausted"] += 1
+        raise last_error
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Comprobar cada endpoint con GET /models"""
+        async def probe(state: _EndpointState) -> bool:
+            start = time.perf_counter()
+            try:
+                await state.endpoint.client.models.list()
+            except Exception:
+                state.consecutive_failures = max(state.consecutive_failures, self.failure_threshold - 1)
+                self.record_failure(state.endpoint)
+                return False
+            self.record_success(state.endpoint, time.perf_counter() - start)
+            return True
+
+        states = list(self._states.values())
+        results = await asyncio.gather(*(probe(s) for s in states))
+        return {s.endpoint.name: ok for s, ok in zip(states, results)}
+
+    def start_health_checks(self):
+        """Iniciar chequeos periódicos en el event loop actual"""
+        if self.health_check_interval is None or self._health_task is not None:
+            return
+
+        async def loop():
+            while True:
+                await asyncio.sleep(self.health_check_interval)
+                await self.check_health()
+
+        self._health_task = asyncio.get_running_loop().create_task(loop())
+
+    async def stop_health_checks(self):
+        """Detener los chequeos periódicos"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del pool"""
+        stats = self.stats.copy()
+        stats["endpoints"] = {
+            s.endpoint.name: {
+                "healthy": s.healthy,
+                "latency": s.latency,
+                "in_flight": s.in_flight,
+                "requests": s.requests,
+                "failures": s.failures,
+                "weight": s.endpoint.weight
+            } for s in self._states.values()
+        }
+        return stats
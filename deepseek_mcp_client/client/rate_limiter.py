@@ -0,0 +1,359 @@
+"""
+Planificador de llamadas a DeepSeek con límites de peticiones y tokens por minuto
+"""
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, Mapping, Optional, Union
+
+from deepseek_mcp_client.client.deadline import DeadlineExceededError, current_deadline
+
+
+# Clases de prioridad: menor valor = se atiende antes
+PRIORITY_CLASSES = {
+    "interactive": 0,
+    "default": 5,
+    "batch": 10
+}
+
+_current_priority: ContextVar[Union[str, int]] = ContextVar("deepseek_mcp_priority", default="default")
+
+
+def current_priority() -> Union[str, int]:
+    """Prioridad de la ejecución en curso"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Union[str, int, None]) -> Iterator[None]:
+    """Establecer la prioridad de las llamadas de la ejecución en curso"""
+    token = _current_priority.set(priority if priority is not None else "default")
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def _priority_value(priority: Union[str, int]) -> int:
+    if isinstance(priority, int):
+        return priority
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Prioridad desconocida: {priority}")
+    return PRIORITY_CLASSES[priority]
+
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Convertir '1s', '6m0s', '250ms' o '12' a segundos"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Leer Retry-After (segundos o fecha HTTP) o retry-after-ms"""
+    if not headers:
+        return None
+    millis = headers.get("retry-after-ms")
+    if millis:
+        try:
+            return float(millis) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """Cubo de tokens que se rellena de forma continua a `limit` unidades por minuto"""
+
+    def __init__(self, limit: float):
+        self.capacity = float(limit)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float, reserve: float = 0.0) -> float:
+        """Segundos hasta poder consumir `amount` dejando `reserve` unidades libres"""
+        self._refill()
+        needed = min(amount, self.capacity) + reserve * self.capacity
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate if self.rate else float("inf")
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float]):
+        """Ajustar el cubo con los valores informados por el servidor"""
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+            self.rate = self.capacity / 60.0
+        if remaining is not None:
+            self.level = min(self.capacity, float(remaining))
+            if reset and limit and remaining < limit:
+                # El servidor indica cuándo se repone el cupo completo
+                self.rate = max(self.rate, (self.capacity - self.level) / reset)
+
+
+class _KeyLimits:
+    """Cubos, cola y pausa de una clave de API o endpoint"""
+
+    def __init__(self, requests_per_minute: Optional[float], tokens_per_minute: Optional[float]):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.waiting: list = []
+        self.paused_until = 0.0
+
+
+class RateLimitScheduler:
+    """
+    Cola con prioridad delante de todas las llamadas a DeepSeek.
+
+    Controla peticiones (RPM) y tokens (TPM) por minuto con cubos de tokens que se
+    sincronizan con las cabeceras x-ratelimit-* y el uso real de cada respuesta.
+    Las respuestas 429 se reintentan respetando Retry-After en lugar de fallar.
+    Las peticiones 'interactive' se atienden antes que las 'batch' en espera, y
+    las 'batch' no consumen la reserva final de cada cubo.
+
+    Cada clave (`key` en submit, p. ej. el endpoint de un ProviderPool) tiene sus
+    propios cubos, cola y pausa: las cabeceras de un endpoint no ajustan el cupo
+    de otro. Los límites configurados se aplican a cada clave.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        default_retry_after: float = 1.0,
+        max_retry_after: float = 60.0,
+        batch_reserve: float = 0.1
+    ):
+        """
+        Inicializar planificador
+
+        Args:
+            requests_per_minute: Límite de peticiones por clave (None = aprender de las cabeceras)
+            tokens_per_minute: Límite de tokens por clave (None = aprender de las cabeceras)
+            max_retries: Reintentos ante 429
+            default_retry_after: Espera base si la respuesta no trae Retry-After
+            max_retry_after: Espera máxima por reintento
+            batch_reserve: Fracción de cada cubo reservada a prioridades superiores a 'batch'
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.max_retry_after = max_retry_after
+        self.batch_reserve = batch_reserve
+
+        self._limits: Dict[Optional[str], _KeyLimits] = {}
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+
+        # Estadísticas
+        self.stats = {
+            "requests": 0,
+            "queued": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "total_wait": 0.0
+        }
+
+    def _key_limits(self, key: Optional[str]) -> _KeyLimits:
+        limits = self._limits.get(key)
+        if limits is None:
+            limits = self._limits[key] = _KeyLimits(self.requests_per_minute, self.tokens_per_minute)
+        return limits
+
+    @property
+    def requests(self) -> Optional[TokenBucket]:
+        """Cubo de peticiones de la clave por defecto"""
+        return self._key_limits(None).requests
+
+    @property
+    def tokens(self) -> Optional[TokenBucket]:
+        """Cubo de tokens de la clave por defecto"""
+        return self._key_limits(None).tokens
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Se crea perezosamente para quedar ligada al event loop que la usa
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _delay(self, limits: _KeyLimits, priority: int, tokens: float) -> float:
+        reserve = self.batch_reserve if priority >= PRIORITY_CLASSES["batch"] else 0.0
+        delays = [limits.paused_until - time.monotonic()]
+        if limits.requests is not None:
+            delays.append(limits.requests.time_until(1, reserve))
+        if limits.tokens is not None and tokens:
+            delays.append(limits.tokens.time_until(tokens, reserve))
+        return max(0.0, *delays)
+
+    async def _acquire(self, limits: _KeyLimits, priority: int, tokens: float):
+        condition = self._get_condition()
+        entry = (priority, next(self._sequence))
+        heapq.heappush(limits.waiting, entry)
+        start = time.monotonic()
+        deadline = current_deadline()
+        async with condition:
+            try:
+                while True:
+                    delay = None
+                    if limits.waiting[0] == entry:
+                        delay = self._delay(limits, priority, tokens)
+                        if delay <= 0:
+                            heapq.heappop(limits.waiting)
+                            if limits.requests is not None:
+                                limits.requests.consume(1)
+                            if limits.tokens is not None and tokens:
+                                limits.tokens.consume(tokens)
+                            condition.notify_all()
+                            break
+                    if deadline is not None and delay is not None and delay >= deadline.remaining():
+                        raise DeadlineExceededError(
+                            f"Rate limit wait of {delay:.3f}s exceeds the remaining deadline"
+                        )
+                    try:
+                        await asyncio.wait_for(condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in limits.waiting:
+                    limits.waiting.remove(entry)
+                    heapq.heapify(limits.waiting)
+                condition.notify_all()
+                raise
+        waited = time.monotonic() - start
+        self.stats["total_wait"] += waited
+        if waited > 0.001:
+            self.stats["queued"] += 1
+
+    def retry_after(self, error: Exception, attempt: int) -> Optional[float]:
+        """Espera antes de reintentar, o None si el error no es un 429"""
+        if getattr(error, "status_code", None) != 429:
+            return None
+        response = getattr(error, "response", None)
+        delay = parse_retry_after(getattr(response, "headers", None))
+        if delay is None:
+            delay = self.default_retry_after * (2 ** attempt)
+        return min(delay, self.max_retry_after)
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]], key: Optional[str] = None):
+        """Sincronizar los cubos de una clave con las cabeceras x-ratelimit-*"""
+        if not headers:
+            return
+        limits = self._key_limits(key)
+        for name in ("requests", "tokens"):
+            limit = headers.get(f"x-ratelimit-limit-{name}")
+            remaining = headers.get(f"x-ratelimit-remaining-{name}")
+            if limit is None and remaining is None:
+                continue
+            try:
+                limit_value = float(limit) if limit is not None else None
+                remaining_value = float(remaining) if remaining is not None else None
+            except ValueError:
+                continue
+            bucket = getattr(limits, name)
+            if bucket is None:
+                if not limit_value:
+                    continue
+                bucket = TokenBucket(limit_value)
+                setattr(limits, name, bucket)
+            bucket.sync(limit_value, remaining_value, parse_reset(headers.get(f"x-ratelimit-reset-{name}")))
+
+    def _observe_usage(self, limits: _KeyLimits, response, estimated_tokens: float):
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if limits.tokens is not None and isinstance(total, int):
+            # Corregir la estimación con el consumo real
+            limits.tokens.consume(total - estimated_tokens)
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        priority: Union[str, int, None] = None,
+        estimated_tokens: float = 0,
+        key: Optional[str] = None,
+        retry: bool = True
+    ) -> Any:
+        """
+        Ejecutar una llamada cuando los límites lo permitan
+
+        Args:
+            call: Crea y espera la petición (se invoca de nuevo en cada reintento)
+            priority: Clase de prioridad o valor numérico (por defecto la de la ejecución)
+            estimated_tokens: Tokens estimados de la petición para el cubo TPM
+            key: Clave de API o endpoint cuyos límites se aplican
+            retry: Reintentar los 429 con la misma clave (False = pausar la clave y
+                relanzar el error, p. ej. para que un ProviderPool cambie de endpoint)
+        """
+        value = _priority_value(priority if priority is not None else current_priority())
+        limits = self._key_limits(key)
+        self.stats["requests"] += 1
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(limits, value, estimated_tokens)
+            try:
+                response = await call()
+            except Exception as e:
+                delay = self.retry_after(e, attempt)
+                if delay is None:
+                    raise
+                self.stats["rate_limited"] += 1
+                self.observe_headers(getattr(getattr(e, "response", None), "headers", None), key)
+                # Pausa de la clave: ninguna petición suya sale antes de Retry-After
+                limits.paused_until = max(limits.paused_until, time.monotonic() + delay)
+                if not retry or attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                continue
+            self._observe_usage(limits, response, estimated_tokens)
+            return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del planificador"""
+        stats = self.stats.copy()
+        stats["waiting"] = sum(len(limits.waiting) for limits in self._limits.values())
+        stats["requests_available"] = round(self.requests.level, 2) if self.requests else None
+        stats["tokens_available"] = round(self.tokens.level, 2) if self.tokens else None
+        stats["keys"] = {
+            key: {
+                "waiting": len(limits.waiting),
+                "requests_available": round(limits.requests.level, 2) if limits.requests else None,
+                "tokens_available": round(limits.tokens.level, 2) if limits.tokens else None
+            } for key, limits in self._limits.items() if key is not None
+        }
+        return stats
@@ -0,0 +1,101 @@
+"""
+Construcción de cuerpos de petición chat pre-serializados
+"""
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def dumps_compact(value: Any) -> bytes:
+    """Serializar a JSON compacto en UTF-8"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ChatRequestBuilder:
+    """
+    Ensambla el cuerpo JSON de /chat/completions por concatenación de bytes.
+
+    El bloque de herramientas se serializa una sola vez por versión del registro
+    y los mensajes de sistema se guardan en un LRU pequeño, de modo que en cada
+    petición solo se serializan los mensajes nuevos y los parámetros de muestreo.
+    """
+
+    def __init__(self, max_cached_prompts: int = 32):
+        self.max_cached_prompts = max_cached_prompts
+        self._tools_key: Optional[Tuple[int, int, int]] = None
+        self._tools_bytes = b"[]"
+        self._prompt_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+        # Estadísticas
+        self.stats = {
+            "bodies_built": 0,
+            "tools_serializations": 0,
+            "prompt_serializations": 0,
+            "prompt_cache_hits": 0
+        }
+
+    def tools_bytes(self, tools: List[Dict[str, Any]], tools_version: int) -> bytes:
+        """Obtener el bloque de herramientas serializado para la versión actual"""
+        key = (tools_version, id(tools), len(tools))
+        if key != self._tools_key:
+            self._tools_bytes = dumps_compact(tools)
+            self._tools_key = key
+            self.stats["tools_serializations"] += 1
+        return self._tools_bytes
+
+    def system_message_bytes(self, prompt: str) -> bytes:
+        """Obtener el mensaje de sistema serializado"""
+        cached = self._prompt_cache.get(prompt)
+        if cached is not None:
+            self._prompt_cache.move_to_end(prompt)
+            self.stats["prompt_cache_hits"] += 1
+            return cached
+
+        cached = dumps_compact({"role": "system", "content": prompt})
+        self._prompt_cache[prompt] = cached
+        self.stats["prompt_serializations"] += 1
+        if len(self._prompt_cache) > self.max_cached_prompts:
+            self._prompt_cache.popitem(last=False)
+        return cached
+
+    def _message_bytes(self, message: Dict[str, Any]) -> bytes:
+        """Serializar un mensaje, reutilizando el cache para mensajes de sistema"""
+        if (
+            message.get("role") == "system"
+            and len(message) == 2
+            and isinstance(message.get("content"), str)
+        ):
+            return self.system_message_bytes(message["content"])
+        return dumps_compact(message)
+
+    def build(self, chat_params: Dict[str, Any], tools_version: int = 0) -> bytes:
+        """
+        Construir el cuerpo de la petición
+
+        Args:
+            chat_params: Parámetros equivalentes a chat.completions.create
+            tools_version: Versión del registro de herramientas
+
+        Returns:
+            Cuerpo JSON listo para enviar
+        """
+        messages = chat_params.get("messages") or []
+        fields = [
+            b'"messages":[' + b",".join(self._message_bytes(m) for m in messages) + b"]"
+        ]
+
+        tools = chat_params.get("tools")
+        if tools:
+            fields.append(b'"tools":' + self.tools_bytes(tools, tools_version))
+
+        for key, value in chat_params.items():
+            if key in ("messages", "tools") or value is None:
+                continue
+            fields.append(dumps_compact(key) + b":" + dumps_compact(value))
+
+        self.stats["bodies_built"] += 1
+        return b"{" + b",".join(fields) + b"}"
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtener estadísticas del builder"""
+        return self.stats.copy()
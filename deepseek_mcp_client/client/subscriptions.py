@@ -0,0 +1,197 @@
+"""
+Suscripciones a recursos MCP con copia local actualizada de forma incremental
+"""
+import asyncio
+import difflib
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class ResourceSubscription:
+    """
+    Copia materializada de un recurso suscrito.
+
+    Cada aviso notifications/resources/updated marca la copia como obsoleta y
+    lanza una relectura; los avisos que llegan durante una relectura se
+    agrupan en una sola lectura adicional. Se conservan las últimas versiones
+    para ofrecer diferencias: solo lo añadido en recursos que crecen por el
+    final (logs) o un parche de líneas en el resto.
+    """
+
+    def __init__(self, uri: str, reader: Callable[[], Awaitable[str]], history: int = 16):
+        """
+        Inicializar suscripción
+
+        Args:
+            uri: URI del recurso
+            reader: Corrutina que lee el contenido actual del servidor
+            history: Versiones anteriores conservadas para calcular diferencias
+        """
+        self.uri = uri
+        self.content: Optional[str] = None
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        self._reader = reader
+        self._history: deque = deque(maxlen=history)
+        self._stale = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._changed: Optional[asyncio.Condition] = None
+
+        # Estadísticas
+        self.stats = {
+            "notifications": 0,
+            "reads": 0,
+            "coalesced": 0,
+            "versions": 0
+        }
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def refresh(self) -> bool:
+        """Releer el recurso; devuelve True si el contenido cambió"""
+        self.stats["reads"] += 1
+        content = await self._reader()
+        if content == self.content:
+            return False
+        if self.content is not None:
+            self._history.append((self.version, self.content))
+        self.content = content
+        self.version += 1
+        self.updated_at = time.time()
+        self.stats["versions"] += 1
+        async with self._condition():
+            self._changed.notify_all()
+        return True
+
+    def mark_stale(self):
+        """Registrar un aviso de actualización y programar la relectura"""
+        self.stats["notifications"] += 1
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._stale = True
+            self.stats["coalesced"] += 1
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_until_current())
+
+    async def _refresh_until_current(self):
+        while True:
+            self._stale = False
+            try:
+                await self.refresh()
+            except Exception:
+                # Se reintentará con el siguiente aviso o lectura
+                pass
+            if not self._stale:
+                return
+
+    async def latest(self) -> Tuple[int, str]:
+        """Versión y contenido tras aplicar las relecturas pendientes"""
+        task = self._refresh_task
+        if task is not None and not task.done():
+            await asyncio.shield(task)
+        if self.content is None:
+            await self.refresh()
+        return self.version, self.content
+
+    def snapshot(self) -> Tuple[int, Optional[str]]:
+        """Versión y contenido materializados ahora mismo (sin esperar)"""
+        return self.version, self.content
+
+    def diff(self, since_version: int) -> Dict[str, Any]:
+        """
+        Cambios desde una versión anterior
+
+        Args:
+            since_version: Última versión que ya conoce quien pregunta
+
+        Returns:
+            Diccionario con type 'unchanged', 'append' (solo lo añadido),
+            'patch' (diff unificado de líneas) o 'full' (contenido completo)
+        """
+        change = {"uri": self.uri, "from_version": since_version, "to_version": self.version}
+        if since_version == self.version:
+            return {**change, "type": "unchanged", "content": ""}
+        previous = dict(self._history).get(since_version)
+        content = self.content or ""
+        if previous is None:
+            return {**change, "type": "full", "content": content}
+        if content.startswith(previous):
+            return {**change, "type": "append", "content": content[len(previous):]}
+        patch = "".join(difflib.unified_diff(
+            previous.splitlines(keepends=True),
+            content.splitlines(keepends=True),
+            fromfile=f"{self.uri}@{since_version}",
+            tofile=f"{self.uri}@{self.version}",
+            n=0
+        ))
+        if len(patch) >= len(content):
+            return {**change, "type": "full", "content": content}
+        return {**change, "type": "patch", "content": patch}
+
+    async def wait_for_update(self, since_version: int, timeout: Optional[float] = None) -> int:
+        """Esperar a una versión posterior a `since_version` y devolverla"""
+        condition = self._condition()
+        async with condition:
+            await asyncio.wait_for(condition.wait_for(lambda: self.version > since_version), timeout)
+        return self.version
+
+    async def close(self):
+        """Cancelar la relectura en curso"""
+        task = self._refresh_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas de la suscripción"""
+        stats = self.stats.copy()
+        stats["version"] = self.version
+        stats["size"] = len(self.content) if self.content is not None else 0
+        return stats
+
+
+class SessionHolder:
+    """Mantiene abierta la sesión de un cliente MCP mientras tenga suscripciones"""
+
+    def __init__(self, client):
+        self.client = client
+        self.refs = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    async def acquire(self):
+        self.refs += 1
+        if self._task is not None:
+            return
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._hold(ready))
+        try:
+            await ready
+        except BaseException:
+            self.refs -= 1
+            self._task = None
+            raise
+
+    async def _hold(self, ready: asyncio.Future):
+        # Se entra y se sale del contexto del cliente desde la misma tarea
+        try:
+            async with self.client:
+                ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+
+    async def release(self):
+        self.refs = max(0, self.refs - 1)
+        if self.refs == 0 and self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
@@ -0,0 +1,240 @@
+"""
+Fachada síncrona de DeepSeekClient con un event loop propio en segundo plano
+"""
+import asyncio
+import queue
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from deepseek_mcp_client.client.batch import run_batch
+from deepseek_mcp_client.client.deepseek_client import DeepSeekClient
+from deepseek_mcp_client.models.client_result import ClientResult
+from deepseek_mcp_client.utils.result_sink import ResultSink
+
+_STREAM_END = object()
+
+
+class SyncDeepSeekClient:
+    """
+    Cliente bloqueante para código síncrono (Flask, Django, scripts).
+
+    Todas las llamadas se ejecutan en un único event loop que vive en un hilo
+    dedicado, de modo que las sesiones MCP permanecen abiertas entre llamadas
+    en lugar de crearse con cada asyncio.run(). Los métodos pueden invocarse
+    desde varios hilos a la vez.
+    """
+
+    def __init__(self, model: Optional[str] = None, client: Optional[DeepSeekClient] = None, warm_sessions: bool = True, **kwargs):
+        """
+        Inicializar cliente síncrono
+
+        Args:
+            model: Modelo DeepSeek (si no se pasa `client`)
+            client: DeepSeekClient ya configurado
+            warm_sessions: Mantener abiertas las sesiones MCP entre llamadas
+            **kwargs: Resto de parámetros de DeepSeekClient
+        """
+        if client is None:
+            if model is None:
+                raise ValueError("Se necesita `model` o un `client` ya creado")
+            client = DeepSeekClient(model, **kwargs)
+        elif kwargs:
+            raise ValueError("Los parámetros de DeepSeekClient solo se aceptan sin `client`")
+        self.client = client
+        self.warm_sessions = warm_sessions
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="deepseek-mcp-loop", daemon=True)
+        self._thread.start()
+        self._close_lock = threading.Lock()
+        self._closed = False
+
+        # Estado que solo se toca desde el hilo del loop
+        self._warm_lock: Optional[asyncio.Lock] = None
+        self._warm = False
+        self._sessions_task: Optional[asyncio.Task] = None
+        self._stop_sessions: Optional[asyncio.Event] = None
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coroutine):
+        """Programar una corrutina en el loop de fondo"""
+        if self._closed:
+            coroutine.close()
+            raise RuntimeError("SyncDeepSeekClient is closed")
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("Blocking calls cannot be made from the client's own event loop")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def _call(self, coroutine, timeout: Optional[float] = None):
+        future = self._submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def _ensure_warm(self):
+        """Conectar una vez y abrir las sesiones MCP que se reutilizarán"""
+        if self._warm:
+            return
+        if self._warm_lock is None:
+            self._warm_lock = asyncio.Lock()
+        async with self._warm_lock:
+            if self._warm:
+                return
+            await self.client._ensure_tools_ready()
+            if self.warm_sessions and self.client.clients:
+                ready = self._loop.create_future()
+                self._stop_sessions = asyncio.Event()
+                self._sessions_task = self._loop.create_task(self._hold_sessions(ready))
+                await ready
+            self._warm = True
+
+    async def _hold_sessions(self, ready: asyncio.Future):
+        """Mantener abiertas las sesiones (se entra y se sale desde la misma tarea)"""
+        async with AsyncExitStack() as stack:
+            for mcp_client in list(self.client.clients):
+                try:
+                    await stack.enter_async_context(mcp_client)
+                except Exception as e:
+                    if self.client.enable_logging:
+                        self.client.logger.warning("Could not keep MCP session open: %s", e)
+            ready.set_result(None)
+            await self._stop_sessions.wait()
+
+    async def _execute(self, instruction: str, kwargs) -> ClientResult:
+        await self._ensure_warm()
+        return await self.client.execute(instruction, **kwargs)
+
+    async def _execute_all(
+        self,
+        instructions: List[str],
+        max_concurrency: Optional[int],
+        kwargs,
+        on_result: Optional[Callable[[ClientResult], Any]] = None,
+        sink: Optional[ResultSink] = None,
+        execution_ids: Optional[Sequence[str]] = None,
+        collect: bool = True
+    ) -> List[Optional[ClientResult]]:
+        await self._ensure_warm()
+
+        def execute(instruction, **batch_kwargs):
+            return self.client.execute(instruction, **kwargs, **batch_kwargs)
+
+        return await run_batch(
+            execute, instructions, max_concurrency, sink, execution_ids, on_result, collect,
+            keep_raw_response=self.client.keep_raw_response is True
+        )
+
+    def execute(self, instruction: str, timeout: Optional[float] = None, **kwargs) -> ClientResult:
+        """
+        Ejecutar una instrucción y esperar el resultado
+
+        Args:
+            instruction: Instrucción a ejecutar
+            timeout: Segundos máximos de espera del hilo llamante
+            **kwargs: Parámetros de DeepSeekClient.execute (deadline, generation, priority...)
+        """
+        return self._call(self._execute(instruction, kwargs), timeout)
+
+    async def _cancel(self, execution_id: str, reason: str) -> bool:
+        return self.client.cancel(execution_id, reason)
+
+    def cancel(self, execution_id: str, reason: str = "cancelled by caller") -> bool:
+        """Cancelar desde cualquier hilo una ejecución en curso (ver DeepSeekClient.cancel)"""
+        return self._call(self._cancel(execution_id, reason))
+
+    def execute_many(
+        self,
+        instructions: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        sink: Optional[ResultSink] = None,
+        execution_ids: Optional[Sequence[str]] = None,
+        collect: bool = True,
+        **kwargs
+    ) -> List[Optional[ClientResult]]:
+        """
+        Ejecutar varias instrucciones de forma concurrente
+
+        Args:
+            instructions: Instrucciones a ejecutar
+            max_concurrency: Máximo de ejecuciones simultáneas (None = sin límite)
+            timeout: Segundos máximos de espera del hilo llamante
+            sink: Destino de resultados (JsonlResultSink, ColumnarResultSink); reanuda
+                saltando las execution_id ya completadas
+            execution_ids: Id de cada instrucción (por defecto deterministas si hay sink)
+            collect: Devolver los resultados además de escribirlos en el destino
+
+        Returns:
+            Resultados en el mismo orden que las instrucciones (None si se saltó; lista vacía si collect=False)
+        """
+        return self._call(
+            self._execute_all(list(instructions), max_concurrency, kwargs, None, sink, execution_ids, collect),
+            timeout
+        )
+
+    def stream(self, instructions: Iterable[str], max_concurrency: Optional[int] = None, **kwargs) -> Iterator[ClientResult]:
+        """
+        Ejecutar varias instrucciones entregando cada resultado en cuanto termina
+
+        Args:
+            instructions: Instrucciones a ejecutar
+            max_concurrency: Máximo de ejecuciones simultáneas (None = sin límite)
+
+        Returns:
+            Iterador de resultados en orden de finalización
+        """
+        instructions = list(instructions)
+        results: "queue.Queue[Any]" = queue.Queue()
+        future = self._submit(self._execute_all(instructions, max_concurrency, kwargs, results.put))
+        # Marca de fin tras el último resultado, también si el lote falla antes de terminar
+        future.add_done_callback(lambda _: results.put(_STREAM_END))
+        try:
+            while True:
+                result = results.get()
+                if result is _STREAM_END:
+                    break
+                yield result
+            # Propaga la excepción del lote, si la hubo
+            future.result()
+        finally:
+            # Abandonar el iterador cancela las ejecuciones pendientes
+            if not future.done():
+                future.cancel()
+
+    async def _shutdown(self):
+        if self._sessions_task is not None:
+            self._stop_sessions.set()
+            await self._sessions_task
+        await self.client.close()
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Cerrar sesiones MCP y detener el hilo del loop"""
+        with self._close_lock:
+            if self._closed:
+                return
+            future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            self._closed = True
+        try:
+            future.result(timeout)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    def get_stats(self):
+        """Obtener estadísticas del cliente"""
+        return self.client.get_stats()
+
+    def __enter__(self) -> "SyncDeepSeekClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
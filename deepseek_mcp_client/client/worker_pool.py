@@ -0,0 +1,416 @@
+"""
+Pool de procesos trabajadores, cada uno con su propio DeepSeekClient
+"""
+import asyncio
+import functools
+import itertools
+import multiprocessing
+import os
+import pickle
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from deepseek_mcp_client.client.batch import run_batch
+from deepseek_mcp_client.client.deepseek_client import DeepSeekClient
+from deepseek_mcp_client.models.client_result import ClientResult
+from deepseek_mcp_client.models.generation_config import GenerationConfig
+from deepseek_mcp_client.utils.result_sink import ResultSink
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Tipos de mensaje del canal
+_EXECUTE = 0
+_RESULT = 1
+_STATS = 2
+_READY = 3
+_CLOSE = 4
+_FAILED = 5
+
+
+def encode_message(message: Any) -> bytes:
+    """Codificación compacta de mensajes: msgpack si está instalado, si no pickle"""
+    if msgpack is not None:
+        return msgpack.packb(message, use_bin_type=True, default=str)
+    return pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_message(data: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return pickle.loads(data)
+
+
+def pack_result(result: ClientResult) -> list:
+    """ClientResult como lista posicional (sin raw_response)"""
+    return list(result.to_tuple())
+
+
+def unpack_result(packed: list) -> ClientResult:
+    return ClientResult.from_tuple(packed)
+
+
+def merge_stats(values: List[Any]) -> Any:
+    """Combinar estadísticas de varios trabajadores: suma contadores y promedia tasas"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return None
+    if all(isinstance(v, dict) for v in present):
+        keys = dict.fromkeys(k for v in present for k in v)
+        merged = {}
+        for key in keys:
+            items = [v.get(key) for v in present]
+            if _is_ratio(key) and all(isinstance(i, (int, float)) and not isinstance(i, bool) for i in items if i is not None):
+                numbers = [i for i in items if i is not None]
+                merged[key] = sum(numbers) / len(numbers) if numbers else None
+            else:
+                merged[key] = merge_stats(items)
+        return merged
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return sum(present)
+    if all(isinstance(v, bool) for v in present):
+        return all(present)
+    return present[0] if all(v == present[0] for v in present) else present
+
+
+def _is_ratio(key: str) -> bool:
+    key = str(key)
+    return key.endswith(("rate", "ratio")) or key.startswith(("avg", "p50", "p95", "mean"))
+
+
+async def _serve(client_factory: Callable[[], DeepSeekClient], conn, max_concurrency: Optional[int]):
+    """Bucle del trabajador: recibe peticiones y responde por el mismo canal"""
+    client = client_factory()
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    send_lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(message):
+        data = encode_message(message)
+        async with send_lock:
+            await asyncio.to_thread(conn.send_bytes, data)
+
+    async def run(request_id, instruction, kwargs):
+        try:
+            if semaphore is None:
+                result = await client.execute(instruction, **kwargs)
+            else:
+                async with semaphore:
+                    result = await client.execute(instruction, **kwargs)
+            result.metadata["worker_pid"] = os.getpid()
+            await send([_RESULT, request_id, pack_result(result)])
+        except Exception as e:
+            await send([_FAILED, request_id, f"{type(e).__name__}: {e}"])
+
+    try:
+        await client._ensure_tools_ready()
+        async with AsyncExitStack() as stack:
+            # Sesiones MCP abiertas durante toda la vida del proceso
+            for mcp_client in list(client.clients):
+                try:
+                    await stack.enter_async_context(mcp_client)
+                except Exception:
+                    pass
+            await send([_READY, os.getpid(), len(client.all_tools)])
+
+            while True:
+                try:
+                    data = await asyncio.to_thread(conn.recv_bytes)
+                except (EOFError, OSError):
+                    break
+                message = decode_message(data)
+                kind = message[0]
+                if kind == _EXECUTE:
+                    task = asyncio.create_task(run(message[1], message[2], message[3]))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif kind == _STATS:
+                    await send([_STATS, message[1], client.get_stats()])
+                elif kind == _CLOSE:
+                    break
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await client.close()
+        conn.close()
+
+
+def _worker_main(client_factory, conn, max_concurrency):
+    asyncio.run(_serve(client_factory, conn, max_concurrency))
+
+
+class _Worker:
+    """Proceso trabajador y su canal, visto desde el proceso principal"""
+
+    def __init__(self, index: int, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.pid: Optional[int] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.reader: Optional[threading.Thread] = None
+        self.send_lock = threading.Lock()
+
+    def send(self, message):
+        data = encode_message(message)
+        with self.send_lock:
+            self.conn.send_bytes(data)
+
+
+class WorkerPool:
+    """
+    Reparte execute() entre N procesos con su propio event loop y sesiones MCP.
+
+    Útil cuando la serialización JSON de esquemas y resultados grandes satura un
+    núcleo. Cada petición va al trabajador con menos peticiones en curso por un
+    canal con codificación compacta (msgpack si está instalado, si no pickle);
+    los resultados vuelven como ClientResult sin raw_response.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], DeepSeekClient]] = None,
+        processes: Optional[int] = None,
+        max_concurrency_per_worker: Optional[int] = None,
+        start_method: str = "spawn",
+        start_timeout: float = 60.0,
+        **client_kwargs
+    ):
+        """
+        Inicializar pool
+
+        Args:
+            client_factory: Función serializable con pickle que crea el cliente en cada proceso
+            processes: Número de procesos (por defecto, núcleos disponibles)
+            max_concurrency_per_worker: Ejecuciones simultáneas por proceso (None = sin límite)
+            start_method: Método de multiprocessing ('spawn', 'forkserver' o 'fork')
+            start_timeout: Segundos máximos para que cada trabajador esté listo
+            **client_kwargs: Parámetros de DeepSeekClient si no se pasa client_factory
+        """
+        if client_factory is None:
+            if not client_kwargs:
+                raise ValueError("Se necesita client_factory o los parámetros de DeepSeekClient")
+            client_factory = functools.partial(DeepSeekClient, **client_kwargs)
+        elif client_kwargs:
+            raise ValueError("Los parámetros de DeepSeekClient solo se aceptan sin client_factory")
+        self.client_factory = client_factory
+        self.processes = processes or os.cpu_count() or 1
+        self.max_concurrency_per_worker = max_concurrency_per_worker
+        self.start_method = start_method
+        self.start_timeout = start_timeout
+
+        self._workers: List[_Worker] = []
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Dict[int, asyncio.Future] = {}
+        self._started = False
+
+        # Estadísticas
+        self.stats = {
+            "requests": 0,
+            "completed": 0,
+            "failed": 0,
+            "worker_crashes": 0
+        }
+
+    async def start(self) -> "WorkerPool":
+        """Lanzar los procesos y esperar a que conecten con sus servidores MCP"""
+        if self._started:
+            return self
+        self._loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context(self.start_method)
+        for index in range(self.processes):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_worker_main,
+                args=(self.client_factory, child_conn, self.max_concurrency_per_worker),
+                name=f"deepseek-mcp-worker-{index}",
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            worker = _Worker(index, process, parent_conn)
+            self._ready[index] = self._loop.create_future()
+            worker.reader = threading.Thread(target=self._read, args=(worker,), daemon=True)
+            worker.reader.start()
+            self._workers.append(worker)
+        self._started = True
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*self._ready.values()), self.start_timeout)
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    def _read(self, worker: _Worker):
+        """Hilo lector: despacha las respuestas del trabajador al event loop"""
+        try:
+            while True:
+                try:
+                    data = worker.conn.recv_bytes()
+                except (EOFError, OSError):
+                    break
+                self._loop.call_soon_threadsafe(self._dispatch, worker, decode_message(data))
+            self._loop.call_soon_threadsafe(self._worker_exited, worker)
+        except RuntimeError:
+            # El event loop ya se cerró
+            pass
+
+    def _dispatch(self, worker: _Worker, message):
+        kind = message[0]
+        if kind == _READY:
+            worker.pid = message[1]
+            future = self._ready.get(worker.index)
+            if future is not None and not future.done():
+                future.set_result(message[2])
+            return
+        future = self._pending.pop(message[1], None)
+        if kind in (_RESULT, _FAILED):
+            worker.in_flight -= 1
+            worker.completed += 1
+        if future is None or future.done():
+            return
+        if kind == _RESULT:
+            future.set_result(unpack_result(message[2]))
+        elif kind == _STATS:
+            future.set_result(message[2])
+        else:
+            future.set_exception(RuntimeError(f"Worker {worker.index} failed: {message[2]}"))
+
+    def _worker_exited(self, worker: _Worker):
+        ready = self._ready.get(worker.index)
+        if ready is not None and not ready.done():
+            ready.set_exception(RuntimeError(f"Worker {worker.index} exited during startup"))
+        if worker in self._workers:
+            self._workers.remove(worker)
+            self.stats["worker_crashes"] += 1
+        for request_id, future in list(self._pending.items()):
+            if future.worker is worker:
+                del self._pending[request_id]
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Worker {worker.index} exited"))
+
+    async def _request(self, worker: _Worker, message: list) -> Any:
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        future.worker = worker
+        self._pending[request_id] = future
+        # Una ejecución cuenta como en curso hasta que llega su _RESULT o _FAILED
+        counted = message[0] == _EXECUTE
+        if counted:
+            worker.in_flight += 1
+
+        def sent(task: asyncio.Future):
+            # Si el envío no llegó al trabajador no habrá respuesta que lo libere
+            if task.cancelled() or task.exception() is not None:
+                self._pending.pop(request_id, None)
+                if counted:
+                    worker.in_flight -= 1
+
+        # send_bytes bloquea si la tubería está llena: se escribe fuera del event loop
+        sending = asyncio.ensure_future(asyncio.to_thread(worker.send, [message[0], request_id, *message[1:]]))
+        sending.add_done_callback(sent)
+        try:
+            # shield: cancelar la espera no deshace un envío que ya está en curso
+            await asyncio.shield(sending)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Worker {worker.index} is not reachable: {e}") from e
+        return await future
+
+    def _choose(self) -> _Worker:
+        if not self._workers:
+            raise RuntimeError("WorkerPool has no running workers")
+        return min(self._workers, key=lambda w: w.in_flight)
+
+    async def execute(self, instruction: str, **kwargs) -> ClientResult:
+        """
+        Ejecutar una instrucción en el trabajador menos cargado
+
+        Args:
+            instruction: Instrucción a ejecutar
+            **kwargs: Parámetros de DeepSeekClient.execute (deadline, generation, priority...)
+        """
+        if not self._started:
+            await self.start()
+        if isinstance(kwargs.get("generation"), GenerationConfig):
+            kwargs["generation"] = kwargs["generation"].to_dict()
+
+        self.stats["requests"] += 1
+        worker = self._choose()
+        try:
+            result = await self._request(worker, [_EXECUTE, instruction, kwargs])
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["completed"] += 1
+        return result
+
+    async def execute_many(
+        self,
+        instructions: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        sink: Optional[ResultSink] = None,
+        execution_ids: Optional[Sequence[str]] = None,
+        collect: bool = True,
+        **kwargs
+    ) -> List[Optional[ClientResult]]:
+        """
+        Ejecutar varias instrucciones repartidas entre los trabajadores (mismo orden)
+
+        Args:
+            instructions: Instrucciones a ejecutar
+            max_concurrency: Máximo de ejecuciones en vuelo en todo el pool (None = sin límite)
+            sink: Destino de resultados; reanuda saltando las execution_id ya completadas
+            execution_ids: Id de cada instrucción (por defecto deterministas si hay sink)
+            collect: Devolver los resultados además de escribirlos en el destino
+        """
+        def execute(instruction, **batch_kwargs):
+            return self.execute(instruction, **kwargs, **batch_kwargs)
+
+        return await run_batch(execute, list(instructions), max_concurrency, sink, execution_ids, collect=collect)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas del pool y agregadas de los clientes de todos los trabajadores"""
+        workers = list(self._workers)
+        client_stats = await asyncio.gather(*(self._request(w, [_STATS]) for w in workers)) if workers else []
+        stats = self.stats.copy()
+        stats["workers"] = [
+            {"index": w.index, "pid": w.pid, "in_flight": w.in_flight, "completed": w.completed}
+            for w in workers
+        ]
+        stats["clients"] = merge_stats(list(client_stats))
+        return stats
+
+    async def close(self, timeout: float = 10.0):
+        """Cerrar los trabajadores esperando a que terminen sus ejecuciones"""
+        workers, self._workers = list(self._workers), []
+        for worker in workers:
+            try:
+                worker.send([_CLOSE])
+            except (OSError, ValueError):
+                pass
+
+        def join():
+            for worker in workers:
+                worker.process.join(timeout)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+                    worker.process.join()
+                worker.conn.close()
+
+        await asyncio.to_thread(join)
+        self._started = False
+
+    async def __aenter__(self) -> "WorkerPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -3,7 +3,10 @@ Handlers para mensajes MCP
 """
 
 from .message_handler import DeepSeekMessageHandler
+from .progress_bus import ProgressBus, ProgressEvent
 
 __all__ = [
-    "DeepSeekMessageHandler"
+    "DeepSeekMessageHandler",
+    "ProgressBus",
+    "ProgressEvent"
 ]
\ No newline at end of file
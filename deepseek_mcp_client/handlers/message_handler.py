@@ -15,6 +15,8 @@ class DeepSeekMessageHandler(MessageHandler):
         logger: Optional[logging.Logger] = None,
         on_tools_changed: Optional[Callable[[], None]] = None,
         on_resources_changed: Optional[Callable[[], None]] = None,
+        on_prompts_changed: Optional[Callable[[], None]] = None,
+        on_resource_updated: Optional[Callable[[str], None]] = None,
         on_progress_update: Optional[Callable[[float, Optional[float], Optional[str]], None]] = None
     ):
         """
@@ -24,6 +26,8 @@ class DeepSeekMessageHandler(MessageHandler):
             logger: Logger para mensajes
             on_tools_changed: Callback cuando cambian las herramientas
             on_resources_changed: Callback cuando cambian los recursos
+            on_prompts_changed: Callback cuando cambian los prompts
+            on_resource_updated: Callback con la URI de un recurso suscrito que cambió
             on_progress_update: Callback para actualizaciones de progreso
         """
         self.logger = logger or logging.getLogger(__name__)
@@ -34,6 +38,8 @@ class DeepSeekMessageHandler(MessageHandler):
         # Callbacks opcionales
         self._on_tools_changed = on_tools_changed
         self._on_resources_changed = on_resources_changed
+        self._on_prompts_changed = on_prompts_changed
+        self._on_resource_updated = on_resource_updated
         self._on_progress_update = on_progress_update
         
         # Estadísticas
@@ -41,6 +47,7 @@ class DeepSeekMessageHandler(MessageHandler):
             "tools_changed_count": 0,
             "resources_changed_count": 0,
             "prompts_changed_count": 0,
+            "resource_updates_count": 0,
             "progress_updates_count": 0
         }
     
@@ -54,7 +61,7 @@ class DeepSeekMessageHandler(MessageHandler):
             try:
                 self._on_tools_changed()
             except Exception as e:
-                self.logger.error(f"Error in tools changed callback: {e}")
+                self.logger.error("Error in tools changed callback: %s", e)
     
     async def on_resource_list_changed(self, notification: mcp.types.ResourceListChangedNotification):
         """Maneja cambios en la lista de recursos"""
@@ -66,33 +73,44 @@ class DeepSeekMessageHandler(MessageHandler):
             try:
                 self._on_resources_changed()
             except Exception as e:
-                self.logger.error(f"Error in resources changed callback: {e}")
+                self.logger.error("Error in resources changed callback: %s", e)
     
     async def on_prompt_list_changed(self, notification: mcp.types.PromptListChangedNotification):
         """Maneja cambios en la lista de prompts"""
         self.logger.info("Prompt list updated")
         self.prompt_cache_dirty = True
         self.stats["prompts_changed_count"] += 1
+        
+        if self._on_prompts_changed:
+            try:
+                self._on_prompts_changed()
+            except Exception as e:
+                self.logger.error("Error in prompts changed callback: %s", e)
+    
+    async def on_resource_updated(self, notification: mcp.types.ResourceUpdatedNotification):
+        """Maneja avisos de cambio de un recurso suscrito"""
+        uri = str(notification.params.uri)
+        self.logger.debug("Resource updated: %s", uri)
+        self.stats["resource_updates_count"] += 1
+        
+        if self._on_resource_updated:
+            try:
+                self._on_resource_updated(uri)
+            except Exception as e:
+                self.logger.error("Error in resource updated callback: %s", e)
     
     async def on_progress(self, notification: mcp.types.ProgressNotification):
         """Maneja notificaciones de progreso"""
-        progress = notification.progress
-        total = getattr(notification, 'total', None)
-        
-        if total:
-            percentage = (progress / total) * 100
-            message = f"Progress: {percentage:.1f}% ({progress}/{total})"
-        else:
-            message = f"Progress: {progress}"
-        
-        self.logger.info(message)
+        params = notification.params
+        # El detalle por llamada lo reparte el ProgressBus con límite de frecuencia
+        self.logger.debug("Progress notification: %s/%s", params.progress, params.total)
         self.stats["progress_updates_count"] += 1
         
         if self._on_progress_update:
             try:
-                self._on_progress_update(progress, total, message)
+                self._on_progress_update(params.progress, params.total, params.message)
             except Exception as e:
-                self.logger.error(f"Error in progress update callback: {e}")
+                self.logger.error("Error in progress update callback: %s", e)
     
     def has_cache_changes(self) -> bool:
         """Verificar si hay cambios pendientes en cache"""
@@ -0,0 +1,271 @@
+"""
+Bus de eventos de progreso de herramientas MCP
+"""
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class ProgressEvent:
+    """Aviso de progreso de una llamada a herramienta"""
+
+    execution_id: Optional[str]
+    tool_name: Optional[str]
+    call_id: int
+    progress: float
+    total: Optional[float] = None
+    message: Optional[str] = None
+    timestamp: float = 0.0
+    # Avisos intermedios descartados por el límite de frecuencia antes de este
+    coalesced: int = 0
+
+    @property
+    def percentage(self) -> Optional[float]:
+        """Porcentaje completado si el servidor indica el total"""
+        if not self.total:
+            return None
+        return (self.progress / self.total) * 100
+
+    @property
+    def done(self) -> bool:
+        """Indica si es el aviso final de la llamada"""
+        return self.total is not None and self.progress >= self.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "execution_id": self.execution_id,
+            "tool_name": self.tool_name,
+            "call_id": self.call_id,
+            "progress": self.progress,
+            "total": self.total,
+            "message": self.message,
+            "timestamp": self.timestamp,
+            "coalesced": self.coalesced
+        }
+
+
+class ProgressStream:
+    """
+    Iterador asíncrono de eventos de progreso.
+
+    La cola está acotada: si el consumidor se queda atrás se descartan los
+    eventos más antiguos, ya que el progreso más reciente sustituye al anterior.
+    """
+
+    def __init__(self, bus: "ProgressBus", execution_id: Optional[str], max_queue: int):
+        self._bus = bus
+        self.execution_id = execution_id
+        self._queue: deque = deque(maxlen=max_queue)
+        self._ready: Optional[asyncio.Event] = None
+        self.closed = False
+        self.dropped = 0
+
+    def _put(self, event: ProgressEvent):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            self._bus.stats["dropped"] += 1
+        self._queue.append(event)
+        if self._ready is not None:
+            self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ProgressEvent:
+        while not self._queue:
+            if self.closed:
+                raise StopAsyncIteration
+            # Se crea perezosamente para quedar ligado al event loop que lo usa
+            if self._ready is None:
+                self._ready = asyncio.Event()
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    def close(self):
+        """Dejar de recibir eventos; los ya encolados se siguen entregando"""
+        if self.closed:
+            return
+        self.closed = True
+        self._bus._remove_stream(self)
+        if self._ready is not None:
+            self._ready.set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ProgressCall:
+    """Publicador de progreso de una llamada a herramienta con límite de frecuencia"""
+
+    def __init__(self, bus: "ProgressBus", execution_id: Optional[str], tool_name: Optional[str], call_id: int):
+        self._bus = bus
+        self.execution_id = execution_id
+        self.tool_name = tool_name
+        self.call_id = call_id
+        self._last_emit = float("-inf")
+        self._pending: Optional[ProgressEvent] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._coalesced = 0
+
+    async def __call__(self, progress: float, total: Optional[float], message: Optional[str]):
+        """Firma de progress_handler de FastMCP"""
+        self.publish(progress, total, message)
+
+    def publish(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        """Publicar un aviso; los que llegan antes de `min_interval` se agrupan en el último"""
+        bus = self._bus
+        bus.stats["published"] += 1
+        if not bus.active:
+            return
+
+        now = time.monotonic()
+        event = ProgressEvent(self.execution_id, self.tool_name, self.call_id, progress, total, message, time.time())
+        if event.done or now - self._last_emit >= bus.min_interval:
+            self._emit(event, now)
+            return
+
+        if self._pending is not None:
+            self._coalesced += 1
+            bus.stats["coalesced"] += 1
+        self._pending = event
+        if self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(bus.min_interval - (now - self._last_emit), self._flush)
+
+    def _emit(self, event: ProgressEvent, now: float):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending is not None and self._pending is not event:
+            self._coalesced += 1
+            self._bus.stats["coalesced"] += 1
+        self._pending = None
+        event.coalesced = self._coalesced
+        self._coalesced = 0
+        self._last_emit = now
+        self._bus._dispatch(event)
+
+    def _flush(self):
+        self._timer = None
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            self._emit(pending, time.monotonic())
+
+    def close(self):
+        """Entregar el último aviso pendiente al terminar la llamada"""
+        self._flush()
+
+
+class ProgressBus:
+    """
+    Reparte el progreso de las herramientas entre suscriptores.
+
+    Cada llamada a herramienta publica a través de su propio ProgressCall, que
+    limita la frecuencia a un evento cada `min_interval` segundos: los avisos
+    intermedios se agrupan en el más reciente y el aviso final se entrega
+    siempre. Sin suscriptores, publicar solo incrementa un contador.
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_queue: int = 256):
+        """
+        Inicializar bus de progreso
+
+        Args:
+            min_interval: Segundos mínimos entre eventos de una misma llamada
+            max_queue: Eventos máximos encolados por iterador (se descartan los más antiguos)
+        """
+        self.min_interval = min_interval
+        self.max_queue = max_queue
+        self._callbacks: List[tuple] = []
+        self._streams: List[ProgressStream] = []
+        self._call_ids = itertools.count(1)
+
+        # Estadísticas
+        self.stats = {
+            "published": 0,
+            "delivered": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "callback_errors": 0
+        }
+
+    @property
+    def active(self) -> bool:
+        """Indica si hay algún suscriptor"""
+        return bool(self._callbacks or self._streams)
+
+    def start_call(self, tool_name: Optional[str] = None, execution_id: Optional[str] = None) -> ProgressCall:
+        """Crear el publicador de una llamada a herramienta"""
+        return ProgressCall(self, execution_id, tool_name, next(self._call_ids))
+
+    def subscribe(self, callback: Callable[[ProgressEvent], Any], execution_id: Optional[str] = None) -> Callable[[], None]:
+        """
+        Registrar un callback de progreso
+
+        Args:
+            callback: Función que recibe cada ProgressEvent (no debe bloquear)
+            execution_id: Recibir solo los eventos de esta ejecución
+
+        Returns:
+            Función para cancelar la suscripción
+        """
+        entry = (callback, execution_id)
+        self._callbacks.append(entry)
+
+        def unsubscribe():
+            if entry in self._callbacks:
+                self._callbacks.remove(entry)
+
+        return unsubscribe
+
+    def stream(self, execution_id: Optional[str] = None, max_queue: Optional[int] = None) -> ProgressStream:
+        """
+        Iterador asíncrono de eventos de progreso
+
+        Args:
+            execution_id: Recibir solo los eventos de esta ejecución
+            max_queue: Tamaño de la cola (por defecto el del bus)
+        """
+        stream = ProgressStream(self, execution_id, max_queue or self.max_queue)
+        self._streams.append(stream)
+        return stream
+
+    def _remove_stream(self, stream: ProgressStream):
+        if stream in self._streams:
+            self._streams.remove(stream)
+
+    def _dispatch(self, event: ProgressEvent):
+        for callback, execution_id in list(self._callbacks):
+            if execution_id is not None and execution_id != event.execution_id:
+                continue
+            try:
+                callback(event)
+                self.stats["delivered"] += 1
+            except Exception:
+                self.stats["callback_errors"] += 1
+        for stream in list(self._streams):
+            if stream.execution_id is not None and stream.execution_id != event.execution_id:
+                continue
+            stream._put(event)
+            self.stats["delivered"] += 1
+
+    def close(self):
+        """Cerrar todos los iteradores abiertos"""
+        for stream in list(self._streams):
+            stream.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del bus"""
+        stats = self.stats.copy()
+        stats["subscribers"] = len(self._callbacks)
+        stats["streams"] = len(self._streams)
+        return stats
@@ -1,7 +1,10 @@
-from .client_result import ClientResult
+from .client_result import ClientResult, ResultMetadata
 from .server_config import MCPServerConfig
+from .generation_config import GenerationConfig
 
 __all__ = [
     "ClientResult",
-    "MCPServerConfig"
+    "ResultMetadata",
+    "MCPServerConfig",
+    "GenerationConfig"
 ]
\ No newline at end of file
@@ -1,10 +1,78 @@
+import json
+import sys
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
-@dataclass
+
+class ResultMetadata(dict):
+    """
+    Metadatos de una ejecución: un dict con acceso por atributo a los campos conocidos.
+
+    Sigue siendo un diccionario (json.dumps, dataclasses.asdict, dict(metadata))
+    y ocupa lo mismo que uno; metadata.duration equivale a metadata["duration"].
+    Para exportar lotes grandes de forma compacta están to_tuple() y to_bytes().
+    """
+
+    FIELDS = (
+        "model",                 # str
+        "mcp_enabled",           # bool
+        "direct_response",       # bool
+        "tools_executed",        # int
+        "tools_available",       # int
+        "schema_tokens_saved",   # int
+        "duration",              # float
+        "servers_connected",     # int
+        "transport_types",       # Tuple[str, ...]
+        "error_type",            # str
+        "phases",                # List[Dict[str, Any]]
+        "escalated",             # bool
+        "final_call_skipped",    # bool
+        "cached",                # bool
+        "cached_execution_id",   # str
+        "cache_layer"            # str
+    )
+    __slots__ = ()
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._FIELD_SET:
+            try:
+                return self[name]
+            except KeyError:
+                raise AttributeError(name) from None
+        raise AttributeError(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario"""
+        return dict(self)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"ResultMetadata({dict.__repr__(self)})"
+
+
+# slots=True requiere Python 3.10; en versiones anteriores es una dataclass normal
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class ClientResult:
+    """
+    Resultado de una ejecución.
+
+    Con Python 3.10+ usa __slots__ (sin __dict__ por resultado). Lo que más
+    ocupa es la respuesta cruda del SDK: el cliente no la conserva en los
+    resultados de execute_many() salvo con keep_raw_response=True.
+    """
+
     output: str
     success: bool
     execution_id: str
@@ -13,12 +81,16 @@ class ClientResult:
     metadata: Dict[str, Any]
     raw_response: Optional[Any] = None
     error: Optional[str] = None
-    
+
+    def __post_init__(self):
+        if not isinstance(self.metadata, ResultMetadata):
+            self.metadata = ResultMetadata(self.metadata or {})
+
     def __str__(self) -> str:
         """Representación string del resultado"""
         status = "✅ ÉXITO" if self.success else "❌ ERROR"
         return f"{status} [{self.execution_id}] - {len(self.tools_used)} herramientas usadas"
-    
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertir a diccionario para serialización"""
         return {
@@ -27,6 +99,64 @@ class ClientResult:
             "execution_id": self.execution_id,
             "timestamp": self.timestamp.isoformat(),
             "tools_used": self.tools_used,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
             "error": self.error
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ClientResult":
+        """Reconstruir desde to_dict()"""
+        timestamp = data["timestamp"]
+        return cls(
+            output=data["output"],
+            success=data["success"],
+            execution_id=data["execution_id"],
+            timestamp=datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp,
+            tools_used=list(data.get("tools_used") or []),
+            metadata=data.get("metadata") or {},
+            error=data.get("error")
+        )
+
+    def to_tuple(self) -> Tuple:
+        """Forma posicional compacta (sin raw_response); timestamp en segundos epoch"""
+        return (
+            self.output,
+            self.success,
+            self.execution_id,
+            self.timestamp.timestamp(),
+            list(self.tools_used),
+            dict(self.metadata),
+            self.error
+        )
+
+    @classmethod
+    def from_tuple(cls, packed) -> "ClientResult":
+        """Reconstruir desde to_tuple()"""
+        output, success, execution_id, timestamp, tools_used, metadata, error = packed
+        return cls(
+            output=output,
+            success=success,
+            execution_id=execution_id,
+            timestamp=datetime.fromtimestamp(timestamp),
+            tools_used=list(tools_used),
+            metadata=metadata,
+            error=error
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialización binaria (msgpack si está instalado, si no JSON compacto)"""
+        if msgpack is not None:
+            return b"M" + msgpack.packb(self.to_tuple(), use_bin_type=True, default=str)
+        return b"J" + json.dumps(self.to_tuple(), ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ClientResult":
+        """Reconstruir desde to_bytes()"""
+        marker, body = data[:1], data[1:]
+        if marker == b"M":
+            if msgpack is None:
+                raise RuntimeError("msgpack is required to decode this result")
+            return cls.from_tuple(msgpack.unpackb(body, raw=False, strict_map_key=False))
+        if marker == b"J":
+            return cls.from_tuple(json.loads(body))
+        raise ValueError("Unknown result encoding")
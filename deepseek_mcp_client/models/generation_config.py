@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, List, Optional, Union
+
+
+PHASES = ("planning", "final")
+
+# Parámetros que solo tienen sentido cuando la petición incluye herramientas
+TOOL_PARAMS = ("tool_choice", "parallel_tool_calls")
+
+
+@dataclass
+class GenerationConfig:
+    """Parámetros de generación de las llamadas a DeepSeek"""
+
+    max_tokens: Optional[int] = 4000
+    temperature: Optional[float] = 0.7
+    top_p: Optional[float] = None
+    tool_choice: Optional[Union[str, Dict[str, Any]]] = None
+    parallel_tool_calls: Optional[bool] = None
+    stop: Optional[Union[str, List[str]]] = None
+    response_format: Optional[Dict[str, Any]] = None
+
+    # Ajustes por fase que se combinan sobre los generales:
+    # 'planning' es la llamada que decide las herramientas, 'final' la respuesta.
+    # tool_choice y parallel_tool_calls generales solo van a 'planning'; en 'final'
+    # se aplican si se indican en `final`
+    planning: Dict[str, Any] = field(default_factory=dict)
+    final: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Validaciones después de la inicialización"""
+        for phase in PHASES:
+            self._check_keys(getattr(self, phase), allow_phases=False)
+
+    @classmethod
+    def _param_names(cls) -> List[str]:
+        return [f.name for f in fields(cls) if f.name not in PHASES]
+
+    @classmethod
+    def _check_keys(cls, overrides: Dict[str, Any], allow_phases: bool = True):
+        allowed = set(cls._param_names()) | (set(PHASES) if allow_phases else set())
+        unknown = set(overrides) - allowed
+        if unknown:
+            raise ValueError(f"Parámetros de generación desconocidos: {', '.join(sorted(unknown))}")
+
+    def merged(self, overrides: Optional[Union["GenerationConfig", Dict[str, Any]]] = None) -> "GenerationConfig":
+        """
+        Combinar con ajustes de una llamada concreta
+
+        Args:
+            overrides: GenerationConfig completo (reemplaza) o diccionario de cambios,
+                donde 'planning' y 'final' se combinan con los de la configuración
+
+        Returns:
+            Nueva configuración
+        """
+        if overrides is None:
+            return self
+        if isinstance(overrides, GenerationConfig):
+            return overrides
+        self._check_keys(overrides)
+        changes = dict(overrides)
+        for phase in PHASES:
+            if phase in changes:
+                changes[phase] = {**getattr(self, phase), **changes[phase]}
+        return replace(self, **changes)
+
+    def for_phase(self, phase: str, has_tools: bool = True) -> Dict[str, Any]:
+        """
+        Parámetros de la petición para una fase
+
+        Args:
+            phase: 'planning' o 'final'
+            has_tools: Si la petición incluye herramientas
+
+        Returns:
+            Diccionario sin valores None
+        """
+        if phase not in PHASES:
+            raise ValueError(f"Fase desconocida: {phase}")
+        params = {name: getattr(self, name) for name in self._param_names()}
+        if phase != "planning":
+            # p. ej. tool_choice="required" forzaría herramientas en la respuesta final
+            for name in TOOL_PARAMS:
+                params.pop(name, None)
+        params.update(getattr(self, phase))
+        if not has_tools:
+            for name in TOOL_PARAMS:
+                params.pop(name, None)
+        return {k: v for k, v in params.items() if v is not None}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario"""
+        data = {name: getattr(self, name) for name in self._param_names()}
+        data["planning"] = dict(self.planning)
+        data["final"] = dict(self.final)
+        return data
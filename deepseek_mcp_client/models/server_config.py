@@ -1,6 +1,6 @@
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from fastmcp import FastMCP
 
 
@@ -25,6 +25,10 @@ class MCPServerConfig:
     transport_type: Optional[str] = None  # 'http', 'stdio', 'memory'
     keep_alive: bool = True
     timeout: float = 30.0
+    # Límite propio de algunas herramientas (segundos), por debajo de timeout
+    tool_timeouts: Optional[Dict[str, float]] = None
+    # Parámetros de AdaptiveConcurrencyLimiter para este servidor (activa el límite)
+    concurrency: Optional[Dict[str, Any]] = None
     
     # Metadatos
     name: Optional[str] = None
@@ -79,6 +83,8 @@ class MCPServerConfig:
             "command": self.command,
             "args": self.args,
             "timeout": self.timeout,
+            "tool_timeouts": self.tool_timeouts,
+            "concurrency": self.concurrency,
             "description": self.description
         }
     
@@ -0,0 +1,410 @@
+"""
+Validación y reparación de argumentos de herramientas antes de enviarlos al servidor MCP
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from deepseek_mcp_client.utils.schema_optimizer import _REF_PREFIXES
+
+Validator = Callable[[Any, str, List["ValidationIssue"]], None]
+
+_CODE_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool)
+    or (isinstance(v, float) and v.is_integer()),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class ArgumentParseError(ValueError):
+    """Los argumentos no son JSON válido ni reparable"""
+
+
+@dataclass
+class ValidationIssue:
+    """Problema encontrado al validar argumentos"""
+    path: str
+    message: str
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convertir a diccionario"""
+        return {"path": self.path or "$", "message": self.message}
+
+
+def _replace_outside_strings(text: str, replace: Callable[[str], str]) -> str:
+    """Aplicar un reemplazo solo a los fragmentos fuera de cadenas JSON"""
+    parts = re.split(r'("(?:\\.|[^"\\])*")', text)
+    return "".join(part if i % 2 else replace(part) for i, part in enumerate(parts))
+
+
+def _close_unbalanced(text: str) -> str:
+    """Cerrar llaves, corchetes y comillas que quedaron abiertas"""
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    return text + "".join(reversed(stack))
+
+
+def repair_json_arguments(raw: Optional[str]) -> Tuple[Any, bool]:
+    """
+    Parsear argumentos JSON aplicando reparaciones baratas si es necesario
+
+    Reparaciones: bloques de código markdown, cadena vacía, literales Python,
+    comillas simples, comas finales y llaves sin cerrar.
+
+    Args:
+        raw: Argumentos tal como los devuelve el modelo
+
+    Returns:
+        Tupla (argumentos, reparado)
+
+    Raises:
+        ArgumentParseError: Si no se puede obtener JSON válido
+    """
+    if raw is None or not raw.strip():
+        return {}, False
+    try:
+        return json.loads(raw), False
+    except (TypeError, ValueError):
+        pass
+
+    text = _CODE_FENCE.sub("", raw.strip())
+    if "'" in text and '"' not in text:
+        text = text.replace("'", '"')
+    text = _replace_outside_strings(
+        text,
+        lambda part: _TRAILING_COMMA.sub(
+            r"\1", re.sub(r"\b(True|False|None)\b", lambda m: _PY_LITERALS[m.group(1)], part)
+        )
+    )
+    for candidate in (text, _close_unbalanced(text)):
+        try:
+            return json.loads(_TRAILING_COMMA.sub(r"\1", candidate)), True
+        except ValueError:
+            continue
+
+    raise ArgumentParseError(f"Invalid JSON arguments: {raw[:200]}")
+
+
+class _SchemaCompiler:
+    """Compila un JSON Schema a una cadena de closures de validación"""
+
+    def __init__(self, root: Dict[str, Any]):
+        self.root = root
+        self.defs = {**(root.get("definitions") or {}), **(root.get("$defs") or {})}
+        self._ref_cache: Dict[str, Validator] = {}
+
+    def compile(self, schema: Any) -> Validator:
+        """Compilar un nodo del esquema"""
+        if schema is False:
+            return lambda value, path, issues: issues.append(ValidationIssue(path, "no value allowed"))
+        if not isinstance(schema, dict):
+            return lambda value, path, issues: None
+
+        checks: List[Validator] = []
+
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            checks.append(self._compile_ref(ref))
+
+        expected = schema.get("type")
+        if expected is not None:
+            checks.append(self._compile_type(expected))
+
+        if "enum" in schema:
+            options = schema["enum"]
+
+            def check_enum(value, path, issues):
+                if value not in options:
+                    issues.append(ValidationIssue(path, f"must be one of {options}"))
+            checks.append(check_enum)
+
+        if "const" in schema:
+            constant = schema["const"]
+
+            def check_const(value, path, issues):
+                if value != constant:
+                    issues.append(ValidationIssue(path, f"must be {constant!r}"))
+            checks.append(check_const)
+
+        checks.extend(self._compile_object(schema))
+        checks.extend(self._compile_array(schema))
+        checks.extend(self._compile_scalars(schema))
+        checks.extend(self._compile_combinators(schema))
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def run_all(value, path, issues):
+            for check in checks:
+                check(value, path, issues)
+        return run_all
+
+    def _compile_ref(self, ref: str) -> Validator:
+        """Compilar referencias locales de forma perezosa (admite recursión)"""
+        target = self.root if ref == "#" else None
+        for prefix in _REF_PREFIXES:
+            if ref.startswith(prefix):
+                target = self.defs.get(ref[len(prefix):])
+        # Referencias externas o a otras rutas del documento: sin validar
+        if target is None:
+            return lambda value, path, issues: None
+
+        def check_ref(value, path, issues):
+            validator = self._ref_cache.get(ref)
+            if validator is None:
+                validator = self._ref_cache[ref] = self.compile(target)
+            validator(value, path, issues)
+        return check_ref
+
+    @staticmethod
+    def _compile_type(expected) -> Validator:
+        names = expected if isinstance(expected, list) else [expected]
+        predicates = [_JSON_TYPES[name] for name in names if name in _JSON_TYPES]
+        label = " or ".join(names)
+
+        def check_type(value, path, issues):
+            if predicates and not any(predicate(value) for predicate in predicates):
+                issues.append(ValidationIssue(path, f"expected {label}, got {type(value).__name__}"))
+        return check_type
+
+    def _compile_object(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks: List[Validator] = []
+        required = schema.get("required") or []
+        properties = {
+            name: self.compile(prop) for name, prop in (schema.get("properties") or {}).items()
+        }
+        additional = schema.get("additionalProperties", True)
+        additional_validator = self.compile(additional) if isinstance(additional, dict) else None
+
+        if not (required or properties or additional is not True):
+            return checks
+
+        def check_object(value, path, issues):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    issues.append(ValidationIssue(f"{path}.{name}", "required property missing"))
+            for name, item in value.items():
+                validator = properties.get(name)
+                if validator is not None:
+                    validator(item, f"{path}.{name}", issues)
+                elif additional is False:
+                    issues.append(ValidationIssue(f"{path}.{name}", "unexpected property"))
+                elif additional_validator is not None:
+                    additional_validator(item, f"{path}.{name}", issues)
+        checks.append(check_object)
+        return checks
+
+    def _compile_array(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks: List[Validator] = []
+        items = schema.get("items")
+        items_validator = self.compile(items) if isinstance(items, dict) else None
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        if items_validator is None and min_items is None and max_items is None:
+            return checks
+
+        def check_array(value, path, issues):
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                issues.append(ValidationIssue(path, f"expected at least {min_items} items"))
+            if max_items is not None and len(value) > max_items:
+                issues.append(ValidationIssue(path, f"expected at most {max_items} items"))
+            if items_validator is not None:
+                for index, item in enumerate(value):
+                    items_validator(item, f"{path}[{index}]", issues)
+        checks.append(check_array)
+        return checks
+
+    @staticmethod
+    def _compile_scalars(schema: Dict[str, Any]) -> List[Validator]:
+        checks: List[Validator] = []
+        bounds = [
+            (schema.get("minimum"), lambda v, b: v < b, "must be >= {}"),
+            (schema.get("maximum"), lambda v, b: v > b, "must be <= {}"),
+            (schema.get("exclusiveMinimum"), lambda v, b: v <= b, "must be > {}"),
+            (schema.get("exclusiveMaximum"), lambda v, b: v >= b, "must be < {}"),
+        ]
+        bounds = [bound for bound in bounds if isinstance(bound[0], (int, float))]
+        if bounds:
+            def check_bounds(value, path, issues):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return
+                for limit, violates, message in bounds:
+                    if violates(value, limit):
+                        issues.append(ValidationIssue(path, message.format(limit)))
+            checks.append(check_bounds)
+
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if isinstance(schema.get("pattern"), str) else None
+        if min_length is not None or max_length is not None or pattern is not None:
+            def check_string(value, path, issues):
+                if not isinstance(value, str):
+                    return
+                if min_length is not None and len(value) < min_length:
+                    issues.append(ValidationIssue(path, f"shorter than {min_length} characters"))
+                if max_length is not None and len(value) > max_length:
+                    issues.append(ValidationIssue(path, f"longer than {max_length} characters"))
+                if pattern is not None and not pattern.search(value):
+                    issues.append(ValidationIssue(path, f"does not match pattern {pattern.pattern!r}"))
+            checks.append(check_string)
+        return checks
+
+    def _compile_combinators(self, schema: Dict[str, Any]) -> List[Validator]:
+        checks: List[Validator] = []
+
+        for sub in schema.get("allOf") or []:
+            checks.append(self.compile(sub))
+
+        for key in ("anyOf", "oneOf"):
+            variants = [self.compile(sub) for sub in schema.get(key) or []]
+            if not variants:
+                continue
+            exactly_one = key == "oneOf"
+
+            def check_variants(value, path, issues, variants=variants, exactly_one=exactly_one, key=key):
+                matches = 0
+                for variant in variants:
+                    variant_issues: List[ValidationIssue] = []
+                    variant(value, path, variant_issues)
+                    if not variant_issues:
+                        matches += 1
+                        if not exactly_one:
+                            return
+                if matches == 0 or (exactly_one and matches > 1):
+                    issues.append(ValidationIssue(path, f"does not match {key} alternatives"))
+            checks.append(check_variants)
+        return checks
+
+
+def compile_validator(schema: Optional[Dict[str, Any]]) -> Callable[[Any], List[ValidationIssue]]:
+    """
+    Precompilar un validador para un inputSchema
+
+    Args:
+        schema: JSON Schema de la herramienta
+
+    Returns:
+        Función que devuelve la lista de problemas encontrados
+    """
+    validator = _SchemaCompiler(schema or {}).compile(schema or {})
+
+    def validate(value: Any) -> List[ValidationIssue]:
+        issues: List[ValidationIssue] = []
+        validator(value, "$", issues)
+        return issues
+    return validate
+
+
+class ToolArgumentValidator:
+    """Registro de validadores precompilados por herramienta"""
+
+    def __init__(self, repair: bool = True):
+        """
+        Inicializar registro
+
+        Args:
+            repair: Intentar reparar JSON mal formado
+        """
+        self.repair = repair
+        self._validators: Dict[str, Callable[[Any], List[ValidationIssue]]] = {}
+
+        # Estadísticas
+        self.stats = {
+            "validated": 0,
+            "repaired": 0,
+            "rejected": 0
+        }
+
+    def register(self, tool_name: str, schema: Optional[Dict[str, Any]]):
+        """Compilar y registrar el validador de una herramienta"""
+        try:
+            self._validators[tool_name] = compile_validator(schema)
+        except (re.error, TypeError, KeyError):
+            # Esquemas que no sabemos compilar se envían sin validar
+            self._validators.pop(tool_name, None)
+
+    def clear(self):
+        """Eliminar todos los validadores"""
+        self._validators.clear()
+
+    def __contains__(self, tool_name: str) -> bool:
+        return tool_name in self._validators
+
+    def validate(self, tool_name: str, raw_arguments: Optional[str]) -> Tuple[Dict[str, Any], List[ValidationIssue]]:
+        """
+        Parsear, reparar y validar argumentos
+
+        Args:
+            tool_name: Nombre de la herramienta
+            raw_arguments: Argumentos JSON generados por el modelo
+
+        Returns:
+            Tupla (argumentos, problemas). Sin problemas los argumentos pueden enviarse.
+        """
+        self.stats["validated"] += 1
+        try:
+            if self.repair:
+                arguments, repaired = repair_json_arguments(raw_arguments)
+            else:
+                arguments, repaired = json.loads(raw_arguments or "{}"), False
+        except ValueError as e:
+            self.stats["rejected"] += 1
+            return {}, [ValidationIssue("$", f"arguments are not valid JSON: {e}")]
+
+        if repaired:
+            self.stats["repaired"] += 1
+
+        if not isinstance(arguments, dict):
+            self.stats["rejected"] += 1
+            return {}, [ValidationIssue("$", f"expected object, got {type(arguments).__name__}")]
+
+        validator = self._validators.get(tool_name)
+        issues = validator(arguments) if validator else []
+        if issues:
+            self.stats["rejected"] += 1
+        return arguments, issues
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtener estadísticas del validador"""
+        return self.stats.copy()
+
+
+def format_validation_error(tool_name: str, issues: List[ValidationIssue]) -> str:
+    """Formatear errores de validación como contenido de mensaje tool para el modelo"""
+    return json.dumps({
+        "error": "invalid_arguments",
+        "tool": tool_name,
+        "issues": [issue.to_dict() for issue in issues],
+        "hint": "Fix the arguments to match the tool input schema and call the tool again."
+    }, ensure_ascii=False)
@@ -1,6 +1,41 @@
+import atexit
+import json
 import logging
+import queue
 import sys
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, Optional
+
+
+PACKAGE_LOGGER = "deepseek_mcp_client"
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Subsistemas con nivel propio: loggers hijos de deepseek_mcp_client
+SUBSYSTEMS = (
+    "client",      # Ejecución, conexión y herramientas
+    "handlers",    # Notificaciones MCP
+    "mcp_server",  # Logs reenviados por los servidores MCP
+    "progress"     # Progreso de herramientas (enable_progress)
+)
+
+# Niveles de log de MCP (syslog, RFC 5424) a niveles de logging
+MCP_LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "notice": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "alert": logging.CRITICAL,
+    "emergency": logging.CRITICAL
+}
+
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+_DEFERRABLE_ARGS = (str, int, float, bool, type(None))
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_queue_logger: Optional[logging.Logger] = None
 
 
 def setup_logging(
@@ -194,4 +229,136 @@ def setup_colored_logging(level: str = "INFO") -> logging.Logger:
     
     logger.addHandler(handler)
     
-    return logger
\ No newline at end of file
+    return logger
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter que escribe una línea JSON por registro
+
+    Incluye los campos pasados con `extra=` además de timestamp, nivel,
+    logger y mensaje.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que deja el formateo al hilo del QueueListener
+
+    QueueHandler.prepare() formatea el mensaje en el hilo que registra (el del
+    event loop). Aquí solo se resuelve antes si los argumentos son mutables o
+    hay traza de excepción; con argumentos simples el registro viaja tal cual.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if record.exc_info or (args and not all(isinstance(a, _DEFERRABLE_ARGS) for a in (args.values() if isinstance(args, dict) else args))):
+            return super().prepare(record)
+        return record
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    stream=None,
+    handlers: Optional[Iterable[logging.Handler]] = None,
+    subsystems: Optional[Dict[str, str]] = None,
+    logger_name: Optional[str] = PACKAGE_LOGGER
+) -> QueueListener:
+    """
+    Configurar logging estructurado fuera del event loop
+
+    Los registros se encolan con un QueueHandler y un QueueListener en un hilo
+    aparte los formatea y escribe. Llamarla de nuevo sustituye la configuración.
+
+    Args:
+        level: Nivel del logger configurado
+        json_format: Una línea JSON por registro (False = texto como DEFAULT_FORMAT)
+        stream: Destino del StreamHandler por defecto (stdout)
+        handlers: Handlers de destino en lugar del StreamHandler
+        subsystems: Niveles por subsistema, p. ej. {"mcp_server": "WARNING"}
+        logger_name: Logger a configurar (None = logger raíz, incluye librerías externas)
+
+    Returns:
+        QueueListener en marcha
+    """
+    global _listener, _queue_handler, _queue_logger
+    shutdown_logging()
+
+    targets = list(handlers) if handlers else [logging.StreamHandler(stream or sys.stdout)]
+    for handler in targets:
+        if handler.formatter is None:
+            handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(DEFAULT_FORMAT))
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(getattr(logging, level.upper()))
+    if logger_name is not None:
+        # Evita duplicados si la aplicación tiene handlers en el raíz
+        logger.propagate = False
+
+    _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    _queue_logger = logger
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(_queue_handler.queue, *targets, respect_handler_level=True)
+    _listener.start()
+
+    if subsystems:
+        set_subsystem_levels(subsystems)
+    return _listener
+
+
+def ensure_logging(level: str = "INFO"):
+    """
+    Configuración por defecto si la aplicación no ha configurado logging
+
+    Equivale a logging.basicConfig() pero con la cola, y solo actúa una vez
+    por proceso aunque se creen muchos clientes.
+    """
+    if _listener is not None or logging.getLogger().handlers or logging.getLogger(PACKAGE_LOGGER).handlers:
+        return
+    configure_logging(level, json_format=False, logger_name=None)
+
+
+def shutdown_logging():
+    """Vaciar la cola y detener el QueueListener"""
+    global _listener, _queue_handler, _queue_logger
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        _queue_logger.removeHandler(_queue_handler)
+        if _queue_logger.name != "root":
+            _queue_logger.propagate = True
+        _queue_handler = None
+        _queue_logger = None
+
+
+atexit.register(shutdown_logging)
+
+
+def set_subsystem_levels(levels: Dict[str, str]):
+    """
+    Ajustar el nivel de cada subsistema
+
+    Args:
+        levels: Subsistema (ver SUBSYSTEMS) o nombre de logger completo a nivel
+    """
+    for name, level in levels.items():
+        logger_name = name if name.startswith(PACKAGE_LOGGER) else f"{PACKAGE_LOGGER}.{name}"
+        logging.getLogger(logger_name).setLevel(getattr(logging, level.upper()))
@@ -0,0 +1,289 @@
+"""
+Destinos de resultados para lotes de ejecuciones (execute_many)
+
+Los resultados se acumulan en memoria hasta `batch_size` o `flush_interval`
+segundos (con un temporizador del event loop, aunque no lleguen más
+resultados) y se escriben de una vez, de modo que un lote de millones de
+ejecuciones no retiene más que un bloque y una caída pierde como mucho ese
+bloque. Al abrir un archivo existente se leen las execution_id ya completadas
+para reanudar un trabajo interrumpido sin repetirlas.
+"""
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from deepseek_mcp_client.models.client_result import ClientResult
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _repair_tail(path: Path):
+    """Eliminar una última línea a medio escribir (proceso interrumpido)"""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Buscar el último salto de línea hacia atrás en bloques
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step)
+            index = block.rfind(b"\n")
+            if index != -1:
+                f.truncate(position + index + 1)
+                return
+        f.truncate(0)
+
+
+def _iter_json_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class ResultSink(ABC):
+    """
+    Base de los destinos de resultados
+
+    Las subclases implementan `_encode` (resultado a fila del búfer),
+    `_write_batch` (escritura de un bloque) y `_scan_completed` (ids ya
+    escritos en el archivo).
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 50,
+        retry_failed: bool = True,
+        flush_interval: Optional[float] = 1.0
+    ):
+        """
+        Inicializar destino
+
+        Args:
+            path: Archivo de salida (se añade al final si ya existe)
+            batch_size: Resultados acumulados antes de escribir
+            retry_failed: Al reanudar, repetir las ejecuciones que fallaron
+            flush_interval: Segundos máximos que un resultado espera en el búfer (None = solo por tamaño)
+        """
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.retry_failed = retry_failed
+        self.flush_interval = flush_interval
+        self._buffer: List[Any] = []
+        self._buffered_since = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._completed: Optional[Set[str]] = None
+        self._file = None
+
+        # Estadísticas
+        self.stats = {
+            "written": 0,
+            "flushes": 0,
+            "resumed": 0
+        }
+
+    def completed_ids(self) -> Set[str]:
+        """execution_id ya presentes en el destino (las fallidas solo si retry_failed=False)"""
+        if self._completed is None:
+            self._completed = set(self._scan_completed()) if self.path.exists() else set()
+            self.stats["resumed"] = len(self._completed)
+        return self._completed
+
+    def write(self, result: ClientResult):
+        """Añadir un resultado; se escribe al completar un bloque o al vencer flush_interval"""
+        if not self._buffer:
+            self._buffered_since = time.monotonic()
+            self._schedule_flush()
+        self._buffer.append(self._encode(result))
+        if result.success or not self.retry_failed:
+            self.completed_ids().add(result.execution_id)
+        if len(self._buffer) >= self.batch_size or (
+            self.flush_interval is not None and time.monotonic() - self._buffered_since >= self.flush_interval
+        ):
+            self.flush()
+
+    def _schedule_flush(self):
+        """Programar la escritura del búfer al vencer flush_interval aunque no lleguen más resultados"""
+        if self.flush_interval is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fuera de un event loop el intervalo solo se comprueba en cada write()
+            return
+        self._timer = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self):
+        """Escribir los resultados acumulados"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+        self._write_batch(self._buffer)
+        self._file.flush()
+        self.stats["written"] += len(self._buffer)
+        self.stats["flushes"] += 1
+        self._buffer = []
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            _repair_tail(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        """Escribir lo pendiente y cerrar el archivo"""
+        self.flush()
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtener estadísticas del destino"""
+        stats = self.stats.copy()
+        stats["buffered"] = len(self._buffer)
+        return stats
+
+    @abstractmethod
+    def _encode(self, result: ClientResult) -> Any:
+        """Convertir un resultado en una fila del búfer"""
+
+    @abstractmethod
+    def _write_batch(self, rows: List[Any]):
+        """Escribir un bloque de filas en el archivo abierto"""
+
+    @abstractmethod
+    def _scan_completed(self) -> Iterator[str]:
+        """execution_id ya escritas en el archivo"""
+
+
+class JsonlResultSink(ResultSink):
+    """Un ClientResult.to_dict() por línea"""
+
+    def _encode(self, result: ClientResult) -> str:
+        return _dumps(result.to_dict())
+
+    def _write_batch(self, rows: List[str]):
+        self._file.write("\n".join(rows) + "\n")
+
+    def _scan_completed(self) -> Iterator[str]:
+        for entry in _iter_json_lines(self.path):
+            if entry.get("success") or not self.retry_failed:
+                yield entry.get("execution_id")
+
+
+# Columnas del formato columnar
+COLUMNS = (
+    "execution_id",
+    "success",
+    "timestamp",
+    "duration",
+    "model",
+    "tools_used",
+    "tools_count",
+    "prompt_tokens",
+    "completion_tokens",
+    "cost",
+    "cached",
+    "error_type",
+    "error"
+)
+
+
+class ColumnarResultSink(ResultSink):
+    """
+    Formato columnar para análisis: cada línea es un bloque de columnas
+
+    Cada línea tiene la forma {"rows": n, "columns": {"duration": [...], ...}}
+    y se puede cargar directamente con pyarrow.Table.from_pydict o
+    pandas.DataFrame. Los tokens y el coste suman todas las fases de la
+    ejecución. `read_columns` concatena todos los bloques.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 50,
+        retry_failed: bool = True,
+        include_output: bool = False,
+        flush_interval: Optional[float] = 1.0
+    ):
+        """
+        Inicializar destino columnar
+
+        Args:
+            path: Archivo de salida
+            batch_size: Filas por bloque como máximo
+            retry_failed: Al reanudar, repetir las ejecuciones que fallaron
+            include_output: Añadir la columna `output` con la respuesta
+            flush_interval: Segundos máximos que una fila espera en el búfer (None = solo por tamaño)
+        """
+        super().__init__(path, batch_size, retry_failed, flush_interval)
+        self.columns = COLUMNS + (("output",) if include_output else ())
+
+    def _encode(self, result: ClientResult) -> tuple:
+        metadata = result.metadata
+        phases = metadata.get("phases") or ()
+        row = (
+            result.execution_id,
+            result.success,
+            result.timestamp.isoformat(),
+            metadata.get("duration"),
+            metadata.get("model"),
+            list(result.tools_used),
+            len(result.tools_used),
+            sum(p.get("prompt_tokens") or 0 for p in phases),
+            sum(p.get("completion_tokens") or 0 for p in phases),
+            sum(p.get("cost") or 0.0 for p in phases),
+            bool(metadata.get("cached", False)),
+            metadata.get("error_type"),
+            result.error
+        )
+        if len(self.columns) > len(COLUMNS):
+            row += (result.output,)
+        return row
+
+    def _write_batch(self, rows: List[tuple]):
+        columns = {name: list(values) for name, values in zip(self.columns, zip(*rows))}
+        self._file.write(_dumps({"rows": len(rows), "columns": columns}) + "\n")
+
+    def _scan_completed(self) -> Iterator[str]:
+        for block in _iter_json_lines(self.path):
+            columns = block.get("columns", {})
+            for execution_id, success in zip(columns.get("execution_id", ()), columns.get("success", ())):
+                if success or not self.retry_failed:
+                    yield execution_id
+
+
+def read_columns(path: Union[str, Path]) -> Dict[str, List[Any]]:
+    """Leer un archivo de ColumnarResultSink como columnas completas"""
+    merged: Dict[str, List[Any]] = {}
+    for block in _iter_json_lines(Path(path)):
+        for name, values in block.get("columns", {}).items():
+            merged.setdefault(name, []).extend(values)
+    return merged
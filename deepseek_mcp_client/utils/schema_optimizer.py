@@ -0,0 +1,212 @@
+"""
+Minificación de esquemas JSON de herramientas MCP
+"""
+import copy
+import json
+from typing import Any, Dict, Optional, Set
+
+# Palabras clave que no aportan al modelo y solo consumen tokens
+DEFAULT_STRIP_KEYWORDS = frozenset({
+    "title",
+    "examples",
+    "example",
+    "$schema",
+    "$id",
+    "$comment",
+    "readOnly",
+    "writeOnly",
+    "deprecated",
+})
+
+_REF_PREFIXES = ("#/$defs/", "#/definitions/")
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimar tokens de un valor serializado (aprox. 4 caracteres por token)
+
+    Args:
+        value: Valor serializable a JSON
+
+    Returns:
+        Número estimado de tokens
+    """
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return (len(text) + 3) // 4
+
+
+def tool_input_schema(tool: Any) -> Optional[Dict[str, Any]]:
+    """Esquema de entrada de una herramienta MCP (input_schema en el SDK v2, inputSchema antes)"""
+    if hasattr(tool, "input_schema"):
+        return tool.input_schema
+    return getattr(tool, "inputSchema", None)
+
+
+def trim_description(text: str, budget: Optional[int]) -> str:
+    """Recortar una descripción al presupuesto de caracteres, respetando palabras"""
+    text = " ".join(text.split())
+    if budget is None or len(text) <= budget:
+        return text
+    cut = text[:budget].rsplit(" ", 1)[0] or text[:budget]
+    return cut.rstrip(" ,;:.") + "…"
+
+
+class SchemaOptimizer:
+    """
+    Reduce el tamaño de los inputSchema enviados al modelo.
+
+    - Elimina palabras clave no esenciales (title, examples, ...)
+    - Inserta en línea los `$ref` locales y descarta `$defs`
+    - Recorta descripciones de propiedades a un presupuesto
+    - Colapsa uniones `anyOf` con `null` generadas para campos opcionales
+    """
+
+    def __init__(
+        self,
+        description_budget: Optional[int] = 200,
+        strip_keywords: Optional[Set[str]] = None,
+        max_ref_depth: int = 8
+    ):
+        """
+        Inicializar optimizador
+
+        Args:
+            description_budget: Máximo de caracteres por descripción (None = sin límite)
+            strip_keywords: Palabras clave a eliminar
+            max_ref_depth: Profundidad máxima al insertar referencias recursivas
+        """
+        self.description_budget = description_budget
+        self.strip_keywords = frozenset(strip_keywords) if strip_keywords is not None else DEFAULT_STRIP_KEYWORDS
+        self.max_ref_depth = max_ref_depth
+
+        # Estadísticas
+        self.stats = {
+            "schemas_optimized": 0,
+            "original_tokens": 0,
+            "optimized_tokens": 0
+        }
+
+    def optimize(self, schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Optimizar un esquema sin modificar el original
+
+        Args:
+            schema: inputSchema de la herramienta
+
+        Returns:
+            Esquema optimizado
+        """
+        if not schema:
+            return {"type": "object", "properties": {}}
+
+        defs = {}
+        defs.update(schema.get("definitions") or {})
+        defs.update(schema.get("$defs") or {})
+
+        optimized = self._optimize_node(schema, defs, set(), 0, is_root=True)
+        original_tokens = estimate_tokens(schema)
+        optimized_tokens = estimate_tokens(optimized)
+
+        # Insertar definiciones muy reutilizadas puede crecer el esquema
+        if optimized_tokens > original_tokens:
+            optimized, optimized_tokens = schema, original_tokens
+
+        self.stats["schemas_optimized"] += 1
+        self.stats["original_tokens"] += original_tokens
+        self.stats["optimized_tokens"] += optimized_tokens
+        return optimized
+
+    def optimize_tool(self, tool: Dict[str, Any]) -> Dict[str, Any]:
+        """Optimizar una definición de herramienta en formato DeepSeek"""
+        optimized = copy.copy(tool)
+        function = dict(tool["function"])
+        function["parameters"] = self.optimize(function.get("parameters"))
+        optimized["function"] = function
+        return optimized
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens ahorrados acumulados"""
+        return self.stats["original_tokens"] - self.stats["optimized_tokens"]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtener estadísticas del optimizador"""
+        stats = self.stats.copy()
+        stats["tokens_saved"] = self.tokens_saved
+        return stats
+
+    def reset_stats(self):
+        """Resetear estadísticas"""
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def _resolve_ref(self, ref: str, defs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Resolver una referencia local"""
+        for prefix in _REF_PREFIXES:
+            if ref.startswith(prefix):
+                return defs.get(ref[len(prefix):])
+        return None
+
+    def _optimize_node(self, node: Any, defs: Dict[str, Any], resolving: Set[str], depth: int, is_root: bool = False) -> Any:
+        """Optimizar recursivamente un nodo del esquema"""
+        if isinstance(node, list):
+            return [self._optimize_node(item, defs, resolving, depth) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            target = self._resolve_ref(ref, defs)
+            if target is not None and ref not in resolving and depth < self.max_ref_depth:
+                merged = {k: v for k, v in node.items() if k != "$ref"}
+                resolved = self._optimize_node(target, defs, resolving | {ref}, depth + 1)
+                if isinstance(resolved, dict):
+                    resolved = {**resolved, **self._optimize_node(merged, defs, resolving, depth)}
+                return resolved
+            # Referencia recursiva o externa: se sustituye por un objeto genérico
+            if target is not None:
+                return {"type": target.get("type", "object")}
+
+        result: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key in self.strip_keywords or key in ("$defs", "definitions"):
+                continue
+            if key in ("default", "enum", "const"):
+                # Valores literales: se copian tal cual
+                result[key] = value
+                continue
+            if key == "description" and isinstance(value, str):
+                # La descripción raíz duplica la descripción de la herramienta
+                if is_root:
+                    continue
+                trimmed = trim_description(value, self.description_budget)
+                if trimmed:
+                    result[key] = trimmed
+                continue
+            if key == "properties" and isinstance(value, dict):
+                # Los nombres de propiedades no son palabras clave: no se filtran
+                result[key] = {
+                    name: self._optimize_node(prop, defs, resolving, depth)
+                    for name, prop in value.items()
+                }
+                continue
+            result[key] = self._optimize_node(value, defs, resolving, depth)
+
+        return self._collapse_nullable(result)
+
+    @staticmethod
+    def _collapse_nullable(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Colapsar `anyOf: [X, {"type": "null"}]` en X"""
+        for key in ("anyOf", "oneOf"):
+            variants = node.get(key)
+            if not isinstance(variants, list):
+                continue
+            non_null = [v for v in variants if v != {"type": "null"}]
+            if len(non_null) == 1 and isinstance(non_null[0], dict):
+                collapsed = {k: v for k, v in node.items() if k != key}
+                if node.get("default", ...) is None:
+                    collapsed.pop("default")
+                for inner_key, inner_value in non_null[0].items():
+                    collapsed.setdefault(inner_key, inner_value)
+                return collapsed
+        return node
@@ -0,0 +1,405 @@
+"""
+Grabación y reproducción de ejecuciones para pruebas de rendimiento deterministas
+
+TraceRecorder captura peticiones/respuestas de chat, tráfico list_tools/call_tool
+y tiempos de cada execute() en un archivo JSONL (o msgpack si está instalado y la
+extensión es .msgpack). TraceReplayer conecta un DeepSeekClient a esa traza con
+la latencia original o sin latencia, sin tocar la red.
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from openai.types.chat import ChatCompletion
+
+from deepseek_mcp_client.models.server_config import MCPServerConfig
+from deepseek_mcp_client.utils.schema_optimizer import tool_input_schema
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+TRACE_VERSION = 1
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(_canonical(value).encode("utf-8")).hexdigest()[:16]
+
+
+def _chat_key(chat_params: Dict[str, Any]) -> str:
+    """Clave de emparejamiento de peticiones chat (sin el bloque de herramientas)"""
+    return _digest({"model": chat_params.get("model"), "messages": chat_params.get("messages")})
+
+
+def _dump_response(response: Any) -> Any:
+    if hasattr(response, "model_dump"):
+        return response.model_dump(mode="json", exclude_none=True)
+    return response
+
+
+def _dump_tool(tool: Any) -> Dict[str, Any]:
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "inputSchema": tool_input_schema(tool)
+    }
+
+
+class _TraceWriter:
+    """Escritura incremental de eventos en JSONL o msgpack"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.binary = self.path.suffix == ".msgpack"
+        if self.binary and msgpack is None:
+            raise ImportError("msgpack is required for .msgpack traces (pip install msgpack)")
+        self._file = open(self.path, "wb" if self.binary else "w", encoding=None if self.binary else "utf-8")
+
+    def write(self, event: Dict[str, Any]):
+        if self.binary:
+            self._file.write(msgpack.packb(event, default=str))
+        else:
+            self._file.write(json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_trace(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Leer todos los eventos de una traza"""
+    path = Path(path)
+    if path.suffix == ".msgpack":
+        if msgpack is None:
+            raise ImportError("msgpack is required for .msgpack traces (pip install msgpack)")
+        with open(path, "rb") as f:
+            return list(msgpack.Unpacker(f, raw=False))
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TraceRecorder:
+    """Graba la interacción completa de un DeepSeekClient"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Inicializar grabador
+
+        Args:
+            path: Archivo de salida (.jsonl o .msgpack)
+        """
+        self.path = Path(path)
+        self._writer: Optional[_TraceWriter] = None
+        self._origin = time.perf_counter()
+        self._server_index = 0
+        self.events_written = 0
+
+    def _emit(self, event: Dict[str, Any]):
+        event["t"] = round(time.perf_counter() - self._origin, 6)
+        self._writer.write(event)
+        self.events_written += 1
+
+    def attach(self, client) -> "TraceRecorder":
+        """
+        Instrumentar un cliente. Debe llamarse antes de conectar a los servidores.
+
+        Args:
+            client: DeepSeekClient a grabar
+        """
+        self._writer = _TraceWriter(self.path)
+        self._emit({
+            "type": "header",
+            "version": TRACE_VERSION,
+            "model": client.model,
+            "system_prompt": client.system_prompt,
+            "servers": [client._parse_server_config(s).to_dict() for s in client.mcp_servers]
+        })
+
+        recorder = self
+        original_chat = client._create_chat_completion
+        original_create_client = client._create_client
+        original_execute = client.execute
+
+        async def recorded_chat(chat_params: Dict[str, Any]):
+            start = time.perf_counter()
+            response = await original_chat(chat_params)
+            recorder._emit({
+                "type": "chat",
+                "key": _chat_key(chat_params),
+                "duration": time.perf_counter() - start,
+                "request": {k: v for k, v in chat_params.items() if k != "tools"},
+                "tools_digest": _digest(chat_params["tools"]) if chat_params.get("tools") else None,
+                "response": _dump_response(response)
+            })
+            return response
+
+        def recorded_create_client(config: MCPServerConfig):
+            mcp_client = original_create_client(config)
+            server = recorder._server_index
+            recorder._server_index += 1
+            recorder._instrument_mcp_client(client, mcp_client, server)
+            return mcp_client
+
+        async def recorded_execute(instruction: str, *args, **kwargs):
+            start = time.perf_counter()
+            result = await original_execute(instruction, *args, **kwargs)
+            recorder._emit({
+                "type": "execute",
+                "instruction": instruction,
+                "execution_id": result.execution_id,
+                "success": result.success,
+                "tools_used": result.tools_used,
+                "duration": time.perf_counter() - start
+            })
+            recorder._writer.flush()
+            return result
+
+        client._create_chat_completion = recorded_chat
+        client._create_client = recorded_create_client
+        client.execute = recorded_execute
+        return self
+
+    def _instrument_mcp_client(self, client, mcp_client, server: int):
+        """Envolver list_tools y call_tool de un cliente FastMCP"""
+        recorder = self
+        original_list_tools = mcp_client.list_tools
+        original_call_tool = mcp_client.call_tool
+
+        async def recorded_list_tools(*args, **kwargs):
+            start = time.perf_counter()
+            tools = await original_list_tools(*args, **kwargs)
+            recorder._emit({
+                "type": "list_tools",
+                "server": server,
+                "duration": time.perf_counter() - start,
+                "tools": [_dump_tool(tool) for tool in tools]
+            })
+            return tools
+
+        async def recorded_call_tool(name, arguments=None, *args, **kwargs):
+            start = time.perf_counter()
+            event = {"type": "call_tool", "server": server, "name": name, "arguments": arguments or {}}
+            try:
+                result = await original_call_tool(name, arguments, *args, **kwargs)
+            except Exception as e:
+                event.update(duration=time.perf_counter() - start, error=str(e))
+                recorder._emit(event)
+                raise
+            event.update(duration=time.perf_counter() - start, result=client._format_tool_result(result, name))
+            recorder._emit(event)
+            return result
+
+        mcp_client.list_tools = recorded_list_tools
+        mcp_client.call_tool = recorded_call_tool
+
+    def close(self):
+        """Cerrar el archivo de traza"""
+        if self._writer:
+            self._writer.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ReplayMismatchError(LookupError):
+    """La petición no está en la traza"""
+
+
+class _ReplayMCPClient:
+    """Cliente MCP falso que responde desde la traza"""
+
+    def __init__(self, replayer: "TraceReplayer", server: int):
+        self._replayer = replayer
+        self._server = server
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def ping(self):
+        return True
+
+    async def list_tools(self):
+        event = self._replayer._next_list_tools(self._server)
+        await self._replayer._wait(event)
+        return [SimpleNamespace(**tool) for tool in event["tools"]]
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        event = self._replayer._next_call_tool(self._server, name, arguments or {})
+        await self._replayer._wait(event)
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        return event["result"]
+
+
+class TraceReplayer:
+    """Reproduce una traza contra un DeepSeekClient"""
+
+    def __init__(self, events: List[Dict[str, Any]], latency: str = "zero"):
+        """
+        Inicializar reproductor
+
+        Args:
+            events: Eventos leídos con read_trace
+            latency: 'original' para respetar duraciones grabadas, 'zero' para omitirlas
+        """
+        if latency not in ("original", "zero"):
+            raise ValueError("latency must be 'original' or 'zero'")
+        self.latency = latency
+        self.events = events
+        self.header = next((e for e in events if e.get("type") == "header"), {})
+
+        self._chat: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._chat_order: Deque[Dict[str, Any]] = deque()
+        self._list_tools: Dict[int, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._call_tool: Dict[Any, Deque[Dict[str, Any]]] = defaultdict(deque)
+        for event in events:
+            kind = event.get("type")
+            if kind == "chat":
+                self._chat[event["key"]].append(event)
+                self._chat_order.append(event)
+            elif kind == "list_tools":
+                self._list_tools[event["server"]].append(event)
+            elif kind == "call_tool":
+                self._call_tool[(event["server"], event["name"], _canonical(event["arguments"]))].append(event)
+
+        # Estadísticas
+        self.stats = {"chat_replayed": 0, "tools_replayed": 0, "mismatches": 0}
+
+    @classmethod
+    def load(cls, path: Union[str, Path], latency: str = "zero") -> "TraceReplayer":
+        """Cargar una traza desde archivo"""
+        return cls(read_trace(path), latency=latency)
+
+    @property
+    def instructions(self) -> List[str]:
+        """Instrucciones grabadas, en orden"""
+        return [e["instruction"] for e in self.events if e.get("type") == "execute"]
+
+    async def _wait(self, event: Dict[str, Any]):
+        if self.latency == "original" and event.get("duration"):
+            await asyncio.sleep(event["duration"])
+
+    def _next_chat(self, chat_params: Dict[str, Any]) -> Dict[str, Any]:
+        queue = self._chat.get(_chat_key(chat_params))
+        if queue:
+            event = queue.popleft() if len(queue) > 1 else queue[0]
+        elif self._chat_order:
+            # Sin coincidencia exacta: se usa la siguiente respuesta en orden
+            self.stats["mismatches"] += 1
+            event = self._chat_order[0]
+            self._chat_order.rotate(-1)
+        else:
+            raise ReplayMismatchError("Trace contains no chat responses")
+        self.stats["chat_replayed"] += 1
+        return event
+
+    def _next_list_tools(self, server: int) -> Dict[str, Any]:
+        queue = self._list_tools.get(server)
+        if not queue:
+            raise ReplayMismatchError(f"No list_tools recorded for server {server}")
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def _next_call_tool(self, server: int, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        queue = self._call_tool.get((server, name, _canonical(arguments)))
+        if not queue:
+            queue = next((q for (s, n, _), q in self._call_tool.items() if s == server and n == name), None)
+            self.stats["mismatches"] += 1
+        if not queue:
+            raise ReplayMismatchError(f"No call_tool recorded for {name} on server {server}")
+        self.stats["tools_replayed"] += 1
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def server_configs(self) -> List[MCPServerConfig]:
+        """Configuraciones de servidor equivalentes a las grabadas (no se lanzan)"""
+        configs = []
+        for server in self.header.get("servers", []):
+            configs.append(MCPServerConfig(
+                name=server.get("name"),
+                transport_type=server.get("transport_type"),
+                url=server.get("url"),
+                command=server.get("command"),
+                args=server.get("args"),
+                timeout=server.get("timeout"),
+                description=server.get("description")
+            ))
+        return configs
+
+    def attach(self, client) -> "TraceReplayer":
+        """
+        Conectar un cliente a la traza: chat y herramientas se responden desde ella
+
+        Args:
+            client: DeepSeekClient a reproducir
+        """
+        replayer = self
+        servers = itertools.count()
+
+        async def replay_chat(chat_params: Dict[str, Any]):
+            event = replayer._next_chat(chat_params)
+            await replayer._wait(event)
+            return ChatCompletion.model_validate(event["response"])
+
+        def replay_create_client(config: MCPServerConfig):
+            return _ReplayMCPClient(replayer, next(servers))
+
+        client._create_chat_completion = replay_chat
+        client._create_client = replay_create_client
+        return self
+
+    def create_client(self, **kwargs):
+        """
+        Crear un DeepSeekClient conectado a la traza
+
+        Args:
+            **kwargs: Argumentos adicionales para DeepSeekClient
+        """
+        from deepseek_mcp_client.client.deepseek_client import DeepSeekClient
+
+        # La reproducción no llama a la API; basta con una clave ficticia
+        os.environ.setdefault("DEEPSEEK_API_KEY", "replay")
+        kwargs.setdefault("model", self.header.get("model", "deepseek-chat"))
+        kwargs.setdefault("system_prompt", self.header.get("system_prompt"))
+        kwargs.setdefault("mcp_servers", self.server_configs())
+        client = DeepSeekClient(**kwargs)
+        self.attach(client)
+        return client
+
+    async def replay_executions(self, client, concurrency: int = 1) -> List[Any]:
+        """
+        Reejecutar las instrucciones grabadas
+
+        Args:
+            client: Cliente conectado con attach()
+            concurrency: Ejecuciones simultáneas
+
+        Returns:
+            Lista de ClientResult en el orden grabado
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(instruction: str):
+            async with semaphore:
+                return await client.execute(instruction)
+
+        return await asyncio.gather(*(run(instruction) for instruction in self.instructions))
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient, ClientResult
+from deepseek_mcp_client.cache import CompletionCache, MemoryCacheBackend, DiskCacheBackend, make_cache_key
+from deepseek_mcp_client.cache.completion_cache import CacheEntry
+
+
+def make_result(output="hola", success=True):
+    return ClientResult(
+        output=output,
+        success=success,
+        execution_id="orig",
+        timestamp=datetime.now(),
+        tools_used=["add"],
+        metadata={"model": "deepseek-chat"}
+    )
+
+
+class TestCacheKey:
+
+    def test_whitespace_normalized(self):
+        """Test que las diferencias de espacios no cambian la clave"""
+        a = make_cache_key("m", [{"role": "user", "content": "Suma  2 y 3 "}], "t", {"temperature": 0.7})
+        b = make_cache_key("m", [{"role": "user", "content": "Suma 2 y 3"}], "t", {"temperature": 0.7})
+        assert a == b
+
+    @pytest.mark.parametrize("change", [
+        {"model": "other"},
+        {"tools": "t2"},
+        {"sampling": {"temperature": 0.1}},
+    ])
+    def test_key_components(self, change):
+        """Test que modelo, herramientas y muestreo forman parte de la clave"""
+        base = {"model": "m", "tools": "t", "sampling": {"temperature": 0.7}}
+        changed = {**base, **change}
+        messages = [{"role": "user", "content": "hola"}]
+        assert make_cache_key(base["model"], messages, base["tools"], base["sampling"]) != \
+            make_cache_key(changed["model"], messages, changed["tools"], changed["sampling"])
+
+
+class TestBackends:
+
+    def test_memory_lru_eviction(self):
+        """Test expulsión LRU por número de entradas"""
+        backend = MemoryCacheBackend(max_entries=2)
+        for key in ("a", "b"):
+            backend.set(key, CacheEntry({"k": key}, None, 10))
+        backend.get("a")
+        backend.set("c", CacheEntry({"k": "c"}, None, 10))
+
+        assert backend.get("b") is None
+        assert backend.get("a") is not None
+        assert backend.evictions == 1
+
+    def test_memory_byte_limit_and_ttl(self):
+        """Test límite de bytes y expiración"""
+        backend = MemoryCacheBackend(max_bytes=15)
+        backend.set("a", CacheEntry({}, None, 10))
+        backend.set("b", CacheEntry({}, None, 10))
+        backend.set("old", CacheEntry({}, time.time() - 1, 1))
+
+        assert backend.get("a") is None
+        assert backend.get("old") is None
+        assert len(backend) == 1
+
+    def test_disk_roundtrip_and_eviction(self, tmp_path):
+        """Test persistencia en disco y expulsión"""
+        backend = DiskCacheBackend(tmp_path, max_entries=1)
+        backend.set("a", CacheEntry({"output": "x"}, None, 0))
+        assert DiskCacheBackend(tmp_path).get("a").value == {"output": "x"}
+
+        backend.set("b", CacheEntry({"output": "y"}, None, 0))
+        assert len(backend) == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_async_without_rescanning(self, tmp_path):
+        """Test que load/save van en un hilo y la expulsión usa el índice en memoria"""
+        backend = DiskCacheBackend(tmp_path, max_entries=2)
+        with patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread, \
+                patch.object(type(tmp_path), "glob", side_effect=AssertionError("directory rescanned")):
+            await backend.save("a", CacheEntry({"output": "a"}, None, 0))
+            await backend.save("b", CacheEntry({"output": "b"}, None, 0))
+            assert (await backend.load("a")).value == {"output": "a"}
+            await backend.save("c", CacheEntry({"output": "c"}, None, 0))
+            assert to_thread.call_count >= 4
+
+        assert await backend.load("b") is None
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+        assert backend.evictions == 1
+        # Un reinicio recupera el orden y el tamaño desde el disco
+        assert len(DiskCacheBackend(tmp_path)) == 2
+
+    def test_disk_eviction_tolerates_missing_files(self, tmp_path):
+        """Test que un archivo borrado por otro proceso no rompe la expulsión"""
+        backend = DiskCacheBackend(tmp_path, max_entries=1)
+        backend.set("a", CacheEntry({"output": "x"}, None, 0))
+        (tmp_path / "a.json").unlink()
+
+        backend.set("b", CacheEntry({"output": "y"}, None, 0))
+        assert backend.get("a") is None
+        assert backend.get("b").value == {"output": "y"}
+        assert len(backend) == 1
+
+
+class TestCompletionCache:
+
+    @pytest.mark.asyncio
+    async def test_hit_marks_metadata(self):
+        """Test que un acierto devuelve el resultado marcado como cacheado"""
+        cache = CompletionCache()
+        compute = AsyncMock(return_value=make_result())
+
+        first = await cache.get_or_compute("k", compute, "e1", datetime.now())
+        second = await cache.get_or_compute("k", compute, "e2", datetime.now())
+
+        compute.assert_awaited_once()
+        assert "cached" not in first.metadata
+        assert second.metadata["cached"] is True
+        assert second.metadata["cached_execution_id"] == "orig"
+        assert second.execution_id == "e2"
+        assert second.output == "hola"
+        assert cache.get_stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self):
+        """Test que los errores no se almacenan"""
+        cache = CompletionCache()
+        compute = AsyncMock(return_value=make_result(success=False))
+
+        await cache.get_or_compute("k", compute, "e1", datetime.now())
+        await cache.get_or_compute("k", compute, "e2", datetime.now())
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stampede_protection(self):
+        """Test que peticiones concurrentes con la misma clave calculan una sola vez"""
+        cache = CompletionCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return make_result()
+
+        results = await asyncio.gather(*(
+            cache.get_or_compute("k", compute, f"e{i}", datetime.now()) for i in range(5)
+        ))
+
+        assert calls == 1
+        assert all(r.success and r.output == "hola" for r in results)
+        assert cache.get_stats()["coalesced"] == 4
+
+
+class TestClientIntegration:
+
+    @pytest.mark.asyncio
+    async def test_execute_uses_cache_and_bypass(self, monkeypatch):
+        """Test que execute() usa el cache y respeta use_cache=False"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        response = MagicMock()
+        response.choices[0].message.content = "respuesta"
+        response.choices[0].message.tool_calls = None
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", completion_cache=CompletionCache())
+
+            with patch.object(DeepSeekClient, "_execute_initial_call", new_callable=AsyncMock) as mock_call:
+                mock_call.return_value = response
+                first = await client.execute("Hola")
+                cached = await client.execute("  Hola ")
+                bypass = await client.execute("Hola", use_cache=False)
+
+        assert mock_call.await_count == 2
+        assert cached.metadata["cached"] is True
+        assert "cached" not in first.metadata and "cached" not in bypass.metadata
+        assert client.get_stats()["completion_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_registry_changes_key(self, monkeypatch):
+        """Test que cambiar las herramientas invalida la clave"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", completion_cache=CompletionCache())
+            before = client._completion_cache_key("Hola")
+            client.all_tools = [{"type": "function", "function": {"name": "add", "parameters": {}}}]
+            after = client._completion_cache_key("Hola")
+
+        assert before != after
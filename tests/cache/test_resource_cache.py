@@ -0,0 +1,42 @@
+from deepseek_mcp_client.cache.resource_cache import ResourceCache, RESOURCES, PROMPTS
+
+
+class TestResourceCache:
+
+    def test_hit_until_version_bump(self):
+        """Test que un aviso del servidor invalida solo su familia"""
+        cache = ResourceCache()
+        cache.put("s1", RESOURCES, "data://a", "A")
+        cache.put("s1", PROMPTS, "p", ["m"])
+        cache.put("s2", RESOURCES, "data://a", "B")
+
+        cache.bump("s1", RESOURCES)
+
+        assert cache.get("s1", RESOURCES, "data://a") is None
+        assert cache.get("s1", PROMPTS, "p") == ["m"]
+        assert cache.get("s2", RESOURCES, "data://a") == "B"
+
+    def test_read_racing_notification_is_stale(self):
+        """Test que un contenido leído antes de un aviso no queda vigente"""
+        cache = ResourceCache()
+        version = cache.version("s1", RESOURCES)
+        cache.bump("s1", RESOURCES)
+        cache.put("s1", RESOURCES, "data://a", "viejo", version)
+
+        assert cache.get("s1", RESOURCES, "data://a") is None
+
+    def test_ttl_and_lru(self, monkeypatch):
+        """Test expiración por ttl y expulsión LRU"""
+        now = [100.0]
+        monkeypatch.setattr("deepseek_mcp_client.cache.resource_cache.time.monotonic", lambda: now[0])
+        cache = ResourceCache(max_entries=2, ttl=10)
+        cache.put("s", RESOURCES, "a", 1)
+        cache.put("s", RESOURCES, "b", 2)
+        cache.get("s", RESOURCES, "a")
+        cache.put("s", RESOURCES, "c", 3)
+
+        assert cache.get("s", RESOURCES, "b") is None
+        assert cache.get("s", RESOURCES, "a") == 1
+        now[0] += 11
+        assert cache.get("s", RESOURCES, "c") is None
+        assert cache.get_stats()["evictions"] == 1
@@ -0,0 +1,138 @@
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.cache import SemanticCache, HashedNgramEmbedder
+from deepseek_mcp_client.cache import semantic_cache
+from deepseek_mcp_client.cache.semantic_cache import key_tokens
+
+
+STORED = {"output": "Soleado", "execution_id": "orig", "tools_used": ["weather"], "metadata": {}}
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Ejecutar cada test con la similitud en Python puro y con NumPy"""
+    if request.param == "numpy":
+        monkeypatch.setattr(semantic_cache, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(semantic_cache, "np", None)
+    return request.param
+
+
+class TestHashedNgramEmbedder:
+
+    def test_deterministic(self):
+        """Test que el vector no depende del proceso"""
+        embedder = HashedNgramEmbedder(dimensions=64)
+        assert embedder("hola mundo") == embedder("hola mundo")
+        assert len(embedder("hola mundo")) == 64
+
+    def test_fillers_ignored(self):
+        """Test que las fórmulas de cortesía no cambian el vector"""
+        embedder = HashedNgramEmbedder()
+        assert embedder("orders for customer 42 right now, please") == embedder("orders for customer 42")
+        assert HashedNgramEmbedder(fillers=())("now") != embedder("now")
+
+    def test_key_tokens(self):
+        """Test que los números y nombres propios son claves exactas"""
+        assert key_tokens("Orders for customer 42") == {"42"}
+        assert key_tokens("What is the weather in Madrid? Tell me now") == {"madrid"}
+        assert key_tokens("list open invoices") == frozenset()
+
+
+@pytest.mark.usefixtures("backend")
+class TestSemanticCache:
+
+    def test_paraphrase_hit_and_distinct_miss(self):
+        """Test que una paráfrasis acierta y una pregunta distinta no"""
+        cache = SemanticCache(threshold=0.9)
+        cache.store("p", "What is the weather in Madrid today?", STORED)
+
+        match = cache.lookup("p", "what's the weather in Madrid today")
+        assert match is not None and match[0] == STORED
+        assert cache.lookup("p", "What is the weather in Paris today?") is None
+
+    def test_different_ids_never_hit(self):
+        """Test que instrucciones iguales salvo el id no comparten respuesta"""
+        cache = SemanticCache()
+        cache.store("p", "show me the open orders for customer 42", STORED)
+
+        # Similitud por encima del umbral (0.93) pero otro cliente
+        assert cache.lookup("p", "show me the open orders for customer 43") is None
+        assert cache.lookup("p", "show me the open orders for customer 420") is None
+        assert cache.get_stats()["key_mismatches"] == 2
+
+    def test_paraphrase_with_filler_hits(self):
+        """Test que una paráfrasis con el mismo id acierta"""
+        cache = SemanticCache()
+        cache.store("p", "show me the open orders for customer 43", {**STORED, "output": "otro"})
+        cache.store("p", "show me the open orders for customer 42", STORED)
+
+        match = cache.lookup("p", "show me the open orders for customer 42 right now")
+        assert match is not None and match[0] == STORED
+        assert cache.lookup("p", "Please show me the open orders for customer 43")[0]["output"] == "otro"
+
+    def test_partitions_never_cross(self):
+        """Test que respuestas de otro registro de herramientas no se reutilizan"""
+        cache = SemanticCache()
+        cache.store("tools-a", "Suma 2 y 3", STORED)
+
+        assert cache.lookup("tools-b", "Suma 2 y 3") is None
+        assert cache.lookup("tools-a", "Suma 2 y 3") is not None
+
+    def test_capacity_eviction(self):
+        """Test expulsión de la entrada menos usada al superar la capacidad"""
+        cache = SemanticCache(capacity=2)
+        cache.store("p", "first question about invoices", STORED)
+        cache.store("q", "second question about tickets", STORED)
+        cache.lookup("p", "first question about invoices")
+        cache.store("p", "third question about users", STORED)
+
+        assert len(cache) == 2
+        assert cache.lookup("q", "second question about tickets") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_slot_reuse(self):
+        """Test que los huecos liberados se reutilizan"""
+        cache = SemanticCache(capacity=1)
+        for i in range(5):
+            cache.store("p", f"question number {i}", {**STORED, "output": str(i)})
+
+        assert cache.lookup("p", "question number 4")[0]["output"] == "4"
+        assert cache._partitions["p"].size == 1
+
+    def test_custom_embedder(self):
+        """Test función de embedding personalizada"""
+        cache = SemanticCache(embedder=lambda text: [1.0, float(len(text))], threshold=0.999)
+        cache.store("p", "abc", STORED)
+        assert cache.lookup("p", "xyz") is not None
+
+
+class TestClientIntegration:
+
+    @pytest.mark.asyncio
+    async def test_execute_semantic_hit(self, monkeypatch):
+        """Test que execute() responde paráfrasis desde el cache semántico"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        response = MagicMock()
+        response.choices[0].message.content = "Soleado"
+        response.choices[0].message.tool_calls = None
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", semantic_cache=SemanticCache())
+
+            with patch.object(DeepSeekClient, "_execute_initial_call", new_callable=AsyncMock) as mock_call:
+                mock_call.return_value = response
+                await client.execute("What is the weather in Madrid today?")
+                hit = await client.execute("what's the weather in Madrid today")
+
+                client.all_tools = [{"type": "function", "function": {"name": "weather", "parameters": {}}}]
+                miss = await client.execute("what's the weather in Madrid today")
+
+        assert hit.metadata["cached"] is True
+        assert hit.metadata["cache_layer"] == "semantic"
+        assert hit.output == "Soleado"
+        assert "cached" not in miss.metadata
+        assert mock_call.await_count == 2
@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
+
+from deepseek_mcp_client import DeepSeekClient
+
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_tool_call(name, call_id="call_1"):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments='{"query": "x"}'))
+
+
+class NotificationRecorder(Middleware):
+    """Registra las notificaciones que recibe el servidor"""
+
+    def __init__(self, received):
+        self.received = received
+
+    async def on_notification(self, context, call_next):
+        self.received.append(context.method)
+        return await call_next(context)
+
+
+class SlowServer:
+    """Servidor con una herramienta lenta que registra si se canceló"""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = asyncio.Event()
+        self.notifications = []
+        self.server = FastMCP("Slow")
+        self.server.add_middleware(NotificationRecorder(self.notifications))
+
+        @self.server.tool
+        async def scrape(query: str) -> str:
+            """Herramienta lenta"""
+            self.started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled.set()
+                raise
+            return "done"
+
+        @self.server.tool
+        def quick(query: str) -> str:
+            """Herramienta rápida"""
+            return "ok"
+
+
+@pytest.fixture
+def slow():
+    return SlowServer()
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+    def factory(server_config, **kwargs):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            return DeepSeekClient(model="deepseek-chat", mcp_servers=[server_config], **kwargs)
+
+    return factory
+
+
+class TestToolTimeouts:
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout_cancels_server_call(self, make_client, slow):
+        """Test que el timeout por herramienta devuelve un error al modelo y cancela en el servidor"""
+        client = make_client(slow.server, tool_timeouts={"scrape": 0.2})
+
+        with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+            mock_completion.side_effect = [make_response(tool_calls=[make_tool_call("scrape")]), make_response(content="fin")]
+            result = await asyncio.wait_for(client.execute("busca"), timeout=5)
+
+        assert result.success
+        tool_message = mock_completion.call_args_list[1].args[0]["messages"][-1]
+        assert "timed out after 0.2s" in tool_message["content"]
+        await asyncio.wait_for(slow.cancelled.wait(), timeout=2)
+        # La cancelación llega como notificación, no solo al cerrar la sesión
+        assert "notifications/cancelled" in slow.notifications
+        assert client.get_stats()["cancellation"]["tool_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_server_config_tool_timeouts(self, make_client, slow):
+        """Test timeouts declarados en la configuración del servidor"""
+        client = make_client({"fastmcp_instance": slow.server, "tool_timeouts": {"scrape": 0.1}})
+        await client._ensure_tools_ready()
+        mcp_client = client.tool_to_client["scrape"]
+
+        assert client._tool_timeout("scrape", mcp_client) == 0.1
+        assert client._tool_timeout("quick", mcp_client) is None
+
+        client.tool_timeouts["scrape"] = 2.0
+        assert client._tool_timeout("scrape", mcp_client) == 2.0
+
+
+class TestCancellation:
+
+    async def start(self, client, slow, **kwargs):
+        mock_completion = AsyncMock(return_value=make_response(tool_calls=[make_tool_call("scrape")]))
+        patcher = patch.object(DeepSeekClient, "_create_chat_completion", mock_completion)
+        patcher.start()
+        task = asyncio.create_task(client.execute("busca", **kwargs))
+        await asyncio.wait_for(slow.started.wait(), timeout=5)
+        return task, patcher
+
+    @pytest.mark.asyncio
+    async def test_cancel_execution(self, make_client, slow):
+        """Test que cancel() detiene la ejecución y la herramienta en vuelo"""
+        client = make_client(slow.server)
+        task, patcher = await self.start(client, slow, execution_id="job-1")
+        try:
+            assert client.cancel("job-1", "user left") is True
+            result = await asyncio.wait_for(task, timeout=5)
+        finally:
+            patcher.stop()
+
+        assert not result.success
+        assert result.metadata["error_type"] == "ExecutionCancelledError"
+        assert result.error == "user left"
+        await asyncio.wait_for(slow.cancelled.wait(), timeout=2)
+        assert "notifications/cancelled" in slow.notifications
+
+        stats = client.get_stats()["cancellation"]
+        assert stats["executions_cancelled"] == 1
+        assert stats["tools_cancelled"] == 1
+        assert stats["running"] == 0
+        assert client.cancel("job-1") is False
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_propagates(self, make_client, slow):
+        """Test que cancelar la tarea de quien llama propaga CancelledError y limpia"""
+        client = make_client(slow.server)
+        task, patcher = await self.start(client, slow)
+        try:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            patcher.stop()
+
+        await asyncio.wait_for(slow.cancelled.wait(), timeout=2)
+        assert client.get_stats()["cancellation"]["running"] == 0
@@ -0,0 +1,223 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient, Checkpoint, MemoryCheckpointStore, FileCheckpointStore
+from deepseek_mcp_client.client.checkpoint import CheckpointStore
+
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_tool_call(name, arguments, call_id):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+PLANNING = make_response(tool_calls=[
+    make_tool_call("scrape", '{"query": "laptop"}', "call_1"),
+    make_tool_call("flaky", '{"query": "laptop"}', "call_2")
+])
+
+
+def make_server(calls):
+    server = FastMCP("Shop")
+
+    @server.tool
+    def scrape(query: str) -> str:
+        """Herramienta lenta"""
+        calls["scrape"] += 1
+        return f"productos de {query}"
+
+    @server.tool
+    def flaky(query: str) -> str:
+        """Falla la primera vez"""
+        calls["flaky"] += 1
+        if calls["flaky"] == 1:
+            raise RuntimeError("temporary failure")
+        return "ok"
+
+    return server
+
+
+@pytest.fixture
+def calls():
+    return {"scrape": 0, "flaky": 0}
+
+
+@pytest.fixture
+def make_client(monkeypatch, calls):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+    def factory(store):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            return DeepSeekClient(model="deepseek-chat", mcp_servers=[make_server(calls)], checkpoint_store=store)
+
+    return factory
+
+
+async def run(client, responses, method, *args, **kwargs):
+    with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+        mock_completion.side_effect = responses
+        result = await getattr(client, method)(*args, **kwargs)
+    return result, mock_completion.await_count
+
+
+class TestCheckpoint:
+
+    def test_planning_roundtrip(self):
+        """Test que la planificación guardada se reconstruye como respuesta"""
+        checkpoint = Checkpoint("exec-1", "consulta")
+        checkpoint.record_planning(PLANNING)
+
+        message = Checkpoint.from_dict(checkpoint.to_dict()).planning_response().choices[0].message
+
+        assert [tc.id for tc in message.tool_calls] == ["call_1", "call_2"]
+        assert message.tool_calls[0].function.name == "scrape"
+        assert message.tool_calls[1].function.arguments == '{"query": "laptop"}'
+
+    def test_file_store(self, tmp_path):
+        """Test persistencia en disco y filtrado por estado"""
+        store = FileCheckpointStore(tmp_path)
+        store.set(Checkpoint("a", "uno"))
+        done = Checkpoint("b", "dos")
+        done.complete({"output": "hecho"})
+        store.set(done)
+
+        reopened = FileCheckpointStore(tmp_path)
+        assert reopened.get("a").instruction == "uno"
+        assert reopened.get("missing") is None
+        assert reopened.execution_ids("running") == ["a"]
+        assert len(reopened) == 2
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_file_store_ids_stay_inside_directory(self, tmp_path):
+        """Test que un id con rutas no escribe fuera del directorio"""
+        directory = tmp_path / "checkpoints"
+        store = FileCheckpointStore(directory)
+        for execution_id in ("../../x", "/etc/passwd", "..", ".hidden", "a/b.c"):
+            store.set(Checkpoint(execution_id, "uno"))
+            assert store.get(execution_id).execution_id == execution_id
+
+        assert [p.parent for p in tmp_path.rglob("*.json")] == [directory] * 5
+        assert sorted(store.execution_ids()) == sorted(["../../x", "/etc/passwd", "..", ".hidden", "a/b.c"])
+        with pytest.raises(ValueError):
+            store.set(Checkpoint("", "uno"))
+
+    def test_store_is_abstract(self):
+        """Test que la base exige implementar el almacenamiento"""
+        with pytest.raises(TypeError):
+            CheckpointStore()
+
+    @pytest.mark.parametrize("store_class", [MemoryCheckpointStore, FileCheckpointStore])
+    def test_completed_ttl(self, store_class, tmp_path):
+        """Test que las ejecuciones completadas se borran según completed_ttl y las fallidas se conservan"""
+        def make_store(ttl):
+            if store_class is FileCheckpointStore:
+                return FileCheckpointStore(tmp_path / str(ttl), completed_ttl=ttl)
+            return MemoryCheckpointStore(completed_ttl=ttl)
+
+        store = make_store(0)
+        done = Checkpoint("a", "uno")
+        store.set(done)
+        done.complete({"output": "hecho"})
+        store.set(done)
+        assert store.get("a") is None
+
+        store = make_store(3600)
+        done = Checkpoint("done", "uno")
+        done.complete({"output": "hecho"})
+        store.set(done)
+        store.set(Checkpoint("failed", "dos", status="failed"))
+
+        assert store.prune() == 0
+        assert store.prune(older_than=0) == 1
+        assert store.execution_ids() == ["failed"]
+        assert store.get_stats()["pruned"] == 1
+
+    @pytest.mark.asyncio
+    async def test_file_store_async_saves_in_order(self, tmp_path):
+        """Test que save() escribe en un hilo y conserva el orden de los pasos"""
+        store = FileCheckpointStore(tmp_path)
+        checkpoint = Checkpoint("a", "uno")
+
+        async def step(i):
+            checkpoint.tool_results[f"call_{i}"] = str(i)
+            await store.save(checkpoint)
+
+        await asyncio.gather(*(step(i) for i in range(20)))
+
+        assert len(store.get("a").tool_results) == 20
+        assert store.get_stats()["saves"] == 20
+
+
+class TestResume:
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_steps(self, make_client, calls):
+        """Test que al reanudar no se repiten la planificación ni las herramientas correctas"""
+        store = MemoryCheckpointStore()
+        client = make_client(store)
+
+        failed, _ = await run(client, [PLANNING, RuntimeError("API down")], "execute", "busca laptops")
+        assert not failed.success
+        saved = store.get(failed.execution_id)
+        assert saved.status == "failed"
+        # El error de flaky no se guarda: se repite al reanudar
+        assert list(saved.tool_results) == ["call_1"]
+        assert len(saved.phases) == 1
+
+        result, llm_calls = await run(client, [make_response(content="resumen")], "resume", failed.execution_id)
+
+        assert result.success
+        assert result.output == "resumen"
+        assert result.execution_id == failed.execution_id
+        assert llm_calls == 1
+        assert calls == {"scrape": 1, "flaky": 2}
+        assert store.get_stats()["steps_skipped"] == 2
+        assert store.get_stats()["resumed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_same_id_continues(self, make_client, calls):
+        """Test que repetir execute con el mismo id continúa la ejecución sin terminar"""
+        store = MemoryCheckpointStore()
+        client = make_client(store)
+
+        await run(client, [PLANNING, RuntimeError("API down")], "execute", "busca laptops", execution_id="exec-1")
+        result, llm_calls = await run(client, [make_response(content="resumen")], "execute", "busca laptops", execution_id="exec-1")
+
+        assert result.success
+        assert llm_calls == 1
+        assert calls["scrape"] == 1
+        assert store.get("exec-1").status == "completed"
+
+        # Otra instrucción con el mismo id empieza de cero
+        _, llm_calls = await run(client, [PLANNING, make_response(content="otro")], "execute", "otra cosa", execution_id="exec-1")
+        assert llm_calls == 2
+        assert calls["scrape"] == 2
+
+    @pytest.mark.asyncio
+    async def test_resume_completed_returns_stored_result(self, make_client, tmp_path):
+        """Test que una ejecución terminada devuelve el resultado guardado sin llamadas"""
+        client = make_client(FileCheckpointStore(tmp_path))
+        first, _ = await run(client, [make_response(content="directo")], "execute", "hola")
+        assert first.success
+
+        # Otro proceso con el mismo directorio
+        other = make_client(FileCheckpointStore(tmp_path))
+        result, llm_calls = await run(other, [], "resume", first.execution_id)
+
+        assert llm_calls == 0
+        assert result.output == "directo"
+        assert other.checkpoint_store.get(first.execution_id).planning is None
+
+    @pytest.mark.asyncio
+    async def test_resume_unknown_execution(self, make_client):
+        """Test error al reanudar una ejecución sin punto de control"""
+        client = make_client(MemoryCheckpointStore())
+
+        with pytest.raises(KeyError):
+            await client.resume("missing")
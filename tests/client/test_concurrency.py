@@ -0,0 +1,153 @@
+import asyncio
+import json
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.execution_context import current_execution
+
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_tool_call(name, arguments, call_id="call_1"):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def make_server():
+    server = FastMCP("Echo")
+
+    @server.tool(meta={"direct_return": True})
+    async def echo(text: str) -> str:
+        """Devolver el texto"""
+        await asyncio.sleep(0.001)
+        return text
+
+    return server
+
+
+def planning_echo(chat_params):
+    instruction = chat_params["messages"][-1]["content"]
+    return make_response(tool_calls=[make_tool_call("echo", json.dumps({"text": instruction}))])
+
+
+class DelayedOpenAI:
+    """Cliente OpenAI asíncrono simulado con latencia fija que cuenta las llamadas en vuelo"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.inflight = 0
+        self.peak = 0
+
+    async def post(self, path, *, cast_to, content=None, options=None):
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.inflight -= 1
+        return make_response(content="hola")
+
+
+class TestConcurrentExecute:
+
+    @pytest.fixture
+    def server(self):
+        return make_server()
+
+    @pytest.fixture
+    def client(self, monkeypatch, server):
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            yield DeepSeekClient(model="deepseek-chat", mcp_servers=[server])
+
+    @pytest.mark.asyncio
+    async def test_single_flight_connect(self, client):
+        """Test que las ejecuciones concurrentes conectan una sola vez"""
+        original = DeepSeekClient._connect_single_server
+        calls = []
+
+        async def slow_connect(self, index, config):
+            calls.append(index)
+            await asyncio.sleep(0.01)
+            await original(self, index, config)
+
+        with patch.object(DeepSeekClient, "_connect_single_server", slow_connect), \
+                patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+            mock_completion.return_value = make_response(content="ok")
+            results = await asyncio.gather(*(client.execute(f"q{i}") for i in range(20)))
+
+        assert all(r.success for r in results)
+        assert calls == [0]
+        assert client.get_available_tools() == ["echo"]
+
+    @pytest.mark.asyncio
+    async def test_many_executions_keep_their_own_state(self, client):
+        """Test que cientos de ejecuciones concurrentes no mezclan resultados"""
+        with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+            mock_completion.side_effect = planning_echo
+            results = await asyncio.gather(*(client.execute(f"mensaje {i}") for i in range(200)))
+
+        assert [r.output for r in results] == [f"mensaje {i}" for i in range(200)]
+        assert all(r.tools_used == ["echo"] for r in results)
+        assert len({r.execution_id for r in results}) == 200
+        assert client.get_stats()["tools_available"] == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_calls_overlap_without_thread_limit(self, client):
+        """Test que las llamadas al modelo de cientos de ejecuciones se solapan (sin límite de hilos)"""
+        client.deepseek_client = DelayedOpenAI(0.3)
+        client._raw_body_supported = True
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.execute(f"mensaje {i}") for i in range(200)))
+        elapsed = time.perf_counter() - start
+
+        assert all(r.success for r in results)
+        assert client.deepseek_client.peak == 200
+        # En serie por un pool de hilos de 32 serían al menos 7 tandas de 0.3 s
+        assert elapsed < 1.5
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_snapshot_of_running_execution(self, client, server):
+        """Test que un refresco durante una ejecución no altera su registro de herramientas"""
+        await client._ensure_tools_ready()
+        seen = {}
+
+        @server.tool
+        def added(value: int) -> int:
+            """Herramienta nueva"""
+            return value
+
+        async def planning_with_refresh(chat_params):
+            seen["tools_before"] = chat_params["tools"]
+            client.message_handlers[0].tool_cache_dirty = True
+            await client.refresh_tools()
+            seen["context_tools"] = current_execution().tools.tools
+            return planning_echo(chat_params)
+
+        with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+            mock_completion.side_effect = planning_with_refresh
+            result = await client.execute("hola")
+
+        assert result.success and result.output == "hola"
+        assert seen["context_tools"] is seen["tools_before"]
+        assert [t["function"]["name"] for t in seen["tools_before"]] == ["echo"]
+        assert sorted(client.get_available_tools()) == ["added", "echo"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refresh_runs_once(self, client):
+        """Test que varios refrescos simultáneos recargan el registro una sola vez"""
+        await client._ensure_tools_ready()
+        client.message_handlers[0].tool_cache_dirty = True
+
+        with patch.object(DeepSeekClient, "_load_tools_from_client", wraps=client._load_tools_from_client) as mock_load:
+            await asyncio.gather(*(client.refresh_tools() for _ in range(10)))
+
+        assert mock_load.call_count == 1
+        assert client.get_available_tools() == ["echo"]
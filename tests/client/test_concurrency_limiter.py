@@ -0,0 +1,217 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient, AdaptiveConcurrencyLimiter, ServerOverloadedError
+from deepseek_mcp_client.client.deadline import Deadline, deadline_scope
+from deepseek_mcp_client.models.server_config import MCPServerConfig
+
+
+async def hold(limiter, order, label, priority="default", release=None):
+    await limiter.acquire(priority)
+    order.append(label)
+    if release is not None:
+        await release.wait()
+    limiter.release(0.01)
+
+
+class TestAdaptiveConcurrencyLimiter:
+
+    @pytest.mark.asyncio
+    async def test_queue_served_by_priority(self):
+        """Test que por encima del límite se espera y se atiende por prioridad"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        release = asyncio.Event()
+        order = []
+        first = asyncio.create_task(hold(limiter, order, "first", release=release))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(hold(limiter, order, "batch", "batch")),
+            asyncio.create_task(hold(limiter, order, "interactive", "interactive"))
+        ]
+        await asyncio.sleep(0)
+
+        assert limiter.get_stats()["waiting"] == 2
+        release.set()
+        await asyncio.gather(first, *waiting)
+
+        assert order == ["first", "interactive", "batch"]
+        assert limiter.inflight == 0
+        assert limiter.get_stats()["queued"] == 2
+
+    def test_gradient_reacts_to_latency(self):
+        """Test que el límite crece con latencia estable y baja si la latencia sube"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=100)
+        for _ in range(50):
+            limiter._inflight = limiter.current_limit
+            limiter.release(0.05)
+        grown = limiter.limit
+        assert grown > 10
+
+        for _ in range(30):
+            limiter._inflight = limiter.current_limit
+            limiter.release(0.5)
+        assert limiter.limit < grown / 2
+
+    def test_no_growth_without_load(self):
+        """Test que sin llamadas suficientes en vuelo el límite no cambia"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+        for _ in range(20):
+            limiter._inflight = 1
+            limiter.release(0.05)
+        assert limiter.limit == 10
+
+    def test_aimd_backoff_on_drops(self):
+        """Test AIMD: suma con carga y multiplica por backoff ante timeouts"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, algorithm="aimd", backoff=0.5)
+        limiter._inflight = 10
+        limiter.release(0.1)
+        assert limiter.current_limit == 11
+
+        limiter._inflight = 1
+        limiter.release(dropped=True)
+        assert limiter.limit == 5.5
+        assert limiter.get_stats()["drops"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_lowest_priority(self):
+        """Test que con la cola llena se descarta la llamada de menor prioridad"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1, max_queue=1)
+        await limiter.acquire()
+        batch = asyncio.create_task(limiter.acquire("batch"))
+        await asyncio.sleep(0)
+
+        interactive = asyncio.create_task(limiter.acquire("interactive"))
+        with pytest.raises(ServerOverloadedError):
+            await batch
+        with pytest.raises(ServerOverloadedError):
+            await limiter.acquire("default")
+
+        limiter.release(0.01)
+        await interactive
+        assert limiter.inflight == 1
+        assert limiter.get_stats()["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_leaves_queue(self):
+        """Test que agotar la espera retira la llamada de la cola"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(timeout=0.05)
+
+        assert limiter.get_stats()["waiting"] == 0
+        limiter.release(0.01)
+        assert limiter.inflight == 0
+
+    def test_invalid_algorithm(self):
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(algorithm="vegas")
+
+
+def make_server(name="Shop"):
+    server = FastMCP(name)
+
+    @server.tool
+    async def search(query: str) -> str:
+        """Buscar"""
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    @server.tool
+    async def slow(query: str) -> str:
+        """Lenta"""
+        await asyncio.sleep(5)
+        return "ok"
+
+    return server
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+    def factory(mcp_servers, **kwargs):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            return DeepSeekClient(model="deepseek-chat", mcp_servers=mcp_servers, **kwargs)
+
+    return factory
+
+
+class TestClientServerLimits:
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_feed_server_limiter(self, make_client):
+        """Test que las llamadas a herramientas pasan por el limitador de su servidor"""
+        client = make_client(
+            [{"fastmcp_instance": make_server(), "name": "shop", "concurrency": {"algorithm": "aimd", "backoff": 0.5}}],
+            adaptive_concurrency={"initial_limit": 4},
+            tool_timeouts={"slow": 0.1}
+        )
+        await client._ensure_tools_ready()
+
+        assert await client._execute_tool("search", {"query": "x"}) == "ok"
+        assert "timed out" in await client._execute_tool("slow", {"query": "x"})
+
+        stats = client.get_stats()["server_concurrency"]["shop"]
+        assert stats["algorithm"] == "aimd"
+        assert stats["calls"] == 2
+        assert stats["drops"] == 1
+        assert stats["limit"] == 2
+        assert stats["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_caller_deadline_is_not_a_drop(self, make_client):
+        """Test que agotar el plazo de quien llama no reduce el límite del servidor"""
+        client = make_client(
+            [{"fastmcp_instance": make_server(), "name": "shop", "concurrency": {"algorithm": "aimd", "backoff": 0.5}}],
+            adaptive_concurrency={"initial_limit": 4},
+            tool_timeouts={"slow": 5.0}
+        )
+        await client._ensure_tools_ready()
+
+        with deadline_scope(Deadline(0.1)):
+            assert "timed out" in await client._execute_tool("slow", {"query": "x"})
+
+        stats = client.get_stats()["server_concurrency"]["shop"]
+        assert stats["drops"] == 0
+        assert stats["limit"] == 4
+        assert stats["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_servers_with_same_name_keep_separate_stats(self, make_client):
+        """Test que dos servidores con el mismo nombre no comparten entrada en las estadísticas"""
+        client = make_client([make_server(), make_server()], adaptive_concurrency=True)
+        await client._ensure_tools_ready()
+
+        assert sorted(client.get_stats()["server_concurrency"]) == ["MEMORY_Shop", "MEMORY_Shop-2"]
+
+    @pytest.mark.asyncio
+    async def test_client_state_cleared(self, make_client):
+        """Test que close() y una conexión fallida no dejan limitadores ni handlers de clientes muertos"""
+        server = {"fastmcp_instance": make_server(), "tool_timeouts": {"slow": 1.0}}
+        client = make_client([server], adaptive_concurrency=True)
+        with patch.object(DeepSeekClient, "_load_tools_from_client", new_callable=AsyncMock) as load:
+            load.side_effect = RuntimeError("connection refused")
+            await client._ensure_tools_ready()
+        assert client.get_server_count() == 0
+        assert not client.server_limiters
+        assert not client.client_handlers
+        assert not client._server_tool_timeouts
+
+        client = make_client([server], adaptive_concurrency=True)
+        await client._ensure_tools_ready()
+        assert len(client.server_limiters) == 1
+        assert len(client._server_tool_timeouts) == 1
+        await client.close()
+        assert not client.server_limiters
+        assert not client.client_handlers
+        assert not client._server_tool_timeouts
+        assert client.get_stats()["server_concurrency"] == {}
+
+    def test_config_to_dict_includes_concurrency(self):
+        config = MCPServerConfig(url="http://localhost:8000/mcp/", concurrency={"max_queue": 10})
+        assert config.to_dict()["concurrency"] == {"max_queue": 10}
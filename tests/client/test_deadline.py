@@ -0,0 +1,236 @@
+import asyncio
+import json
+import re
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from openai import AsyncOpenAI
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    HedgePolicy,
+    LatencyTracker,
+    current_deadline,
+    deadline_scope,
+)
+
+
+class SlowOpenAI:
+    """Cliente OpenAI simulado cuya latencia depende del número de llamada"""
+
+    def __init__(self, latencies):
+        self.latencies = list(latencies)
+        self.calls = []
+
+    async def post(self, path, *, cast_to, content=None, options=None):
+        index = len(self.calls)
+        self.calls.append(options)
+        await asyncio.sleep(self.latencies[min(index, len(self.latencies) - 1)])
+        response = MagicMock()
+        response.choices[0].message.content = f"respuesta {index}"
+        response.choices[0].message.tool_calls = None
+        return response
+
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "deepseek-chat",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "rápida"}}]
+}).encode()
+
+
+class StallingServer:
+    """Servidor HTTP local: la primera conexión no responde, las demás sí"""
+
+    def __init__(self):
+        self.connections = 0
+        self.stalled_closed = asyncio.Event()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(re.search(rb"content-length: *(\d+)", head, re.IGNORECASE).group(1))
+        await reader.readexactly(length)
+        if self.connections == 1:
+            # Sin respuesta: solo termina cuando el cliente cierra la conexión
+            await reader.read()
+            self.stalled_closed.set()
+        else:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(COMPLETION), COMPLETION)
+            )
+            await writer.drain()
+        writer.close()
+
+
+def make_client(monkeypatch, fake, **kwargs):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+    with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+        client = DeepSeekClient(model="deepseek-chat", **kwargs)
+    client.deepseek_client = fake
+    client._raw_body_supported = True
+    return client
+
+
+class TestDeadline:
+
+    def test_ensure(self):
+        """Test fallo rápido cuando el presupuesto no cubre el paso"""
+        deadline = Deadline(1.0)
+        deadline.ensure(0.5)
+        with pytest.raises(DeadlineExceededError):
+            deadline.ensure(5.0)
+        with pytest.raises(DeadlineExceededError):
+            Deadline(0).ensure()
+
+    @pytest.mark.asyncio
+    async def test_scope_propagates_to_tasks(self):
+        """Test que el plazo se hereda en tareas hijas"""
+        deadline = Deadline(10)
+        with deadline_scope(deadline):
+            assert await asyncio.create_task(self._read()) is deadline
+        assert current_deadline() is None
+
+    @staticmethod
+    async def _read():
+        return current_deadline()
+
+    def test_latency_percentiles(self):
+        """Test percentiles de la ventana de latencias"""
+        tracker = LatencyTracker()
+        for value in range(1, 101):
+            tracker.record(value / 100)
+        assert tracker.percentile(0.5) == 0.5
+        assert tracker.percentile(0.95) == 0.95
+
+
+class TestHedgePolicy:
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """Test que el duplicado gana y el original se cancela"""
+        policy = HedgePolicy(delay=0.01)
+        delays = iter([1.0, 0.0])
+        cancelled = []
+
+        async def request():
+            delay = next(delays)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return delay
+
+        assert await policy.run(request, LatencyTracker()) == 0.0
+        await asyncio.sleep(0)
+        assert cancelled == [1.0]
+        assert policy.get_stats()["hedge_wins"] == 1
+        assert policy.get_stats()["hedge_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples(self):
+        """Test que sin historial de latencias no se duplica"""
+        policy = HedgePolicy(min_samples=10)
+        factory = AsyncMock(return_value="ok")
+
+        assert await policy.run(factory, LatencyTracker()) == "ok"
+        assert factory.await_count == 1
+        assert policy.stats["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_falls_back_to_other(self):
+        """Test que si una petición falla se espera a la otra"""
+        policy = HedgePolicy(delay=0.01)
+        attempts = iter([0.05, None])
+
+        async def request():
+            delay = next(attempts)
+            if delay is None:
+                raise ConnectionError("reset")
+            await asyncio.sleep(delay)
+            return "primary"
+
+        assert await policy.run(request, LatencyTracker()) == "primary"
+        assert policy.stats["primary_wins"] == 1
+
+
+class TestClientDeadline:
+
+    @pytest.mark.asyncio
+    async def test_execute_deadline_exceeded(self, monkeypatch):
+        """Test que una llamada lenta agota el plazo y devuelve error"""
+        fake = SlowOpenAI([0.5])
+        client = make_client(monkeypatch, fake)
+
+        start = time.perf_counter()
+        result = await client.execute("Hola", deadline=0.1)
+
+        assert time.perf_counter() - start < 0.4
+        assert not result.success
+        assert result.metadata["error_type"] == "DeadlineExceededError"
+        assert 0 < fake.calls[0]["timeout"] <= 0.1
+
+    @pytest.mark.asyncio
+    async def test_fast_fail_when_budget_below_typical_latency(self, monkeypatch):
+        """Test que no se llama al modelo si el presupuesto es menor que la latencia típica"""
+        fake = SlowOpenAI([0.0])
+        client = make_client(monkeypatch, fake)
+        for _ in range(5):
+            client.llm_latency.record(1.0)
+
+        result = await client.execute("Hola", deadline=0.5)
+
+        assert result.metadata["error_type"] == "DeadlineExceededError"
+        assert fake.calls == []
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_through_client(self, monkeypatch):
+        """Test que el cliente cubre una llamada lenta con un duplicado"""
+        fake = SlowOpenAI([0.5, 0.0])
+        client = make_client(monkeypatch, fake, hedge_policy=HedgePolicy(delay=0.05))
+
+        result = await client.execute("Hola")
+
+        assert result.success
+        assert result.output == "respuesta 1"
+        assert client.get_stats()["hedging"]["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_loser_connection_closed(self, monkeypatch):
+        """Test que la petición perdedora cierra su conexión HTTP en lugar de seguir en curso"""
+        stalling = StallingServer()
+        server = await asyncio.start_server(stalling.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        fake = AsyncOpenAI(api_key="test", base_url=f"http://127.0.0.1:{port}", max_retries=0)
+        client = make_client(monkeypatch, fake, hedge_policy=HedgePolicy(delay=0.05))
+        try:
+            result = await client.execute("Hola")
+            await asyncio.wait_for(stalling.stalled_closed.wait(), timeout=2)
+        finally:
+            server.close()
+            await fake.close()
+
+        assert result.output == "rápida"
+        assert stalling.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_tool_call_receives_remaining_budget(self, monkeypatch):
+        """Test que las herramientas reciben el tiempo restante como timeout"""
+        client = make_client(monkeypatch, SlowOpenAI([0.0]))
+        mcp_client = MagicMock()
+        mcp_client.__aenter__ = AsyncMock(return_value=mcp_client)
+        mcp_client.__aexit__ = AsyncMock(return_value=None)
+        mcp_client.call_tool = AsyncMock(return_value="ok")
+        client.tool_to_client = {"add": mcp_client}
+
+        with deadline_scope(Deadline(2.0)):
+            await client._execute_tool("add", {})
+
+        assert 0 < mcp_client.call_tool.call_args.kwargs["timeout"] <= 2.0
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 from unittest.mock import patch, MagicMock, AsyncMock
 from deepseek_mcp_client import DeepSeekClient, MCPServerConfig
 
@@ -10,7 +11,7 @@ class TestDeepSeekClient:
         # Configurar variable de entorno
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI") as mock_openai:
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI") as mock_openai:
             # Configurar mock
             mock_openai_instance = MagicMock()
             mock_openai.return_value = mock_openai_instance
@@ -35,7 +36,7 @@ class TestDeepSeekClient:
         """Test inicialización con todos los parámetros"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             client = DeepSeekClient(
                 model="deepseek-chat",
                 system_prompt="Custom prompt",
@@ -55,7 +56,7 @@ class TestDeepSeekClient:
         """Test que las URLs HTTP se parsean correctamente"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             client = DeepSeekClient(model="deepseek-chat")
             config = client._parse_server_config("http://localhost:8000/mcp/")
             
@@ -66,7 +67,7 @@ class TestDeepSeekClient:
         """Test que los diccionarios se parsean correctamente"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             client = DeepSeekClient(model="deepseek-chat")
             config = client._parse_server_config({
                 'url': 'http://localhost:8000/mcp/',
@@ -83,7 +84,7 @@ class TestDeepSeekClient:
         """Test que las configuraciones STDIO se parsean correctamente"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             client = DeepSeekClient(model="deepseek-chat")
             config = client._parse_server_config({
                 'command': 'python',
@@ -100,7 +101,7 @@ class TestDeepSeekClient:
         """Test que configuraciones inválidas lanzan excepciones"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             client = DeepSeekClient(model="deepseek-chat")
             
             with pytest.raises(ValueError):
@@ -135,6 +136,47 @@ class TestDeepSeekClient:
             assert result.success == True
             assert result.output == "Test response"
             assert len(result.tools_used) == 0
+            assert result.raw_response is mock_response
+    
+    @pytest.mark.asyncio
+    async def test_execute_many_drops_raw_response(self, monkeypatch):
+        """Test que execute_many no conserva la respuesta cruda salvo keep_raw_response=True"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        response = MagicMock()
+        response.choices[0].message.content = "ok"
+        response.choices[0].message.tool_calls = []
+        
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+             patch.object(DeepSeekClient, "_execute_initial_call", return_value=response):
+            client = DeepSeekClient(model="deepseek-chat")
+            single = await client.execute("uno")
+            batch = await client.execute_many(["dos", "tres"])
+            
+            client.keep_raw_response = True
+            kept = await client.execute_many(["cuatro"])
+        
+        assert single.raw_response is response
+        assert [r.raw_response for r in batch] == [None, None]
+        assert kept[0].raw_response is response
+    
+    def test_success_result_metadata(self, monkeypatch):
+        """Test que los tipos de transporte se calculan una vez por lista de servidores y la respuesta cruda es opcional"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        response = MagicMock()
+        response.choices[0].message.content = "ok"
+        
+        client = DeepSeekClient(model="deepseek-chat", mcp_servers=["http://localhost:8000/mcp"], keep_raw_response=False)
+        with patch.object(client, "_parse_server_config", wraps=client._parse_server_config) as parse:
+            first = client._create_success_result(response, "a", datetime.now(), [])
+            client._create_success_result(response, "b", datetime.now(), [])
+            assert parse.call_count == 1
+        
+        client.mcp_servers = [{"command": "python", "args": ["server.py"]}]
+        second = client._create_success_result(response, "c", datetime.now(), [])
+        
+        assert first.metadata["transport_types"] == ("http",)
+        assert second.metadata.transport_types == ("stdio",)
+        assert first.raw_response is None
     
     @pytest.mark.asyncio
     async def test_execute_with_tools(self, monkeypatch):
@@ -205,7 +247,7 @@ class TestDeepSeekClient:
         """Test conexión a servidores MCP"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create a mock client
             mock_client = MagicMock()
             
@@ -247,7 +289,7 @@ class TestDeepSeekClient:
     @pytest.mark.asyncio
     async def test_connect_error_handling(self, monkeypatch):
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             with patch.object(DeepSeekClient, '_parse_server_config') as mock_parse:
                 mock_config = MCPServerConfig(url='http://test', transport_type='http')
                 mock_parse.return_value = mock_config
@@ -279,7 +321,7 @@ class TestDeepSeekClient:
         """Test ejecución de herramienta individual"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create a mock client with AsyncMock for context manager methods
             mock_client = MagicMock()
             mock_client.__aenter__ = AsyncMock(return_value=mock_client)
@@ -303,7 +345,7 @@ class TestDeepSeekClient:
         """Test manejo de errores en ejecución de herramienta"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create a mock client with AsyncMock for context manager methods
             mock_client = MagicMock()
             mock_client.__aenter__ = AsyncMock(return_value=mock_client)
@@ -328,7 +370,7 @@ class TestDeepSeekClient:
         """Test cierre de conexiones"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create client
             client = DeepSeekClient(model="deepseek-chat")
             
@@ -349,7 +391,7 @@ class TestDeepSeekClient:
         """Test get_available_tools"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create client
             client = DeepSeekClient(model="deepseek-chat")
             
@@ -369,7 +411,7 @@ class TestDeepSeekClient:
         """Test get_stats"""
         monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
         
-        with patch("deepseek_mcp_client.client.deepseek_client.OpenAI"):
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
             # Create client
             client = DeepSeekClient(model="deepseek-chat")
             
@@ -384,4 +426,46 @@ class TestDeepSeekClient:
             assert stats["servers_configured"] == 2
             assert stats["servers_connected"] == 1
             assert stats["tools_available"] == 1
-            assert stats["is_connected"] == True
\ No newline at end of file
+            assert stats["is_connected"] == True
+    
+    @pytest.mark.asyncio
+    async def test_connect_in_memory_server(self, monkeypatch):
+        """Test conexión real a un servidor FastMCP en memoria"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        from fastmcp import FastMCP
+        
+        calculator = FastMCP("Calculator")
+        
+        @calculator.tool
+        def add(a: float, b: float) -> float:
+            """Sumar dos números"""
+            return a + b
+        
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", mcp_servers=[calculator])
+            await client._connect_mcp_servers()
+            
+            assert client.get_available_tools() == ["add"]
+            assert client.get_server_count() == 1
+            assert "3" in await client._execute_tool("add", {"a": 1, "b": 2})
+    
+    @pytest.mark.asyncio
+    async def test_connect_fails_when_ping_fails(self, monkeypatch):
+        """Test que un servidor que no responde al ping no se registra"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        from fastmcp import FastMCP, Client
+        
+        calculator = FastMCP("Calculator")
+        
+        @calculator.tool
+        def add(a: float, b: float) -> float:
+            """Sumar dos números"""
+            return a + b
+        
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+             patch.object(Client, "ping", new_callable=AsyncMock, side_effect=RuntimeError("unreachable")):
+            client = DeepSeekClient(model="deepseek-chat", mcp_servers=[calculator])
+            await client._connect_mcp_servers()
+            
+            assert client.get_server_count() == 0
+            assert client.get_available_tools() == []
@@ -0,0 +1,104 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient
+
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_tool_call(name, arguments, call_id="call_1"):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def make_server():
+    server = FastMCP("Directory")
+
+    @server.tool(meta={"direct_return": True})
+    def lookup_phone(name: str) -> str:
+        """Buscar teléfono"""
+        return "555-0100"
+
+    @server.tool(meta={"answer_template": "El clima en {city} es {result}"})
+    def weather(city: str) -> str:
+        """Consultar clima"""
+        return "soleado"
+
+    @server.tool
+    def search(query: str) -> str:
+        """Buscar documentos"""
+        return "doc1, doc2"
+
+    return server
+
+
+async def run(client, *tool_calls):
+    with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+        mock_completion.side_effect = [make_response(tool_calls=list(tool_calls)), make_response(content="parafraseado")]
+        result = await client.execute("consulta")
+    return result, mock_completion.await_count
+
+
+class TestDirectReturn:
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            yield DeepSeekClient(model="deepseek-chat", mcp_servers=[make_server()])
+
+    @pytest.mark.asyncio
+    async def test_annotation_direct_return(self, client):
+        """Test que una herramienta marcada en _meta devuelve su resultado sin segunda llamada"""
+        result, calls = await run(client, make_tool_call("lookup_phone", '{"name": "Ana"}'))
+
+        assert calls == 1
+        assert result.output == "555-0100"
+        assert result.metadata["final_call_skipped"] is True
+        assert result.metadata["phases"][-1]["skipped"] == "direct_return"
+
+    @pytest.mark.asyncio
+    async def test_annotation_template(self, client):
+        """Test plantilla de respuesta con argumentos y resultado"""
+        result, calls = await run(client, make_tool_call("weather", '{"city": "Madrid"}'))
+
+        assert calls == 1
+        assert result.output == "El clima en Madrid es soleado"
+
+    @pytest.mark.asyncio
+    async def test_mixed_tools_use_model(self, client):
+        """Test que si alguna herramienta no es de paso directo se llama al modelo"""
+        result, calls = await run(
+            client,
+            make_tool_call("lookup_phone", '{"name": "Ana"}', "call_1"),
+            make_tool_call("search", '{"query": "x"}', "call_2")
+        )
+
+        assert calls == 2
+        assert result.output == "parafraseado"
+        assert result.metadata["final_call_skipped"] is False
+
+    @pytest.mark.asyncio
+    async def test_config_overrides_annotation(self, client):
+        """Test que la configuración del cliente tiene prioridad sobre el _meta"""
+        client.direct_return_tools = {"lookup_phone": False, "search": "Resultados: {result}"}
+
+        _, calls = await run(client, make_tool_call("lookup_phone", '{"name": "Ana"}'))
+        result, search_calls = await run(client, make_tool_call("search", '{"query": "x"}'))
+
+        assert calls == 2
+        assert search_calls == 1
+        assert result.output == "Resultados: doc1, doc2"
+
+    @pytest.mark.asyncio
+    async def test_template_error_falls_back_to_model(self, client):
+        """Test que una plantilla inválida no rompe la ejecución"""
+        client.direct_return_tools = {"search": "{missing}"}
+        result, calls = await run(client, make_tool_call("search", '{"query": "x"}'))
+
+        assert calls == 2
+        assert result.output == "parafraseado"
@@ -0,0 +1,149 @@
+import math
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.model_router import ModelRouter, logprob_confidence
+
+
+def make_response(content=None, tool_calls=None, logprobs=None, usage=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choice = SimpleNamespace(message=message, logprobs=logprobs)
+    return SimpleNamespace(choices=[choice], usage=usage)
+
+
+def make_tool_call():
+    return SimpleNamespace(
+        id="call_1",
+        function=SimpleNamespace(name="add", arguments='{"a": 1, "b": 2}')
+    )
+
+
+def make_logprobs(*values):
+    return SimpleNamespace(content=[SimpleNamespace(logprob=v) for v in values])
+
+
+class TestModelRouter:
+
+    def test_model_per_phase(self):
+        """Test modelo por fase con el modelo del cliente como respaldo"""
+        router = ModelRouter(final_model="deepseek-reasoner")
+        assert router.model_for("planning", "deepseek-chat") == "deepseek-chat"
+        assert router.model_for("final", "deepseek-chat") == "deepseek-reasoner"
+
+    def test_confidence_from_logprobs(self):
+        """Test confianza como exponencial de la media de logprobs"""
+        response = make_response(content="ok", logprobs=make_logprobs(math.log(0.5), math.log(0.5)))
+        assert logprob_confidence(response) == pytest.approx(0.5)
+        assert logprob_confidence(make_response(content="ok")) is None
+
+    def test_escalation_reasons(self):
+        """Test escalado por fallo de herramienta y por baja confianza"""
+        router = ModelRouter(escalation_model="deepseek-reasoner", min_confidence=0.8)
+        low = make_response(content="?", logprobs=make_logprobs(math.log(0.3)))
+
+        assert router.escalation_reason(tool_failures=1) == "tool_error"
+        assert router.escalation_reason(low) == "low_confidence"
+        assert router.escalation_reason(make_response(content="ok", logprobs=make_logprobs(0.0))) is None
+        assert ModelRouter().escalation_reason(low, tool_failures=1) is None
+
+    def test_cost_and_stats(self):
+        """Test coste por fase con tokens cacheados"""
+        router = ModelRouter(pricing={"deepseek-chat": {"input": 1.0, "cached_input": 0.1, "output": 2.0}})
+        usage = SimpleNamespace(prompt_tokens=1000, prompt_cache_hit_tokens=500, completion_tokens=100)
+        report = router.record("planning", "deepseek-chat", 0.2, make_response(usage=usage))
+
+        assert report["cost"] == pytest.approx((500 * 1.0 + 500 * 0.1 + 100 * 2.0) / 1_000_000)
+        stats = router.get_stats()["phases"]["planning"]
+        assert stats["calls"] == 1 and stats["models"] == {"deepseek-chat": 1}
+        assert router.record("final", "other", 0.1, make_response(usage=usage))["cost"] is None
+
+
+class TestClientRouting:
+
+    @pytest.mark.asyncio
+    async def test_phases_use_routed_models(self, monkeypatch):
+        """Test que cada fase usa su modelo y se reporta en los metadatos"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        router = ModelRouter(planning_model="deepseek-chat", final_model="deepseek-reasoner")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", model_router=router)
+            client.all_tools = [{"type": "function", "function": {"name": "add", "parameters": {}}}]
+
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion, \
+                    patch.object(DeepSeekClient, "_execute_tool", new_callable=AsyncMock) as mock_tool:
+                mock_completion.side_effect = [make_response(tool_calls=[make_tool_call()]), make_response(content="3")]
+                mock_tool.return_value = "3"
+                result = await client.execute("Suma 1 y 2")
+
+        models = [call[0][0]["model"] for call in mock_completion.call_args_list]
+        assert models == ["deepseek-chat", "deepseek-reasoner"]
+        assert [p["phase"] for p in result.metadata["phases"]] == ["planning", "final"]
+        assert result.metadata["escalated"] is False
+
+    @pytest.mark.asyncio
+    async def test_answers_without_tools_use_final_model(self, monkeypatch):
+        """Test que la respuesta sin herramientas (modo directo o sin tool_calls) la escribe el modelo final"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        router = ModelRouter(planning_model="deepseek-chat", final_model="deepseek-reasoner")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", model_router=router)
+
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as direct:
+                direct.return_value = make_response(content="directa")
+                await client.execute("Hola")
+
+            client.all_tools = [{"type": "function", "function": {"name": "add", "parameters": {}}}]
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as no_calls:
+                no_calls.side_effect = [make_response(content="borrador"), make_response(content="final")]
+                result = await client.execute("Hola")
+
+        assert [call[0][0]["model"] for call in direct.call_args_list] == ["deepseek-reasoner"]
+        assert [call[0][0]["model"] for call in no_calls.call_args_list] == ["deepseek-chat", "deepseek-reasoner"]
+        assert result.output == "final"
+        assert [p["phase"] for p in result.metadata["phases"]] == ["planning", "final"]
+
+    @pytest.mark.asyncio
+    async def test_tool_error_escalates_final(self, monkeypatch):
+        """Test escalado de la respuesta final cuando falla una herramienta"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        router = ModelRouter(escalation_model="deepseek-reasoner")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", model_router=router)
+
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion, \
+                    patch.object(DeepSeekClient, "_execute_tool", new_callable=AsyncMock) as mock_tool:
+                mock_completion.side_effect = [make_response(tool_calls=[make_tool_call()]), make_response(content="?")]
+                mock_tool.return_value = "Error executing add: boom"
+                result = await client.execute("Suma 1 y 2")
+
+        assert mock_completion.call_args_list[1][0][0]["model"] == "deepseek-reasoner"
+        assert result.metadata["phases"][-1]["escalation"] == "tool_error"
+        assert result.metadata["escalated"] is True
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_direct_answer_retried(self, monkeypatch):
+        """Test que una respuesta directa con poca confianza se repite con el modelo de escalado"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        router = ModelRouter(escalation_model="deepseek-reasoner", min_confidence=0.8)
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", model_router=router)
+
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+                mock_completion.side_effect = [
+                    make_response(content="quizá", logprobs=make_logprobs(math.log(0.2))),
+                    make_response(content="seguro")
+                ]
+                result = await client.execute("Pregunta difícil")
+
+        first, second = (call[0][0] for call in mock_completion.call_args_list)
+        assert first["logprobs"] is True
+        assert second["model"] == "deepseek-reasoner"
+        assert result.output == "seguro"
+        assert client.get_stats()["model_routing"]["escalations"] == 1
@@ -0,0 +1,149 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import patch
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.provider_pool import ProviderEndpoint, ProviderPool, is_failover_error
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Endpoint local compatible con /chat/completions y /models"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send({"object": "list", "data": [{"id": "deepseek-chat", "object": "model", "created": 0, "owned_by": "local"}]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.models.append(request["model"])
+        self._send({
+            "id": "local-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "local"}}]
+        })
+
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.models = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class TestProviderPool:
+
+    def test_requires_endpoints(self):
+        """Test que el pool necesita endpoints"""
+        with pytest.raises(ValueError):
+            ProviderPool([])
+
+    def test_weighted_and_latency_aware_choice(self):
+        """Test que el reparto favorece peso alto y latencia baja"""
+        fast, slow = ProviderEndpoint(name="fast", api_key="k"), ProviderEndpoint(name="slow", api_key="k", weight=1)
+        pool = ProviderPool([fast, slow])
+        pool.record_success(fast, 0.1)
+        pool.record_success(slow, 1.0)
+
+        picks = [pool.choose().name for _ in range(500)]
+        assert picks.count("fast") > picks.count("slow") * 4
+
+    def test_failure_threshold_marks_unhealthy(self):
+        """Test que tras varios fallos el endpoint deja de elegirse"""
+        a, b = ProviderEndpoint(name="a", api_key="k"), ProviderEndpoint(name="b", api_key="k")
+        pool = ProviderPool([a, b], failure_threshold=2)
+        pool.record_failure(a)
+        pool.record_failure(a)
+
+        assert {pool.choose().name for _ in range(50)} == {"b"}
+        assert pool.get_stats()["endpoints"]["a"]["healthy"] is False
+
+    def test_failover_errors(self):
+        """Test clasificación de errores que justifican failover"""
+        assert is_failover_error(ServerError())
+        assert not is_failover_error(ValueError())
+
+    @pytest.mark.asyncio
+    async def test_call_fails_over(self):
+        """Test que un 5xx se reintenta en otro endpoint"""
+        a, b = ProviderEndpoint(name="a", api_key="k"), ProviderEndpoint(name="b", api_key="k")
+        pool = ProviderPool([a, b])
+        seen = []
+
+        async def request(endpoint):
+            seen.append(endpoint.name)
+            if len(seen) == 1:
+                raise ServerError()
+            return endpoint.name
+
+        result = await pool.call(request)
+        assert result != seen[0]
+        assert pool.stats["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_endpoints_failing_raises(self):
+        """Test que si todos fallan se propaga el último error"""
+        pool = ProviderPool([ProviderEndpoint(name="a", api_key="k")])
+
+        async def request(endpoint):
+            raise ServerError()
+
+        with pytest.raises(ServerError):
+            await pool.call(request)
+        assert pool.stats["exhausted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_with_stand_in(self, stand_in):
+        """Test chequeo de salud contra un endpoint local y uno caído"""
+        pool = ProviderPool([
+            ProviderEndpoint(base_url=url(stand_in), api_key="local", name="local"),
+            ProviderEndpoint(base_url="http://127.0.0.1:9/v1", api_key="local", name="down")
+        ], failure_threshold=1)
+
+        assert await pool.check_health() == {"local": True, "down": False}
+
+
+class TestClientWithPool:
+
+    @pytest.mark.asyncio
+    async def test_execute_fails_over_to_stand_in(self, monkeypatch, stand_in):
+        """Test que execute() salta un endpoint caído y traduce el modelo"""
+        monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+        pool = ProviderPool([
+            ProviderEndpoint(base_url="http://127.0.0.1:9/v1", api_key="local", name="down", weight=1000),
+            ProviderEndpoint(base_url=url(stand_in), api_key="local", name="local", model_map={"deepseek-chat": "local-model"})
+        ])
+
+        client = DeepSeekClient(model="deepseek-chat", provider_pool=pool)
+        result = await client.execute("Hola")
+
+        assert result.success
+        assert result.output == "local"
+        assert stand_in.models == ["local-model"]
+        assert client.get_stats()["provider_pool"]["failovers"] == 1
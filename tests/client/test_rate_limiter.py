@@ -0,0 +1,282 @@
+import asyncio
+import time
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.deadline import Deadline, DeadlineExceededError, deadline_scope
+from deepseek_mcp_client.client.provider_pool import ProviderEndpoint, ProviderPool
+from deepseek_mcp_client.client.rate_limiter import (
+    RateLimitScheduler,
+    TokenBucket,
+    parse_reset,
+    parse_retry_after,
+    priority_scope,
+)
+
+
+class RateLimited(Exception):
+    """Error con la forma de openai.RateLimitError"""
+
+    def __init__(self, headers):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers=headers)
+
+
+class TestParsing:
+
+    @pytest.mark.parametrize("value, expected", [
+        ("1s", 1.0), ("6m0s", 360.0), ("250ms", 0.25), ("12", 12.0), (None, None), ("soon", None)
+    ])
+    def test_parse_reset(self, value, expected):
+        """Test formatos de x-ratelimit-reset-*"""
+        assert parse_reset(value) == expected
+
+    def test_parse_retry_after(self):
+        """Test Retry-After en segundos y milisegundos"""
+        assert parse_retry_after({"retry-after": "2"}) == 2.0
+        assert parse_retry_after({"retry-after-ms": "150", "retry-after": "2"}) == 0.15
+        assert parse_retry_after({}) is None
+
+
+class TestTokenBucket:
+
+    def test_wait_time_and_sync(self):
+        """Test tiempo de espera y sincronización con cabeceras"""
+        bucket = TokenBucket(60)
+        bucket.consume(60)
+        assert bucket.time_until(1) == pytest.approx(1.0, abs=0.05)
+
+        bucket.sync(limit=120, remaining=120, reset=None)
+        assert bucket.time_until(1) == 0.0
+
+
+class TestRateLimitScheduler:
+
+    @pytest.mark.asyncio
+    async def test_retries_429_with_retry_after(self):
+        """Test que un 429 se reintenta tras Retry-After en lugar de fallar"""
+        scheduler = RateLimitScheduler()
+        attempts = []
+
+        async def call():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RateLimited({"retry-after-ms": "50"})
+            return "ok"
+
+        assert await scheduler.submit(call) == "ok"
+        assert attempts[1] - attempts[0] >= 0.05
+        assert scheduler.get_stats()["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test que tras agotar los reintentos se propaga el error"""
+        scheduler = RateLimitScheduler(max_retries=1, default_retry_after=0.01)
+
+        async def call():
+            raise RateLimited({})
+
+        with pytest.raises(RateLimited):
+            await scheduler.submit(call)
+        assert scheduler.stats["rate_limited"] == 2
+
+    @pytest.mark.asyncio
+    async def test_no_retry_pauses_key_and_raises(self):
+        """Test que con retry=False un 429 pausa la clave y se relanza sin esperar"""
+        scheduler = RateLimitScheduler()
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise RateLimited({"retry-after": "30"})
+
+        start = time.monotonic()
+        with pytest.raises(RateLimited):
+            await scheduler.submit(call, key="a", retry=False)
+
+        assert time.monotonic() - start < 1
+        assert len(attempts) == 1
+        assert scheduler._key_limits("a").paused_until > time.monotonic() + 20
+        assert scheduler._key_limits("b").paused_until == 0
+        assert scheduler.get_stats()["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_other_errors_not_retried(self):
+        """Test que los errores distintos de 429 no se reintentan"""
+        scheduler = RateLimitScheduler()
+
+        async def call():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await scheduler.submit(call)
+        assert scheduler.stats["retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_interactive_preempts_batch(self):
+        """Test que las peticiones interactivas en cola salen antes que las batch"""
+        scheduler = RateLimitScheduler(requests_per_minute=600, batch_reserve=0)
+        scheduler.requests.consume(600)
+        order = []
+
+        def make_call(name):
+            async def call():
+                order.append(name)
+                return name
+            return call
+
+        batch = [asyncio.create_task(scheduler.submit(make_call(f"batch{i}"), priority="batch")) for i in range(2)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(scheduler.submit(make_call("interactive"), priority="interactive"))
+        await asyncio.gather(*batch, interactive)
+
+        assert order[0] == "interactive"
+
+    @pytest.mark.asyncio
+    async def test_batch_keeps_reserve(self):
+        """Test que batch no consume la reserva de las prioridades superiores"""
+        scheduler = RateLimitScheduler(requests_per_minute=10, batch_reserve=0.5)
+        scheduler.requests.consume(5)
+
+        async def call():
+            return "ok"
+
+        assert await scheduler.submit(call, priority="interactive") == "ok"
+        with pytest.raises(DeadlineExceededError):
+            with deadline_scope(Deadline(0.5)):
+                await scheduler.submit(call, priority="batch")
+
+    @pytest.mark.asyncio
+    async def test_headers_and_usage_update_buckets(self):
+        """Test que las cabeceras y el uso real ajustan los cubos"""
+        scheduler = RateLimitScheduler(tokens_per_minute=10000)
+        scheduler.observe_headers({"x-ratelimit-limit-requests": "100", "x-ratelimit-remaining-requests": "3"})
+
+        async def call():
+            return SimpleNamespace(usage=SimpleNamespace(total_tokens=500))
+
+        await scheduler.submit(call, estimated_tokens=2000)
+
+        assert scheduler.requests.capacity == 100
+        assert scheduler.requests.level == pytest.approx(2, abs=0.1)
+        assert scheduler.tokens.level == pytest.approx(9500, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_keys_have_separate_limits(self):
+        """Test que las cabeceras de una clave no agotan el cupo de otra"""
+        scheduler = RateLimitScheduler(requests_per_minute=60)
+        scheduler.observe_headers({"x-ratelimit-limit-requests": "10", "x-ratelimit-remaining-requests": "0"}, key="a")
+
+        async def call():
+            return "ok"
+
+        assert await asyncio.wait_for(scheduler.submit(call, key="b"), timeout=1) == "ok"
+        with pytest.raises(DeadlineExceededError):
+            with deadline_scope(Deadline(0.5)):
+                await scheduler.submit(call, key="a")
+
+        keys = scheduler.get_stats()["keys"]
+        assert keys["a"]["requests_available"] < 1
+        assert keys["b"]["requests_available"] == pytest.approx(59, abs=0.1)
+        assert scheduler.requests.capacity == 60
+
+    @pytest.mark.asyncio
+    async def test_priority_scope_is_default(self):
+        """Test que la prioridad de la ejecución se usa por defecto"""
+        scheduler = RateLimitScheduler()
+
+        async def call():
+            return "ok"
+
+        with priority_scope("unknown"):
+            with pytest.raises(ValueError):
+                await scheduler.submit(call)
+
+
+class TestClientIntegration:
+
+    @pytest.mark.asyncio
+    async def test_execute_survives_429(self, monkeypatch):
+        """Test que execute() reintenta un 429 y lee las cabeceras de la respuesta cruda"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        completion = MagicMock()
+        completion.choices[0].message.content = "hola"
+        completion.choices[0].message.tool_calls = None
+        raw = MagicMock()
+        raw.headers = {"x-ratelimit-limit-requests": "50", "x-ratelimit-remaining-requests": "49"}
+        raw.parse.return_value = completion
+
+        class FakeOpenAI:
+            def __init__(self):
+                self.calls = []
+
+            async def post(self, path, *, cast_to, content=None, options=None):
+                self.calls.append(options)
+                if len(self.calls) == 1:
+                    raise RateLimited({"retry-after": "0"})
+                return raw
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", rate_limiter=RateLimitScheduler())
+        client.deepseek_client = FakeOpenAI()
+        client._raw_body_supported = True
+
+        result = await client.execute("Hola", priority="interactive")
+
+        assert result.success and result.output == "hola"
+        assert client.deepseek_client.calls[1]["headers"]["X-Stainless-Raw-Response"] == "true"
+        stats = client.get_stats()["rate_limiter"]
+        assert stats["retries"] == 1
+        assert client.rate_limiter.requests.capacity == 50
+
+    @pytest.mark.asyncio
+    async def test_pool_fails_over_on_429(self, monkeypatch):
+        """Test que con pool un 429 cambia de endpoint en lugar de reintentar en el mismo"""
+        monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+        completion = MagicMock()
+        completion.choices[0].message.content = "hola"
+        completion.choices[0].message.tool_calls = None
+        raw = MagicMock()
+        raw.headers = {}
+        raw.parse.return_value = completion
+
+        class Endpoint:
+            def __init__(self, limited):
+                self.limited = limited
+                self.calls = 0
+
+            async def post(self, path, *, cast_to, content=None, options=None):
+                self.calls += 1
+                if self.limited:
+                    raise RateLimited({"retry-after": "30"})
+                return raw
+
+        busy, spare = Endpoint(limited=True), Endpoint(limited=False)
+        pool = ProviderPool([
+            ProviderEndpoint(name="busy", api_key="k", weight=1000),
+            ProviderEndpoint(name="spare", api_key="k")
+        ])
+        pool.endpoints[0].client, pool.endpoints[1].client = busy, spare
+        client = DeepSeekClient(model="deepseek-chat", provider_pool=pool, rate_limiter=RateLimitScheduler())
+        client._raw_body_supported = True
+
+        result = await asyncio.wait_for(client.execute("Hola"), timeout=5)
+
+        assert result.success and result.output == "hola"
+        assert (busy.calls, spare.calls) == (1, 1)
+        assert client.rate_limiter._key_limits("busy").paused_until > time.monotonic()
+        assert client.get_stats()["provider_pool"]["failovers"] == 1
+
+    def test_sdk_retries_disabled_with_scheduler(self, monkeypatch):
+        """Test que con planificador el SDK no reintenta los 429 por su cuenta"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI") as mock_openai:
+            DeepSeekClient(model="deepseek-chat", rate_limiter=RateLimitScheduler())
+
+        assert mock_openai.call_args.kwargs["max_retries"] == 0
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.request_builder import ChatRequestBuilder
+
+
+def make_tools(count):
+    return [{
+        "type": "function",
+        "function": {
+            "name": f"tool_{i}",
+            "description": f"Herramienta número {i}",
+            "parameters": {"type": "object", "properties": {"q": {"type": "string"}}}
+        }
+    } for i in range(count)]
+
+
+class TestChatRequestBuilder:
+
+    def test_build_matches_json_dumps(self):
+        """Test que el cuerpo ensamblado equivale a serializar los parámetros"""
+        builder = ChatRequestBuilder()
+        params = {
+            "model": "deepseek-chat",
+            "messages": [
+                {"role": "system", "content": "Eres útil"},
+                {"role": "user", "content": "Hola ñandú"}
+            ],
+            "max_tokens": 4000,
+            "temperature": 0.7,
+            "tools": make_tools(3)
+        }
+
+        body = builder.build(params, tools_version=1)
+
+        assert json.loads(body) == params
+
+    def test_none_values_are_skipped(self):
+        """Test que los parámetros None no se envían"""
+        builder = ChatRequestBuilder()
+        body = builder.build({"model": "m", "messages": [], "tools": None, "stop": None})
+
+        assert json.loads(body) == {"model": "m", "messages": []}
+
+    def test_tools_serialized_once_per_version(self):
+        """Test que las herramientas se serializan una vez por versión"""
+        builder = ChatRequestBuilder()
+        tools = make_tools(5)
+        params = {"model": "m", "messages": [{"role": "system", "content": "s"}], "tools": tools}
+
+        for _ in range(10):
+            builder.build(params, tools_version=1)
+        assert builder.stats["tools_serializations"] == 1
+        assert builder.stats["prompt_serializations"] == 1
+        assert builder.stats["prompt_cache_hits"] == 9
+
+        tools.append(make_tools(1)[0])
+        body = builder.build(params, tools_version=2)
+        assert builder.stats["tools_serializations"] == 2
+        assert len(json.loads(body)["tools"]) == 6
+
+    def test_prompt_cache_is_bounded(self):
+        """Test que el cache de prompts respeta su capacidad"""
+        builder = ChatRequestBuilder(max_cached_prompts=2)
+        for prompt in ("a", "b", "c"):
+            builder.system_message_bytes(prompt)
+
+        assert list(builder._prompt_cache) == ["b", "c"]
+
+
+class FakeOpenAI:
+    """Cliente OpenAI mínimo que expone `post` con soporte de cuerpos en bytes"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def post(self, path, *, cast_to, body=None, content=None, options={}, files=None, stream=False):
+        self.calls.append({"path": path, "cast_to": cast_to, "content": content, "options": options})
+        return cast_to.model_validate({
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "deepseek-chat",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Hola"}
+            }]
+        })
+
+
+class TestPreSerializedRequests:
+
+    @pytest.mark.asyncio
+    async def test_client_posts_preserialized_body(self, monkeypatch):
+        """Test que el cliente envía el cuerpo ensamblado al endpoint de chat"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        fake = FakeOpenAI()
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI", return_value=fake):
+            client = DeepSeekClient(model="deepseek-chat")
+            client.all_tools = make_tools(2)
+
+            response = await client._create_chat_completion({
+                "model": "deepseek-chat",
+                "messages": [{"role": "user", "content": "Hola"}],
+                "tools": client.all_tools
+            })
+
+        assert client._raw_body_supported
+        assert fake.calls[0]["path"] == "/chat/completions"
+        assert len(json.loads(fake.calls[0]["content"])["tools"]) == 2
+        assert response.choices[0].message.content == "Hola"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sdk_create(self, monkeypatch):
+        """Test que sin soporte de bytes se usa chat.completions.create"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat")
+            client.deepseek_client.chat.completions.create = AsyncMock()
+            await client._create_chat_completion({"model": "deepseek-chat", "messages": [], "tools": None})
+
+            assert not client._raw_body_supported
+            client.deepseek_client.chat.completions.create.assert_called_once_with(
+                model="deepseek-chat", messages=[]
+            )
@@ -0,0 +1,99 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient
+
+
+def make_response(content=None):
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def server():
+    server = FastMCP("Docs")
+    server.reads = 0
+
+    @server.resource("docs://readme", description="Guía")
+    def readme() -> str:
+        server.reads += 1
+        return f"version {server.reads}"
+
+    @server.resource("docs://pages/{page}")
+    def page(page: str) -> str:
+        return f"page {page}"
+
+    @server.prompt
+    def review(code: str) -> str:
+        """Revisar código"""
+        return f"Review: {code}"
+
+    return server
+
+
+@pytest.fixture
+def client(monkeypatch, server):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+    with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+        yield DeepSeekClient(model="deepseek-chat", mcp_servers=[server])
+
+
+class TestResources:
+
+    @pytest.mark.asyncio
+    async def test_list_and_read_cached(self, client, server):
+        """Test que las lecturas repetidas salen del cache"""
+        resources = await client.list_resources()
+
+        assert [r["uri"] for r in resources] == ["docs://readme"]
+        assert await client.read_resource("docs://readme") == "version 1"
+        assert await client.read_resource("docs://readme") == "version 1"
+        assert server.reads == 1
+        assert client.get_stats()["resource_cache"]["hits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_list_changed_invalidates(self, client, server):
+        """Test que notifications/resources/list_changed invalida el contenido"""
+        await client.read_resource("docs://readme")
+        await client.message_handlers[0].on_resource_list_changed(None)
+
+        assert await client.read_resource("docs://readme") == "version 2"
+        assert await client.read_resource("docs://readme", use_cache=False) == "version 3"
+
+    @pytest.mark.asyncio
+    async def test_handler_uses_client_logger(self, client):
+        """Test que el handler de mensajes registra con el logger del cliente"""
+        await client.list_resources()
+
+        assert client.message_handlers[0].logger is client.logger
+
+    @pytest.mark.asyncio
+    async def test_template_and_missing_resource(self, client):
+        """Test URIs de plantilla y recursos inexistentes"""
+        assert await client.read_resource("docs://pages/7") == "page 7"
+        with pytest.raises(LookupError):
+            await client.read_resource("docs://missing")
+
+    @pytest.mark.asyncio
+    async def test_prompts(self, client):
+        """Test listado y obtención de prompts como mensajes de chat"""
+        prompts = await client.list_prompts()
+        messages = await client.get_prompt("review", {"code": "x = 1"})
+
+        assert prompts[0]["name"] == "review"
+        assert prompts[0]["arguments"] == [{"name": "code", "description": None, "required": True}]
+        assert messages == [{"role": "user", "content": "Review: x = 1"}]
+
+    @pytest.mark.asyncio
+    async def test_execute_injects_resources(self, client):
+        """Test que execute(resources=...) añade el contenido sin ronda de herramientas"""
+        with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+            mock_completion.return_value = make_response("ok")
+            result = await client.execute("Resume la guía", resources=["docs://readme"])
+
+        messages = mock_completion.call_args[0][0]["messages"]
+        assert result.success
+        assert [m["role"] for m in messages] == ["system", "system", "user"]
+        assert messages[1]["content"] == "Resource docs://readme:\nversion 1"
@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+import mcp.types
+from mcp import ClientSession
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.client.subscriptions import ResourceSubscription
+
+
+def updated(uri):
+    return mcp.types.ResourceUpdatedNotification(params=mcp.types.ResourceUpdatedNotificationParams(uri=uri))
+
+
+@pytest.fixture
+def server():
+    server = FastMCP("Logs")
+    server.lines = ["boot"]
+    server.reads = 0
+
+    @server.resource("logs://app")
+    def app_log() -> str:
+        server.reads += 1
+        return "\n".join(server.lines) + "\n"
+
+    return server
+
+
+@pytest.fixture
+def client(monkeypatch, server):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+    # El servidor en memoria no implementa resources/subscribe
+    with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+         patch.object(ClientSession, "subscribe_resource", AsyncMock()) as subscribe, \
+         patch.object(ClientSession, "unsubscribe_resource", AsyncMock()) as unsubscribe:
+        client = DeepSeekClient(model="deepseek-chat", mcp_servers=[server])
+        client.subscribe_mock = subscribe
+        client.unsubscribe_mock = unsubscribe
+        yield client
+
+
+class TestResourceSubscription:
+
+    @pytest.mark.asyncio
+    async def test_diff_types(self):
+        """Test de diferencias por versión: sin cambios, añadido, parche y completo"""
+        body = "line\n" * 20
+        contents = iter(["a\nb\n" + body, "a\nb\n" + body + "c\n", "a\nX\n" + body + "c\n"])
+        subscription = ResourceSubscription("mem://x", AsyncMock(side_effect=lambda: next(contents)), history=1)
+
+        await subscription.refresh()
+        assert subscription.diff(1)["type"] == "unchanged"
+
+        await subscription.refresh()
+        change = subscription.diff(1)
+        assert change["type"] == "append"
+        assert change["content"] == "c\n"
+
+        await subscription.refresh()
+        change = subscription.diff(2)
+        assert change["type"] == "patch"
+        assert "-b" in change["content"] and "+X" in change["content"]
+        # La versión 1 ya salió del historial
+        assert subscription.diff(1)["type"] == "full"
+
+    @pytest.mark.asyncio
+    async def test_notifications_coalesced(self):
+        """Test que los avisos durante una relectura se agrupan en una sola lectura"""
+        gate = asyncio.Event()
+        reads = 0
+
+        async def reader():
+            nonlocal reads
+            reads += 1
+            await gate.wait()
+            return f"v{reads}"
+
+        subscription = ResourceSubscription("mem://x", reader)
+        subscription.mark_stale()
+        await asyncio.sleep(0)
+        # Llegan mientras la primera lectura sigue en curso
+        for _ in range(4):
+            subscription.mark_stale()
+        gate.set()
+        version, content = await subscription.latest()
+
+        assert reads == 2
+        assert (version, content) == (2, "v2")
+        assert subscription.get_stats()["coalesced"] == 4
+
+
+class TestClientSubscriptions:
+
+    @pytest.mark.asyncio
+    async def test_subscribe_and_update(self, client, server):
+        """Test que un aviso de cambio actualiza la copia local y ofrece solo lo nuevo"""
+        subscription = await client.subscribe_resource("logs://app")
+        version, content = subscription.snapshot()
+
+        assert content == "boot\n"
+        client.subscribe_mock.assert_awaited_once_with("logs://app")
+
+        server.lines.append("request served")
+        await client.message_handlers[0].on_resource_updated(updated("logs://app"))
+        new_version = await subscription.wait_for_update(version, timeout=5)
+
+        change = subscription.diff(version)
+        assert new_version == version + 1
+        assert change["type"] == "append"
+        assert change["content"] == "request served\n"
+        assert await client.read_resource("logs://app") == "boot\nrequest served\n"
+        assert client.get_stats()["subscriptions"]["logs://app"]["notifications"] == 1
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_subscribe_sends_once(self, client):
+        """Test que varias suscripciones simultáneas a la misma URI envían un solo resources/subscribe"""
+        subscriptions = await asyncio.gather(*(client.subscribe_resource("logs://app") for _ in range(5)))
+
+        assert all(subscription is subscriptions[0] for subscription in subscriptions)
+        client.subscribe_mock.assert_awaited_once_with("logs://app")
+        assert client._session_holders[client.resource_to_client["logs://app"]].refs == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_read_served_from_subscription(self, client, server):
+        """Test que las lecturas de un recurso suscrito no van al servidor"""
+        await client.subscribe_resource("logs://app")
+        reads = server.reads
+
+        for _ in range(3):
+            await client.read_resource("logs://app", use_cache=False)
+
+        assert server.reads == reads
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe(self, client):
+        """Test que cancelar la suscripción libera la sesión"""
+        await client.subscribe_resource("logs://app")
+        await client.unsubscribe_resource("logs://app")
+
+        client.unsubscribe_mock.assert_awaited_once_with("logs://app")
+        assert client.subscriptions == {}
+        assert client._session_holders == {}
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastmcp import FastMCP
+
+from deepseek_mcp_client import DeepSeekClient, SyncDeepSeekClient
+
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_server():
+    server = FastMCP("Echo")
+
+    @server.tool(meta={"direct_return": True})
+    def echo(text: str) -> str:
+        """Devolver el texto"""
+        return text
+
+    return server
+
+
+async def fake_completion(chat_params):
+    await asyncio.sleep(0.001)
+    instruction = chat_params["messages"][-1]["content"]
+    call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="echo", arguments=json.dumps({"text": instruction})))
+    return make_response(tool_calls=[call])
+
+
+@pytest.fixture
+def sync_client(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+    with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+            patch.object(DeepSeekClient, "_create_chat_completion", side_effect=fake_completion):
+        client = SyncDeepSeekClient("deepseek-chat", mcp_servers=[make_server()])
+        yield client
+        client.close()
+
+
+class TestSyncDeepSeekClient:
+
+    def test_execute_keeps_sessions_warm(self, sync_client):
+        """Test que las sesiones MCP siguen abiertas entre llamadas"""
+        first = sync_client.execute("uno")
+        mcp_client = sync_client.client.clients[0]
+        second = sync_client.execute("dos")
+
+        assert (first.output, second.output) == ("uno", "dos")
+        assert mcp_client.is_connected()
+        assert sync_client.client.clients == [mcp_client]
+
+    def test_cold_sessions_close_after_each_call(self, monkeypatch):
+        """Test que sin warm_sessions la sesión se cierra tras cada llamada"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+                patch.object(DeepSeekClient, "_create_chat_completion", side_effect=fake_completion):
+            with SyncDeepSeekClient("deepseek-chat", mcp_servers=[make_server()], warm_sessions=False) as client:
+                assert client.execute("uno").output == "uno"
+                assert not client.client.clients[0].is_connected()
+
+    def test_execute_many_preserves_order(self, sync_client):
+        """Test que execute_many devuelve los resultados en orden"""
+        results = sync_client.execute_many([f"q{i}" for i in range(30)], max_concurrency=5)
+
+        assert [r.output for r in results] == [f"q{i}" for i in range(30)]
+
+    def test_stream_yields_every_result(self, sync_client):
+        """Test que stream entrega todos los resultados"""
+        outputs = {r.output for r in sync_client.stream(["a", "b", "c"])}
+
+        assert outputs == {"a", "b", "c"}
+
+    def test_stream_raises_when_batch_fails(self, sync_client):
+        """Test que stream propaga el error del lote en lugar de quedarse esperando"""
+        stream = sync_client.stream(["a", "b"], bogus=1)
+        result = ThreadPoolExecutor(max_workers=1).submit(list, stream)
+
+        with pytest.raises(TypeError):
+            result.result(timeout=5)
+
+    def test_calls_from_many_threads(self, sync_client):
+        """Test llamadas simultáneas desde varios hilos sobre el mismo loop"""
+        loops = set()
+        original = sync_client.client.execute
+
+        async def tracking_execute(instruction, **kwargs):
+            loops.add(id(asyncio.get_running_loop()))
+            return await original(instruction, **kwargs)
+
+        sync_client.client.execute = tracking_execute
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outputs = list(pool.map(lambda i: sync_client.execute(f"t{i}").output, range(40)))
+
+        assert outputs == [f"t{i}" for i in range(40)]
+        assert len(loops) == 1
+
+    def test_close_stops_loop_thread(self, sync_client):
+        """Test que close detiene el hilo y rechaza nuevas llamadas"""
+        sync_client.execute("uno")
+        sync_client.close()
+
+        assert not sync_client._thread.is_alive()
+        with pytest.raises(RuntimeError):
+            sync_client.execute("dos")
+
+    def test_requires_model_or_client(self):
+        """Test validación de parámetros"""
+        with pytest.raises(ValueError):
+            SyncDeepSeekClient()
@@ -0,0 +1,148 @@
+import asyncio
+import functools
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from deepseek_mcp_client import DeepSeekClient, ProviderPool, ProviderEndpoint, WorkerPool
+from deepseek_mcp_client.client.worker_pool import (
+    _Worker,
+    decode_message,
+    encode_message,
+    merge_stats,
+    pack_result,
+    unpack_result
+)
+from deepseek_mcp_client.models.client_result import ClientResult
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Endpoint local que responde con la instrucción recibida"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({
+            "id": "local-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "echo: " + request["messages"][-1]["content"]}
+            }]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_worker_client(base_url):
+    """Se ejecuta dentro de cada proceso trabajador"""
+    pool = ProviderPool([ProviderEndpoint(base_url=base_url, api_key="local")])
+    return DeepSeekClient(model="deepseek-chat", provider_pool=pool)
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+class TestEncoding:
+
+    def test_result_roundtrip(self):
+        """Test que un resultado sobrevive al canal sin raw_response"""
+        result = ClientResult(
+            output="hola", success=True, execution_id="abc", timestamp=datetime.now(),
+            tools_used=["t"], metadata={"phases": [{"phase": "planning"}]}, raw_response=object()
+        )
+        restored = unpack_result(decode_message(encode_message(pack_result(result))))
+
+        assert restored.output == "hola"
+        assert restored.timestamp == result.timestamp
+        assert restored.metadata == result.metadata
+        assert restored.raw_response is None
+
+    def test_merge_stats(self):
+        """Test que los contadores se suman y las tasas se promedian"""
+        merged = merge_stats([
+            {"requests": 2, "hit_rate": 0.5, "cache": {"hits": 1}, "model": "a"},
+            {"requests": 3, "hit_rate": 1.0, "cache": {"hits": 2}, "model": "a"}
+        ])
+
+        assert merged == {"requests": 5, "hit_rate": 0.75, "cache": {"hits": 3}, "model": "a"}
+
+
+class TestWorkerPool:
+
+    def test_requires_factory_or_kwargs(self):
+        """Test validación de parámetros"""
+        with pytest.raises(ValueError):
+            WorkerPool()
+
+    @pytest.mark.asyncio
+    async def test_failed_send_frees_worker(self):
+        """Test que una petición que no llega al trabajador no lo deja ocupado"""
+        class BrokenConn:
+            def send_bytes(self, data):
+                raise OSError("broken pipe")
+
+        pool = WorkerPool(functools.partial(make_worker_client, "http://127.0.0.1:1/v1"), processes=1)
+        pool._loop = asyncio.get_running_loop()
+        pool._started = True
+        worker = _Worker(0, None, BrokenConn())
+        pool._workers.append(worker)
+
+        with pytest.raises(RuntimeError, match="not reachable"):
+            await pool.execute("q")
+
+        assert worker.in_flight == 0
+        assert pool._pending == {}
+        assert pool.stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_runs_off_event_loop(self):
+        """Test que la escritura en la tubería no bloquea el event loop"""
+        threads = []
+
+        class RecordingConn:
+            def send_bytes(self, data):
+                threads.append(threading.get_ident())
+                raise OSError("broken pipe")
+
+        pool = WorkerPool(functools.partial(make_worker_client, "http://127.0.0.1:1/v1"), processes=1)
+        pool._loop = asyncio.get_running_loop()
+        pool._started = True
+        pool._workers.append(_Worker(0, None, RecordingConn()))
+
+        with pytest.raises(RuntimeError, match="not reachable") as excinfo:
+            await pool.execute("q")
+
+        assert threads and threads[0] != threading.get_ident()
+        assert isinstance(excinfo.value.__cause__, OSError)
+
+    @pytest.mark.asyncio
+    async def test_execute_across_processes(self, stand_in):
+        """Test que las peticiones se reparten entre procesos y se agregan las métricas"""
+        async with WorkerPool(functools.partial(make_worker_client, stand_in), processes=2) as pool:
+            results = await pool.execute_many([f"q{i}" for i in range(20)])
+            stats = await pool.get_stats()
+
+        assert [r.output for r in results] == [f"echo: q{i}" for i in range(20)]
+        assert len({r.metadata["worker_pid"] for r in results}) == 2
+        assert stats["completed"] == 20
+        assert stats["clients"]["provider_pool"]["requests"] == 20
+        assert sum(w["completed"] for w in stats["workers"]) == 20
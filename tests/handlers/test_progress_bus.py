@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastmcp import FastMCP, Context
+
+from deepseek_mcp_client import DeepSeekClient, ProgressBus
+from deepseek_mcp_client.client.execution_context import ExecutionContext, execution_scope
+
+
+class TestProgressBus:
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_coalesces(self):
+        """Test que los avisos seguidos se agrupan y el final siempre se entrega"""
+        bus = ProgressBus(min_interval=10)
+        events = []
+        bus.subscribe(events.append)
+        call = bus.start_call("index", "exec-1")
+
+        for i in range(1, 100):
+            call.publish(i, 100)
+        call.publish(100, 100)
+
+        assert [e.progress for e in events] == [1, 100]
+        assert events[1].coalesced == 98
+        assert events[1].execution_id == "exec-1"
+        assert bus.get_stats()["published"] == 100
+
+    @pytest.mark.asyncio
+    async def test_pending_flushed_after_interval(self):
+        """Test que el último aviso agrupado se entrega al vencer el intervalo"""
+        bus = ProgressBus(min_interval=0.01)
+        events = []
+        bus.subscribe(events.append)
+        call = bus.start_call("index")
+
+        call.publish(1)
+        call.publish(2)
+        call.publish(3)
+        await asyncio.sleep(0.05)
+
+        assert [e.progress for e in events] == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_stream_drops_oldest_and_filters(self):
+        """Test que el iterador acotado descarta lo más antiguo y filtra por ejecución"""
+        bus = ProgressBus(min_interval=0)
+        stream = bus.stream("exec-1", max_queue=2)
+        mine = bus.start_call("a", "exec-1")
+        other = bus.start_call("b", "exec-2")
+
+        for i in range(5):
+            mine.publish(i)
+            other.publish(i)
+        stream.close()
+        received = [event.progress async for event in stream]
+
+        assert received == [3, 4]
+        assert stream.dropped == 3
+        assert bus.get_stats()["streams"] == 0
+
+    def test_inactive_bus_skips_work(self):
+        """Test que sin suscriptores publicar no crea eventos"""
+        bus = ProgressBus()
+        call = bus.start_call("a")
+        call.publish(1, 2)
+
+        assert bus.get_stats()["published"] == 1
+        assert bus.get_stats()["delivered"] == 0
+
+
+class TestClientProgress:
+
+    @pytest.mark.asyncio
+    async def test_tool_progress_correlated(self, monkeypatch):
+        """Test que el progreso de una herramienta llega con su execution_id"""
+        server = FastMCP("Jobs")
+
+        @server.tool
+        async def crunch(ctx: Context) -> str:
+            for i in range(1, 51):
+                await ctx.report_progress(i, 50)
+            return "ok"
+
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", mcp_servers=[server], progress_bus=ProgressBus(min_interval=10))
+        await client._ensure_tools_ready()
+        events = []
+        client.progress_bus.subscribe(events.append, execution_id="job-1")
+
+        context = ExecutionContext("job-1", client._live_tools())
+        with execution_scope(context):
+            assert await client._execute_tool("crunch", {}) == "ok"
+
+        assert events[0].tool_name == "crunch"
+        assert events[-1].done
+        assert len(events) < 50
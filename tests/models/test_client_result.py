@@ -0,0 +1,103 @@
+import dataclasses
+import json
+import pickle
+import sys
+from datetime import datetime
+
+import pytest
+
+from deepseek_mcp_client.models.client_result import ClientResult, ResultMetadata
+
+
+def make_result(**metadata):
+    return ClientResult(
+        output="Soleado",
+        success=True,
+        execution_id="abc123",
+        timestamp=datetime(2024, 5, 1, 12, 30),
+        tools_used=["weather"],
+        metadata={"model": "deepseek-chat", "duration": 0.5, "transport_types": ("memory",), **metadata}
+    )
+
+
+class TestResultMetadata:
+
+    def test_mapping_interface(self):
+        """Test que los metadatos se comportan como un diccionario"""
+        metadata = ResultMetadata({"model": "deepseek-chat", "worker_pid": 42})
+        metadata["cached"] = True
+
+        assert metadata["model"] == "deepseek-chat"
+        assert metadata.model == "deepseek-chat"
+        assert metadata["worker_pid"] == 42
+        assert "cached" in metadata and "duration" not in metadata
+        assert metadata.get("duration", 1.0) == 1.0
+        assert dict(metadata) == {"model": "deepseek-chat", "cached": True, "worker_pid": 42}
+        assert metadata == {"model": "deepseek-chat", "cached": True, "worker_pid": 42}
+        with pytest.raises(KeyError):
+            metadata["duration"]
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass(slots=True) requiere Python 3.10")
+    def test_slots(self):
+        """Test que no hay __dict__ por instancia"""
+        assert not hasattr(ResultMetadata(), "__dict__")
+        assert not hasattr(make_result(), "__dict__")
+
+    def test_is_dict(self):
+        """Test que los metadatos siguen siendo un dict serializable"""
+        metadata = make_result(custom=1).metadata
+
+        assert isinstance(metadata, dict)
+        assert json.loads(json.dumps(metadata))["custom"] == 1
+        with pytest.raises(AttributeError):
+            metadata.cached
+        with pytest.raises(AttributeError):
+            metadata.custom
+
+
+class TestClientResultDataclass:
+
+    def test_dataclass_helpers(self):
+        """Test que asdict y replace siguen funcionando"""
+        result = make_result()
+
+        assert dataclasses.asdict(result)["metadata"]["model"] == "deepseek-chat"
+        assert dataclasses.asdict(result)["raw_response"] is None
+        failed = dataclasses.replace(result, success=False, error="boom")
+        assert failed.error == "boom" and failed.metadata == result.metadata
+        assert isinstance(dataclasses.replace(result, metadata={"model": "m"}).metadata, ResultMetadata)
+
+
+class TestClientResultSerialization:
+
+    def test_dict_roundtrip(self):
+        """Test de ida y vuelta con to_dict/from_dict"""
+        result = make_result(cached=True)
+        restored = ClientResult.from_dict(result.to_dict())
+
+        assert restored == result
+        assert restored.metadata["cached"] is True
+
+    def test_bytes_roundtrip(self):
+        """Test que la serialización binaria conserva el resultado sin raw_response"""
+        result = make_result()
+        result.raw_response = object()
+        restored = ClientResult.from_bytes(result.to_bytes())
+
+        assert restored.raw_response is None
+        assert restored.output == result.output
+        assert restored.timestamp == result.timestamp
+        assert restored.metadata["transport_types"] == ["memory"]
+
+    def test_pickle(self):
+        """Test que los resultados con __slots__ se pueden enviar entre procesos"""
+        result = make_result(worker_pid=7)
+        restored = pickle.loads(pickle.dumps(result))
+
+        assert restored == result
+        assert restored.metadata["worker_pid"] == 7
+
+    def test_unknown_encoding(self):
+        """Test de error con datos que no vienen de to_bytes"""
+        with pytest.raises(ValueError):
+            ClientResult.from_bytes(b"X{}")
@@ -0,0 +1,152 @@
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient, GenerationConfig
+
+
+class TestGenerationConfig:
+
+    def test_defaults_match_previous_behaviour(self):
+        """Test que los valores por defecto son max_tokens=4000 y temperature=0.7"""
+        assert GenerationConfig().for_phase("planning") == {"max_tokens": 4000, "temperature": 0.7}
+
+    def test_phase_overrides(self):
+        """Test ajustes separados de planificación y respuesta final"""
+        config = GenerationConfig(
+            tool_choice="auto",
+            planning={"max_tokens": 256, "temperature": 0},
+            final={"stop": ["END"]}
+        )
+
+        assert config.for_phase("planning") == {"max_tokens": 256, "temperature": 0, "tool_choice": "auto"}
+        assert config.for_phase("final") == {"max_tokens": 4000, "temperature": 0.7, "stop": ["END"]}
+
+    def test_general_tool_params_only_for_planning(self):
+        """Test que tool_choice general no fuerza herramientas en la respuesta final"""
+        config = GenerationConfig(tool_choice="required", parallel_tool_calls=False)
+        assert config.for_phase("planning")["tool_choice"] == "required"
+        assert "tool_choice" not in config.for_phase("final")
+        assert "parallel_tool_calls" not in config.for_phase("final")
+
+        explicit = GenerationConfig(tool_choice="required", final={"tool_choice": "none"})
+        assert explicit.for_phase("final")["tool_choice"] == "none"
+
+    def test_tool_params_dropped_without_tools(self):
+        """Test que tool_choice y parallel_tool_calls no se envían sin herramientas"""
+        config = GenerationConfig(tool_choice="required", parallel_tool_calls=False)
+        assert "tool_choice" not in config.for_phase("final", has_tools=False)
+        assert "parallel_tool_calls" not in config.for_phase("final", has_tools=False)
+
+    def test_merged_combines_phases(self):
+        """Test que las sobrescrituras por llamada combinan los ajustes por fase"""
+        config = GenerationConfig(planning={"max_tokens": 256})
+        merged = config.merged({"temperature": 0.1, "planning": {"temperature": 0}})
+
+        assert merged.planning == {"max_tokens": 256, "temperature": 0}
+        assert merged.temperature == 0.1
+        assert config.temperature == 0.7
+
+    def test_unknown_parameter(self):
+        """Test que parámetros desconocidos se rechazan"""
+        with pytest.raises(ValueError):
+            GenerationConfig().merged({"max_token": 10})
+        with pytest.raises(ValueError):
+            GenerationConfig(planning={"planning": {}})
+
+
+class TestClientGeneration:
+
+    @pytest.mark.asyncio
+    async def test_execute_overrides_reach_request(self, monkeypatch):
+        """Test que los ajustes de execute() llegan a las peticiones de cada fase"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        tool_call = MagicMock()
+        tool_call.id = "call_1"
+        tool_call.function.name = "add"
+        tool_call.function.arguments = '{"a": 1, "b": 2}'
+
+        planning = MagicMock()
+        planning.choices[0].message.content = None
+        planning.choices[0].message.tool_calls = [tool_call]
+        final = MagicMock()
+        final.choices[0].message.content = "3"
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(
+                model="deepseek-chat",
+                generation_config=GenerationConfig(planning={"max_tokens": 128, "temperature": 0})
+            )
+            client.all_tools = [{"type": "function", "function": {"name": "add", "parameters": {}}}]
+
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion, \
+                    patch.object(DeepSeekClient, "_execute_tool", new_callable=AsyncMock) as mock_tool:
+                mock_completion.side_effect = [planning, final]
+                mock_tool.return_value = "3"
+                result = await client.execute("Suma 1 y 2", generation={"final": {"max_tokens": 64}, "tool_choice": "auto"})
+
+        planning_params = mock_completion.call_args_list[0][0][0]
+        final_params = mock_completion.call_args_list[1][0][0]
+
+        assert result.success
+        assert (planning_params["max_tokens"], planning_params["temperature"]) == (128, 0)
+        assert (final_params["max_tokens"], final_params["temperature"]) == (64, 0.7)
+        assert planning_params["tool_choice"] == "auto"
+        assert "tool_choice" not in final_params
+
+    @pytest.mark.asyncio
+    async def test_direct_mode_uses_final_settings(self, monkeypatch):
+        """Test que sin herramientas la única llamada usa los ajustes de la respuesta final"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        answer = MagicMock()
+        answer.choices[0].message.content = "respuesta completa"
+        answer.choices[0].message.tool_calls = None
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(
+                model="deepseek-chat",
+                generation_config=GenerationConfig(planning={"max_tokens": 128, "temperature": 0})
+            )
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+                mock_completion.return_value = answer
+                result = await client.execute("Explica MCP")
+
+        params = mock_completion.call_args[0][0]
+        assert mock_completion.await_count == 1
+        assert (params["max_tokens"], params["temperature"]) == (4000, 0.7)
+        assert [p["phase"] for p in result.metadata["phases"]] == ["final"]
+
+    @pytest.mark.asyncio
+    async def test_answer_without_tool_calls_uses_final_settings(self, monkeypatch):
+        """Test que si el modelo responde sin herramientas la respuesta se repite con los ajustes finales"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        truncated = MagicMock()
+        truncated.choices[0].message.content = "respuesta cort"
+        truncated.choices[0].message.tool_calls = None
+        answer = MagicMock()
+        answer.choices[0].message.content = "respuesta completa"
+        answer.choices[0].message.tool_calls = None
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(
+                model="deepseek-chat",
+                generation_config=GenerationConfig(tool_choice="auto", planning={"max_tokens": 128})
+            )
+            client.all_tools = [{"type": "function", "function": {"name": "add", "parameters": {}}}]
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+                mock_completion.side_effect = [truncated, answer]
+                result = await client.execute("Explica MCP")
+
+            # Sin ajustes propios de planificación basta una llamada
+            client.generation_config = GenerationConfig(tool_choice="auto")
+            with patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as single:
+                single.return_value = answer
+                await client.execute("Explica MCP")
+
+        planning_params, final_params = (call[0][0] for call in mock_completion.call_args_list)
+        assert planning_params["max_tokens"] == 128
+        assert final_params["max_tokens"] == 4000
+        assert "tool_choice" not in final_params
+        assert result.output == "respuesta completa"
+        assert [p["phase"] for p in result.metadata["phases"]] == ["planning", "final"]
+        assert single.await_count == 1
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.utils.argument_validation import (
+    ArgumentParseError,
+    ToolArgumentValidator,
+    compile_validator,
+    repair_json_arguments,
+)
+
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 2},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+        "order": {"enum": ["asc", "desc"]},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "when": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+        "filters": {"$ref": "#/$defs/Filters"}
+    },
+    "required": ["query"],
+    "additionalProperties": False,
+    "$defs": {"Filters": {"type": "object", "properties": {"active": {"type": "boolean"}}}}
+}
+
+
+class TestRepairJsonArguments:
+
+    @pytest.mark.parametrize("raw, expected", [
+        ('{"a": 1}', {"a": 1}),
+        ("", {}),
+        ('```json\n{"a": 1}\n```', {"a": 1}),
+        ("{'a': 'b'}", {"a": "b"}),
+        ('{"a": 1,}', {"a": 1}),
+        ('{"a": [1, 2,],}', {"a": [1, 2]}),
+        ('{"a": True, "b": None}', {"a": True, "b": None}),
+        ('{"a": {"b": 1', {"a": {"b": 1}}),
+        ('{"a": "tru', {"a": "tru"}),
+    ])
+    def test_repairs(self, raw, expected):
+        """Test reparaciones comunes de JSON mal formado"""
+        assert repair_json_arguments(raw)[0] == expected
+
+    def test_literals_inside_strings_untouched(self):
+        """Test que los literales dentro de cadenas no se modifican"""
+        arguments, repaired = repair_json_arguments('{"text": "True, None",}')
+        assert arguments == {"text": "True, None"}
+        assert repaired
+
+    def test_unrepairable(self):
+        """Test que el JSON irreparable lanza ArgumentParseError"""
+        with pytest.raises(ArgumentParseError):
+            repair_json_arguments("not json at all")
+
+
+class TestCompiledValidator:
+
+    def test_valid_arguments(self):
+        """Test argumentos válidos"""
+        validate = compile_validator(SCHEMA)
+        assert validate({"query": "laptops", "limit": 5, "filters": {"active": True}, "when": None}) == []
+
+    def test_invalid_arguments(self):
+        """Test que se reportan todos los problemas con su ruta"""
+        validate = compile_validator(SCHEMA)
+        issues = validate({"limit": 0, "order": "up", "tags": ["a", 1], "extra": 1, "filters": {"active": "yes"}})
+        paths = {issue.path for issue in issues}
+
+        assert paths == {"$.query", "$.limit", "$.order", "$.tags[1]", "$.extra", "$.filters.active"}
+
+    def test_boolean_is_not_integer(self):
+        """Test que booleanos no se aceptan como enteros"""
+        assert compile_validator({"type": "integer"})(True)
+
+    def test_recursive_ref(self):
+        """Test referencias recursivas"""
+        schema = {
+            "$defs": {"Node": {"type": "object", "properties": {"child": {"$ref": "#/$defs/Node"}}}},
+            "$ref": "#/$defs/Node"
+        }
+        validate = compile_validator(schema)
+        assert validate({"child": {"child": {}}}) == []
+        assert validate({"child": {"child": 3}})[0].path == "$.child.child"
+
+    def test_non_local_refs_are_not_validated(self):
+        """Test que solo se resuelven referencias #, #/$defs/ y #/definitions/"""
+        schema = {
+            "definitions": {"Id": {"type": "integer"}},
+            "properties": {
+                "local": {"$ref": "#/definitions/Id"},
+                "external": {"$ref": "https://example.com/schemas#/definitions/Id"},
+                "other": {"$ref": "#/properties/local"},
+            }
+        }
+        validate = compile_validator(schema)
+
+        assert validate({"external": "x", "other": "x"}) == []
+        assert validate({"local": "x"})[0].path == "$.local"
+
+
+class TestToolArgumentValidator:
+
+    def test_validate_tracks_stats(self):
+        """Test estadísticas de validación y reparación"""
+        validator = ToolArgumentValidator()
+        validator.register("search", SCHEMA)
+
+        assert validator.validate("search", "{'query': 'ok'}") == ({"query": "ok"}, [])
+        _, issues = validator.validate("search", "[1, 2]")
+
+        assert issues
+        assert validator.get_stats() == {"validated": 2, "repaired": 1, "rejected": 1}
+
+    def test_unknown_tool_passes(self):
+        """Test que herramientas sin esquema registrado no se validan"""
+        validator = ToolArgumentValidator()
+        assert validator.validate("other", '{"x": 1}') == ({"x": 1}, [])
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_never_reach_server(self, monkeypatch):
+        """Test que los argumentos inválidos vuelven al modelo sin llamar al servidor"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        tool_call = MagicMock()
+        tool_call.id = "call_1"
+        tool_call.function.name = "search"
+        tool_call.function.arguments = '{"limit": 3}'
+
+        message = MagicMock()
+        message.content = None
+        message.tool_calls = [tool_call]
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat")
+            client.argument_validator.register("search", SCHEMA)
+
+            with patch.object(DeepSeekClient, "_execute_tool", new_callable=AsyncMock) as mock_tool, \
+                    patch.object(DeepSeekClient, "_create_chat_completion", new_callable=AsyncMock) as mock_completion:
+                tools_used = []
+                await client._execute_tools_and_get_final_response(message, "Buscar", tools_used)
+
+                mock_tool.assert_not_called()
+                messages = mock_completion.call_args[0][0]["messages"]
+                error = json.loads(messages[-1]["content"])
+
+        assert tools_used == ["search"]
+        assert error["error"] == "invalid_arguments"
+        assert error["issues"][0]["path"] == "$.query"
@@ -0,0 +1,85 @@
+import io
+import json
+import logging
+import pytest
+
+from deepseek_mcp_client.utils.logging_config import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    configure_logging,
+    set_subsystem_levels,
+    shutdown_logging
+)
+
+
+@pytest.fixture
+def stream():
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+    for name in ("deepseek_mcp_client", "deepseek_mcp_client.mcp_server"):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+class TestLoggingPipeline:
+
+    def test_json_lines_with_extra(self, stream):
+        """Test que cada registro sale como una línea JSON con sus campos extra"""
+        configure_logging("INFO", stream=stream)
+        logging.getLogger("deepseek_mcp_client.client").info("Executing %s", "weather", extra={"execution_id": "abc"})
+        shutdown_logging()
+
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "Executing weather"
+        assert entry["execution_id"] == "abc"
+        assert entry["logger"] == "deepseek_mcp_client.client"
+
+    def test_subsystem_levels(self, stream):
+        """Test de niveles independientes por subsistema"""
+        configure_logging("INFO", stream=stream, subsystems={"mcp_server": "ERROR"})
+        logging.getLogger("deepseek_mcp_client.mcp_server").warning("hidden")
+        logging.getLogger("deepseek_mcp_client.client").warning("shown")
+        shutdown_logging()
+
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        assert messages == ["shown"]
+
+    def test_text_format(self, stream):
+        """Test del formato de texto clásico a través de la cola"""
+        configure_logging("INFO", json_format=False, stream=stream)
+        logging.getLogger("deepseek_mcp_client").info("hello %s", "world")
+        shutdown_logging()
+
+        assert stream.getvalue().rstrip().endswith("deepseek_mcp_client - INFO - hello world")
+
+    def test_set_subsystem_levels(self):
+        """Test que acepta subsistemas y nombres completos"""
+        set_subsystem_levels({"progress": "warning"})
+        try:
+            assert logging.getLogger("deepseek_mcp_client.progress").level == logging.WARNING
+        finally:
+            logging.getLogger("deepseek_mcp_client.progress").setLevel(logging.NOTSET)
+
+
+class TestDeferredQueueHandler:
+
+    def _record(self, *args):
+        return logging.LogRecord("x", logging.INFO, __file__, 1, "value %s", args, None)
+
+    def test_simple_args_not_formatted(self):
+        """Test que los argumentos simples se formatean en el hilo del listener"""
+        handler = DeferredQueueHandler(None)
+        record = self._record(42)
+
+        assert handler.prepare(record) is record
+        assert record.args == (42,)
+
+    def test_mutable_args_formatted_eagerly(self):
+        """Test que los argumentos mutables se congelan al registrar"""
+        handler = DeferredQueueHandler(None)
+        items = [1]
+        prepared = handler.prepare(self._record(items))
+        items.append(2)
+
+        assert prepared.getMessage() == "value [1]"
+        assert JsonFormatter().format(prepared)
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.models.client_result import ClientResult
+from deepseek_mcp_client.utils.result_sink import ColumnarResultSink, JsonlResultSink, ResultSink, read_columns
+
+
+def make_result(execution_id, success=True, tools=("weather",)):
+    return ClientResult(
+        output=f"out {execution_id}",
+        success=success,
+        execution_id=execution_id,
+        timestamp=datetime(2024, 5, 1),
+        tools_used=list(tools),
+        metadata={
+            "model": "deepseek-chat",
+            "duration": 0.25,
+            "phases": [
+                {"phase": "planning", "prompt_tokens": 100, "completion_tokens": 10, "cost": 0.001},
+                {"phase": "final", "prompt_tokens": 50, "completion_tokens": 20, "cost": 0.002}
+            ]
+        },
+        error=None if success else "boom"
+    )
+
+
+class Interrupted(Exception):
+    pass
+
+
+# Proceso que muere en mitad del lote sin cerrar el destino (kill, OOM)
+CRASHING_BATCH = textwrap.dedent("""
+    import asyncio, os, sys
+    from datetime import datetime
+    from deepseek_mcp_client import DeepSeekClient, JsonlResultSink
+    from deepseek_mcp_client.models.client_result import ClientResult
+
+    async def fake_execute(instruction, execution_id=None, **kwargs):
+        if instruction == "task 130":
+            os._exit(1)
+        await asyncio.sleep(0)
+        return ClientResult("ok", True, execution_id, datetime.now(), [], {})
+
+    client = DeepSeekClient(model="deepseek-chat")
+    client.execute = fake_execute
+    instructions = [f"task {i}" for i in range(200)]
+    asyncio.run(client.execute_many(instructions, max_concurrency=1, sink=JsonlResultSink(sys.argv[1]), collect=False))
+""")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+    with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+        yield DeepSeekClient(model="deepseek-chat")
+
+
+class TestJsonlResultSink:
+
+    def test_buffered_batches(self, tmp_path):
+        """Test que solo se escribe al completar cada bloque"""
+        path = tmp_path / "results.jsonl"
+        sink = JsonlResultSink(path, batch_size=2)
+
+        sink.write(make_result("a"))
+        assert not path.exists()
+        sink.write(make_result("b"))
+        sink.write(make_result("c"))
+        assert len(path.read_text().splitlines()) == 2
+        sink.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["execution_id"] for line in lines] == ["a", "b", "c"]
+        assert sink.get_stats()["flushes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_flush_interval_without_new_results(self, tmp_path):
+        """Test que flush_interval escribe el búfer aunque no lleguen más resultados"""
+        path = tmp_path / "results.jsonl"
+        sink = JsonlResultSink(path, batch_size=100, flush_interval=0.05)
+
+        sink.write(make_result("a"))
+        assert not path.exists()
+        await asyncio.sleep(0.2)
+
+        assert [json.loads(line)["execution_id"] for line in path.read_text().splitlines()] == ["a"]
+        sink.write(make_result("b"))
+        sink.close()
+        assert sink.get_stats()["flushes"] == 2
+        assert sink._timer is None
+
+    def test_resume_skips_completed_and_repairs_tail(self, tmp_path):
+        """Test que al reabrir se leen los completados y se descarta una línea cortada"""
+        path = tmp_path / "results.jsonl"
+        with JsonlResultSink(path) as sink:
+            sink.write(make_result("a"))
+            sink.write(make_result("b", success=False))
+        with open(path, "a") as f:
+            f.write('{"execution_id": "c", "succ')
+
+        sink = JsonlResultSink(path)
+        assert sink.completed_ids() == {"a"}
+        sink.write(make_result("d"))
+        sink.close()
+
+        ids = [json.loads(line)["execution_id"] for line in path.read_text().splitlines()]
+        assert ids == ["a", "b", "d"]
+
+
+class TestColumnarResultSink:
+
+    def test_columns_and_token_totals(self, tmp_path):
+        """Test de columnas por bloque con tokens y coste sumados por fases"""
+        path = tmp_path / "results.columns.jsonl"
+        with ColumnarResultSink(path, batch_size=2) as sink:
+            for execution_id in "abc":
+                sink.write(make_result(execution_id, tools=("weather", "maps")))
+
+        columns = read_columns(path)
+        assert columns["execution_id"] == ["a", "b", "c"]
+        assert columns["prompt_tokens"] == [150] * 3
+        assert columns["completion_tokens"] == [30] * 3
+        assert columns["tools_count"] == [2] * 3
+        assert "output" not in columns
+        assert ColumnarResultSink(path).completed_ids() == {"a", "b", "c"}
+
+
+class TestExecuteManySink:
+
+    @pytest.mark.asyncio
+    async def test_resume_interrupted_batch(self, client, tmp_path):
+        """Test que un lote reanudado no repite las ejecuciones ya escritas"""
+        path = tmp_path / "batch.jsonl"
+        instructions = [f"task {i}" for i in range(6)]
+        calls = []
+        interrupted = []
+
+        async def fake_execute(instruction, execution_id=None, **kwargs):
+            calls.append(instruction)
+            if instruction == "task 4" and not interrupted:
+                interrupted.append(instruction)
+                raise Interrupted
+            return make_result(execution_id)
+
+        with patch.object(client, "execute", side_effect=fake_execute):
+            with pytest.raises(Interrupted):
+                await client.execute_many(instructions, max_concurrency=1, sink=JsonlResultSink(path, batch_size=100))
+            calls.clear()
+            results = await client.execute_many(instructions, max_concurrency=2, sink=JsonlResultSink(path))
+
+        assert calls == ["task 4", "task 5"]
+        assert results[:4] == [None] * 4
+        assert [r.success for r in results[4:]] == [True, True]
+        assert len(path.read_text().splitlines()) == 6
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash_redoes_at_most_one_block(self, client, tmp_path, monkeypatch):
+        """Test que tras matar el proceso solo se repite lo que quedaba en el búfer"""
+        path = tmp_path / "batch.jsonl"
+        root = Path(__file__).resolve().parents[2]
+        monkeypatch.setenv("PYTHONPATH", str(root))
+        crashed = subprocess.run([sys.executable, "-c", CRASHING_BATCH, str(path)], cwd=root, timeout=60)
+        assert crashed.returncode == 1
+
+        calls = []
+
+        async def fake_execute(instruction, execution_id=None, **kwargs):
+            calls.append(instruction)
+            return make_result(execution_id)
+
+        sink = JsonlResultSink(path)
+        with patch.object(client, "execute", side_effect=fake_execute):
+            await client.execute_many([f"task {i}" for i in range(200)], sink=sink, collect=False)
+
+        # 70 tareas sin empezar más, como mucho, un bloque perdido
+        assert 70 <= len(calls) < 70 + sink.batch_size
+        assert sink.get_stats()["resumed"] == 200 - len(calls)
+
+    def test_sink_is_abstract(self, tmp_path):
+        """Test que la base exige implementar el formato"""
+        with pytest.raises(TypeError):
+            ResultSink(tmp_path / "x")
+
+    @pytest.mark.asyncio
+    async def test_without_sink_keeps_order(self, client):
+        """Test que sin destino devuelve todos los resultados en orden"""
+        async def fake_execute(instruction, **kwargs):
+            return make_result(instruction)
+
+        with patch.object(client, "execute", side_effect=fake_execute):
+            results = await client.execute_many(["x", "y", "z"], max_concurrency=2)
+
+        assert [r.execution_id for r in results] == ["x", "y", "z"]
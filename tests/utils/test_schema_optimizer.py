@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from deepseek_mcp_client import DeepSeekClient, SchemaOptimizer
+from deepseek_mcp_client.utils.schema_optimizer import estimate_tokens, tool_input_schema, trim_description
+
+
+PYDANTIC_SCHEMA = {
+    "$defs": {
+        "Filters": {
+            "title": "Filters",
+            "type": "object",
+            "properties": {
+                "tag": {"title": "Tag", "type": "string", "examples": ["a", "b"]}
+            }
+        }
+    },
+    "title": "search_arguments",
+    "description": "Arguments for search",
+    "type": "object",
+    "properties": {
+        "query": {"title": "Query", "type": "string", "description": "Texto  de\nbúsqueda"},
+        "limit": {
+            "anyOf": [{"type": "integer"}, {"type": "null"}],
+            "default": None,
+            "title": "Limit"
+        },
+        "filters": {"$ref": "#/$defs/Filters"},
+        "title": {"type": "string", "default": {"title": "keep"}}
+    },
+    "required": ["query"]
+}
+
+
+class TestSchemaOptimizer:
+
+    def test_optimize_strips_inlines_and_collapses(self):
+        """Test que se eliminan palabras clave, se insertan $ref y se colapsan nulos"""
+        optimizer = SchemaOptimizer()
+        result = optimizer.optimize(PYDANTIC_SCHEMA)
+
+        assert result == {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Texto de búsqueda"},
+                "limit": {"type": "integer"},
+                "filters": {"type": "object", "properties": {"tag": {"type": "string"}}},
+                "title": {"type": "string", "default": {"title": "keep"}}
+            },
+            "required": ["query"]
+        }
+        # El esquema original no se modifica
+        assert "$defs" in PYDANTIC_SCHEMA
+        assert optimizer.tokens_saved > 0
+
+    def test_recursive_refs_terminate(self):
+        """Test que las referencias recursivas no producen recursión infinita"""
+        schema = {
+            "$defs": {"Node": {"type": "object", "properties": {"child": {"$ref": "#/$defs/Node"}}}},
+            "type": "object",
+            "properties": {"root": {"$ref": "#/$defs/Node"}}
+        }
+
+        result = SchemaOptimizer().optimize(schema)
+
+        assert result["properties"]["root"]["properties"]["child"] == {"type": "object"}
+
+    def test_trim_description(self):
+        """Test recorte de descripciones respetando palabras"""
+        assert trim_description("uno dos tres cuatro", 9) == "uno dos…"
+        assert trim_description("corto", 100) == "corto"
+        assert trim_description("sin límite", None) == "sin límite"
+
+    def test_empty_schema(self):
+        """Test que un esquema vacío produce un objeto sin propiedades"""
+        assert SchemaOptimizer().optimize(None) == {"type": "object", "properties": {}}
+
+    def test_estimate_tokens(self):
+        """Test estimación aproximada de tokens"""
+        assert estimate_tokens({"a": "b" * 40}) == 12
+
+    @pytest.mark.asyncio
+    async def test_client_keeps_original_schema(self, monkeypatch):
+        """Test que el cliente envía el esquema optimizado y conserva el original"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        tool = MagicMock()
+        tool.name = "search"
+        tool.description = "Buscar"
+        tool.input_schema = PYDANTIC_SCHEMA
+
+        mock_client = MagicMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=None)
+        mock_client.list_tools = AsyncMock(return_value=[tool])
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", optimize_tool_schemas=True)
+            await client._load_tools_from_client(mock_client)
+
+        assert client.tool_schemas["search"] is PYDANTIC_SCHEMA
+        assert "$defs" not in client.all_tools[0]["function"]["parameters"]
+        assert client.get_stats()["schema_optimization"]["tokens_saved"] > 0
+
+    def test_tool_input_schema_accessor(self):
+        """Test que se lee input_schema y, en SDK anteriores, inputSchema"""
+        assert tool_input_schema(SimpleNamespace(input_schema=PYDANTIC_SCHEMA)) is PYDANTIC_SCHEMA
+        assert tool_input_schema(SimpleNamespace(inputSchema=PYDANTIC_SCHEMA)) is PYDANTIC_SCHEMA
+        assert tool_input_schema(SimpleNamespace()) is None
+
+    @pytest.mark.asyncio
+    async def test_reconnect_does_not_double_count_savings(self, monkeypatch):
+        """Test que cerrar y volver a cargar no acumula tokens ahorrados"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+
+        tool = SimpleNamespace(name="search", description="Buscar", input_schema=PYDANTIC_SCHEMA)
+        mock_client = MagicMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=None)
+        mock_client.list_tools = AsyncMock(return_value=[tool])
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = DeepSeekClient(model="deepseek-chat", optimize_tool_schemas=True)
+            await client._load_tools_from_client(mock_client)
+            client.clients.append(mock_client)
+            saved = client.schema_optimizer.tokens_saved
+
+            await client.close()
+            await client._load_tools_from_client(mock_client)
+
+        assert saved > 0
+        assert client.schema_optimizer.tokens_saved == saved
@@ -0,0 +1,109 @@
+import json
+import time
+
+import pytest
+from unittest.mock import patch
+from fastmcp import FastMCP
+from openai.types.chat import ChatCompletion
+
+from deepseek_mcp_client import DeepSeekClient
+from deepseek_mcp_client.utils.trace import TraceRecorder, TraceReplayer, read_trace
+
+
+def make_completion(message):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "deepseek-chat",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": message}]
+    })
+
+
+async def scripted_chat(self, chat_params):
+    """LLM simulado: pide `add` en la primera llamada y responde con el resultado"""
+    tool_messages = [m for m in chat_params["messages"] if m["role"] == "tool"]
+    if not tool_messages:
+        return make_completion({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "add", "arguments": '{"a": 2, "b": 3}'}
+            }]
+        })
+    return make_completion({"role": "assistant", "content": f"Result: {tool_messages[0]['content'][:40]}"})
+
+
+def make_server():
+    calculator = FastMCP("Calculator")
+
+    @calculator.tool
+    def add(a: float, b: float) -> float:
+        """Sumar dos números"""
+        return a + b
+
+    return calculator
+
+
+class TestTraceRecordReplay:
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self, monkeypatch, tmp_path):
+        """Test que una ejecución grabada se reproduce sin red ni servidores"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        trace_path = tmp_path / "trace.jsonl"
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"), \
+                patch.object(DeepSeekClient, "_create_chat_completion", scripted_chat):
+            client = DeepSeekClient(model="deepseek-chat", mcp_servers=[make_server()])
+            with TraceRecorder(trace_path).attach(client):
+                recorded = await client.execute("Suma 2 y 3")
+
+        events = read_trace(trace_path)
+        kinds = [event["type"] for event in events]
+        assert kinds[0] == "header"
+        assert kinds.count("chat") == 2
+        assert "list_tools" in kinds and "call_tool" in kinds
+        assert events[-1]["type"] == "execute"
+        # El bloque de herramientas no se duplica en cada petición
+        assert all("tools" not in e["request"] for e in events if e["type"] == "chat")
+
+        replayer = TraceReplayer.load(trace_path, latency="zero")
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            replay_client = replayer.create_client()
+            results = await replayer.replay_executions(replay_client)
+
+        assert recorded.success
+        assert results[0].output == recorded.output
+        assert results[0].tools_used == ["add"]
+        assert replayer.stats == {"chat_replayed": 2, "tools_replayed": 1, "mismatches": 0}
+
+    @pytest.mark.asyncio
+    async def test_original_latency(self, monkeypatch):
+        """Test que el modo 'original' respeta la duración grabada"""
+        monkeypatch.setenv("DEEPSEEK_API_KEY", "test_api_key")
+        params = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "hola"}]}
+        events = [
+            {"type": "header", "model": "deepseek-chat", "servers": []},
+            {
+                "type": "chat",
+                "key": None,
+                "duration": 0.05,
+                "response": json.loads(make_completion({"role": "assistant", "content": "hola"}).model_dump_json())
+            }
+        ]
+
+        with patch("deepseek_mcp_client.client.deepseek_client.AsyncOpenAI"):
+            client = TraceReplayer(events, latency="original").create_client()
+            start = time.perf_counter()
+            response = await client._create_chat_completion(params)
+
+        assert time.perf_counter() - start >= 0.05
+        assert response.choices[0].message.content == "hola"
+
+    def test_invalid_latency_mode(self):
+        """Test modo de latencia inválido"""
+        with pytest.raises(ValueError):
+            TraceReplayer([], latency="fast")